@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Compare per-request serialization overhead of JSON and binary frames.
+Usage: python scripts/bench_codec.py [--iterations N] [--batch-size N] [--length N]
+
+Times what the server does around inference for each encoding: parsing the
+request body into fields and serializing the prediction back, for a single
+text and for a batch. Needs no model. Reports latency percentiles and the
+encoded request and response sizes.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def measure(round_trip, iterations: int) -> dict:
+    """Time ``round_trip`` after a short warmup and summarize the latencies."""
+    for _ in range(100):
+        round_trip()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        round_trip()
+        latencies.append((time.perf_counter() - start) * 1e6)
+    latencies.sort()
+    return {
+        "p50_us": round(statistics.median(latencies), 2),
+        "p99_us": round(latencies[int(len(latencies) * 0.99) - 1], 2),
+        "max_us": round(latencies[-1], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--length", type=int, default=64)
+    args = parser.parse_args()
+
+    from tursi.frames import (
+        decode_request,
+        decode_response,
+        encode_request,
+        encode_response,
+    )
+
+    text = ("the quick brown fox jumps over the lazy dog " * 8)[: args.length]
+    prediction = {"label": "POSITIVE", "score": 0.9987654}
+    cases = {
+        "single": ({"text": text}, prediction),
+        "batch": (
+            {"texts": [text] * args.batch_size},
+            {"results": [prediction] * args.batch_size},
+        ),
+    }
+
+    print(
+        f"{'case':<8}{'encoding':<10}{'request_B':>10}{'response_B':>11}"
+        f"{'p50_us':>10}{'p99_us':>10}{'max_us':>10}"
+    )
+    for case, (body, result) in cases.items():
+        texts = body.get("text", body.get("texts"))
+        json_request = json.dumps(body).encode()
+        frame_request = encode_request(texts)
+        assert decode_request(frame_request) == body
+        assert decode_response(encode_response(result)) is not None
+
+        def json_round_trip():
+            json.loads(json_request)
+            return json.dumps(result).encode()
+
+        def frame_round_trip():
+            decode_request(frame_request)
+            return encode_response(result)
+
+        for encoding, request, round_trip in [
+            ("json", json_request, json_round_trip),
+            ("frame", frame_request, frame_round_trip),
+        ]:
+            stats = measure(round_trip, args.iterations)
+            print(
+                f"{case:<8}{encoding:<10}{len(request):>10}{len(round_trip()):>11}"
+                f"{stats['p50_us']:>10}{stats['p99_us']:>10}{stats['max_us']:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Compare forward-pass latency with and without ONNX Runtime I/O binding.
+Usage: python scripts/bench_iobinding.py MODEL [--iterations N] [--batch-size N] [--length N]
+
+Loads MODEL through the engine (exporting and quantizing it on first use),
+then runs the same padded batch through the classifier repeatedly: once
+padding into freshly allocated arrays and letting ONNX Runtime allocate the
+output, once padding into the preallocated buffers bound to the session.
+Reports latency percentiles and the standard deviation of each.
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def measure(forward, iterations: int) -> dict:
+    """Time ``forward`` after a short warmup and summarize the latencies."""
+    for _ in range(10):
+        forward()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        forward()
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return {
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1], 3),
+        "max_ms": round(latencies[-1], 3),
+        "stdev_ms": round(statistics.stdev(latencies), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("model", help="Model name or local model directory")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--length", type=int, default=128)
+    args = parser.parse_args()
+
+    from tursi.engine import TursiEngine
+
+    engine = TursiEngine()
+    engine.ALLOWED_MODELS.append(args.model)
+    model, tokenizer = engine.load_quantized_model(args.model)
+    encodings = tokenizer.encode(["the quick brown fox " * 64] * args.batch_size)
+    shape = (args.batch_size, args.length)
+    feed_names = model.input_names
+
+    def plain():
+        inputs = tokenizer.pad(encodings, args.length)
+        model.session.run(
+            [model.output_name], {name: inputs[name] for name in feed_names}
+        )
+
+    def bound():
+        with model.buffers(*shape) as buffers:
+            tokenizer.pad(encodings, args.length, out=buffers.inputs)
+            buffers.run()
+
+    results = {
+        "plain": measure(plain, args.iterations),
+        "io_binding": measure(bound, args.iterations),
+    }
+    print(f"{'metric':<12}{'plain':>12}{'io_binding':>12}")
+    for metric in results["plain"]:
+        print(
+            f"{metric:<12}{results['plain'][metric]:>12}"
+            f"{results['io_binding'][metric]:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Compare the Flask and ASGI serving modes under load.
+Usage: python scripts/bench_servers.py MODEL [--requests N] [--concurrency N] [--idle N]
+
+Each mode is started in its own process on a free port. The client first
+opens --idle keep-alive connections that stay silent for the whole run (the
+cost that matters for many mostly idle clients), then sends --requests
+POST /predict requests over --concurrency busy connections and reports
+throughput, latency percentiles and the server's thread count and RSS.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import os
+import socket
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import psutil
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def free_port() -> int:
+    """Find a free TCP port."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def run_server(mode: str, model: str, port: int) -> None:
+    """Load the model and serve it in the given mode (runs in a child process)."""
+    from tursi.engine import TursiEngine
+    from tursi.serving import serve
+
+    engine = TursiEngine()
+    # Benchmark any model, including local directories
+    engine.ALLOWED_MODELS.append(model)
+    engine.sanitize_model_name = lambda name: name
+    create_app = engine.create_asgi_app if mode == "asgi" else engine.create_app
+    app = create_app(model, rate_limit="1000000 per minute")
+    if mode == "asgi":
+        serve(app, "127.0.0.1", port, mode="asgi")
+    else:
+        from werkzeug.serving import make_server
+
+        make_server("127.0.0.1", port, app, threaded=True).serve_forever()
+
+
+async def request(reader, writer, body: bytes):
+    """Send one POST /predict; return its latency in ms and whether the
+    server kept the connection open."""
+    start = time.perf_counter()
+    writer.write(
+        b"POST /predict HTTP/1.1\r\nHost: localhost\r\n"
+        b"Content-Type: application/json\r\n"
+        + f"Content-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    length, keep_alive = 0, True
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+        elif name.strip().lower() == b"connection":
+            keep_alive = value.strip().lower() != b"close"
+    await reader.readexactly(length)
+    return (time.perf_counter() - start) * 1000, keep_alive
+
+
+async def load(port: int, requests: int, concurrency: int, idle: int, pid: int):
+    """Hold idle connections open while busy connections send requests."""
+    idle_conns = []
+    for _ in range(idle):
+        try:
+            idle_conns.append(await asyncio.open_connection("127.0.0.1", port))
+        except OSError:
+            break
+
+    body = json.dumps({"text": "This product works great, I love it."}).encode()
+    latencies = []
+    remaining = [requests]
+
+    async def worker():
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            latency, keep_alive = await request(reader, writer, body)
+            latencies.append(latency)
+            if not keep_alive:
+                # The Werkzeug server closes the connection after each response
+                writer.close()
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.close()
+
+    process = psutil.Process(pid)
+    start = time.perf_counter()
+    task = asyncio.gather(*(worker() for _ in range(concurrency)))
+    await asyncio.sleep(0.5)
+    threads = process.num_threads()
+    rss_mb = process.memory_info().rss / (1024 * 1024)
+    await task
+    elapsed = time.perf_counter() - start
+
+    for _, writer in idle_conns:
+        writer.close()
+
+    latencies.sort()
+    return {
+        "idle_connections": len(idle_conns),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1], 2),
+        "server_threads": threads,
+        "server_rss_mb": round(rss_mb, 1),
+    }
+
+
+def wait_for_port(port: int, server: mp.Process, timeout: float = 300.0) -> None:
+    """Wait until the server accepts connections."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not server.is_alive():
+            raise RuntimeError(f"Server exited with code {server.exitcode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f"Server on port {port} did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("model", help="Model name or local model directory")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--idle", type=int, default=500)
+    args = parser.parse_args()
+
+    os.environ.setdefault("BATCH_MAX_SIZE", "8")
+    results = {}
+    for mode in ("flask", "asgi"):
+        port = free_port()
+        server = mp.Process(target=run_server, args=(mode, args.model, port))
+        server.start()
+        try:
+            wait_for_port(port, server)
+            results[mode] = asyncio.run(
+                load(port, args.requests, args.concurrency, args.idle, server.pid)
+            )
+        finally:
+            server.terminate()
+            server.join()
+
+    print(f"{'metric':<20}{'flask':>12}{'asgi':>12}")
+    for metric in results["flask"]:
+        print(
+            f"{metric:<20}{results['flask'][metric]:>12}{results['asgi'][metric]:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
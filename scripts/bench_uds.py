@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Compare request latency over a Unix domain socket and 127.0.0.1 TCP.
+Usage: python scripts/bench_uds.py [--model MODEL] [--server flask|asgi] [--requests N] [--concurrency N]
+
+Serves the same app on a loopback TCP port and on a Unix domain socket, from
+the same server implementation, and drives each with ``tursi bench``'s load
+generator one after the other. Without --model the app answers /predict
+with a fixed prediction, so the difference is the transport alone; with a
+model it is the whole request.
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+PREDICTION = json.dumps({"label": "POSITIVE", "score": 0.9998}).encode()
+
+
+def stub_wsgi(environ, start_response):
+    """Answer every request with a fixed prediction."""
+    environ["wsgi.input"].read(int(environ.get("CONTENT_LENGTH") or 0))
+    start_response(
+        "200 OK",
+        [
+            ("Content-Type", "application/json"),
+            ("Content-Length", str(len(PREDICTION))),
+        ],
+    )
+    return [PREDICTION]
+
+
+async def stub_asgi(scope, receive, send):
+    """Answer every request with a fixed prediction."""
+    if scope["type"] != "http":
+        return
+    while (await receive()).get("more_body"):
+        pass
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(PREDICTION)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": PREDICTION})
+
+
+def start_server(app, sock: socket.socket, mode: str):
+    """Serve ``app`` from a bound socket in a thread; returns a stop callable."""
+    if mode == "asgi":
+        import uvicorn
+
+        server = uvicorn.Server(uvicorn.Config(app, log_level="warning"))
+        thread = threading.Thread(
+            target=server.run, kwargs={"sockets": [sock]}, daemon=True
+        )
+        thread.start()
+        while not server.started:
+            time.sleep(0.01)
+
+        def stop():
+            server.should_exit = True
+            thread.join()
+
+        return stop
+
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    WSGIRequestHandler.log_request = lambda *args, **kwargs: None
+    host = (
+        "unix://" + sock.getsockname() if sock.family == socket.AF_UNIX else "127.0.0.1"
+    )
+    server = make_server(host, 0, app, threaded=True, fd=sock.fileno())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def stop():
+        server.shutdown()
+        thread.join()
+
+    return stop
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", help="Serve this model instead of a stub app")
+    parser.add_argument("--server", choices=["flask", "asgi"], default="flask")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+
+    from tursi.bench import run_bench
+    from tursi.serving import bind_tcp_socket, bind_unix_socket
+
+    if args.model:
+        from tursi.engine import TursiEngine
+
+        engine = TursiEngine()
+        engine.ALLOWED_MODELS.append(args.model)
+        create_app = (
+            engine.create_asgi_app if args.server == "asgi" else engine.create_app
+        )
+        app = create_app(args.model, rate_limit="1000000/minute")
+    else:
+        app = stub_asgi if args.server == "asgi" else stub_wsgi
+
+    path = os.path.join(tempfile.mkdtemp(prefix="tursi-"), "bench.sock")
+    transports = {
+        "tcp": (bind_tcp_socket("127.0.0.1", 0), None),
+        "uds": (bind_unix_socket(path), path),
+    }
+
+    reports = {}
+    for name, (sock, uds) in transports.items():
+        stop = start_server(app, sock, args.server)
+        port = sock.getsockname()[1] if uds is None else 0
+        url = f"http://127.0.0.1:{port}/predict"
+        run_bench(url, concurrency=args.concurrency, duration=0, requests=200, uds=uds)
+        reports[name] = run_bench(
+            url,
+            concurrency=args.concurrency,
+            duration=0,
+            requests=args.requests,
+            uds=uds,
+        )
+        stop()
+        sock.close()
+    os.unlink(path)
+
+    metrics = ["p50", "p90", "p99", "mean"]
+    print(
+        f"{'transport':<11}{'req/s':>10}" + "".join(f"{m + '_ms':>10}" for m in metrics)
+    )
+    for name, report in reports.items():
+        latency = report["latency_ms"]
+        print(
+            f"{name:<11}{report['throughput_rps']:>10.0f}"
+            + "".join(f"{latency[m]:>10.3f}" for m in metrics)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Shared fixtures for the Tursi test suite."""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+TINY_VOCAB = [
+    "[PAD]",
+    "[UNK]",
+    "[CLS]",
+    "[SEP]",
+    "[MASK]",
+    "i",
+    "love",
+    "hate",
+    "this",
+    "it",
+    "good",
+    "bad",
+    "great",
+    "terrible",
+    "hello",
+    "world",
+]
+
+
+@pytest.fixture(scope="session")
+def tiny_model_dir(tmp_path_factory):
+    """Create a tiny randomly initialized classifier that loads offline."""
+    from transformers import (
+        BertTokenizerFast,
+        DistilBertConfig,
+        DistilBertForSequenceClassification,
+    )
+
+    model_dir = tmp_path_factory.mktemp("tiny-distilbert")
+    vocab_file = model_dir / "vocab.txt"
+    vocab_file.write_text("\n".join(TINY_VOCAB))
+    BertTokenizerFast(vocab_file=str(vocab_file)).save_pretrained(model_dir)
+
+    config = DistilBertConfig(
+        vocab_size=len(TINY_VOCAB),
+        dim=32,
+        hidden_dim=64,
+        n_layers=2,
+        n_heads=2,
+        max_position_embeddings=128,
+        id2label={0: "NEGATIVE", 1: "POSITIVE"},
+        label2id={"NEGATIVE": 0, "POSITIVE": 1},
+    )
+    DistilBertForSequenceClassification(config).save_pretrained(model_dir)
+    return str(model_dir)
+
+
+@pytest.fixture
+def mock_loaded_model():
+    """Mock a loaded model and tokenizer without downloading anything."""
+    import numpy as np
+    from tursi.engine import TursiEngine
+
+    def tokenize(texts, **kwargs):
+        return {"input_ids": np.ones((len(texts), 4), dtype=np.int64)}
+
+    def forward(input_ids, **kwargs):
+        return np.tile(np.array([[0.0, 2.0]], dtype=np.float32), (len(input_ids), 1))
+
+    tokenizer = MagicMock(side_effect=tokenize)
+    model = MagicMock(side_effect=forward)
+    with patch.object(
+        TursiEngine, "load_quantized_model", return_value=(model, tokenizer)
+    ):
+        yield model, tokenizer
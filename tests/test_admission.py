@@ -0,0 +1,123 @@
+"""Tests for admission control."""
+
+import threading
+import time
+import pytest
+from tursi.admission import AdmissionController, Overloaded
+from tursi.engine import TursiEngine
+
+
+def queue_waiter(controller, results):
+    """Start a thread that waits for a slot and records the outcome."""
+
+    def wait():
+        try:
+            controller.acquire()
+            results.append("admitted")
+            controller.release(0.0)
+        except Overloaded as e:
+            results.append(e.reason)
+
+    thread = threading.Thread(target=wait)
+    thread.start()
+    while controller.waiting() == 0 and thread.is_alive():
+        time.sleep(0.001)
+    return thread
+
+
+def test_full_queue_is_rejected_immediately():
+    """Test requests beyond the queue depth are shed without waiting."""
+    controller = AdmissionController(concurrency=1, max_queue=1)
+    assert controller.acquire() == 0.0
+
+    results = []
+    thread = queue_waiter(controller, results)
+    assert controller.waiting() == 1
+
+    started = time.perf_counter()
+    with pytest.raises(Overloaded) as error:
+        controller.acquire()
+    assert time.perf_counter() - started < 0.05
+    assert error.value.reason == "queue_full"
+    assert error.value.retry_after >= 1
+
+    # Releasing the slot hands it to the queued request
+    controller.release(0.01)
+    thread.join(timeout=5)
+    assert results == ["admitted"]
+
+    stats = controller.stats()
+    assert stats["admitted"] == 2
+    assert stats["rejected"] == {"queue_full": 1}
+    assert stats["running"] == 0
+    assert stats["waiting"] == 0
+
+
+def test_queue_wait_limit():
+    """Test queued requests time out, and slow queues reject on arrival."""
+    controller = AdmissionController(concurrency=1, max_wait_ms=50)
+    controller.acquire()
+
+    results = []
+    queue_waiter(controller, results).join(timeout=5)
+    assert results == ["queue_timeout"]
+
+    # Once requests take 200 ms on average, a queued request would wait too long
+    controller.release(1.0)
+    with controller.admit():
+        with pytest.raises(Overloaded) as error:
+            controller.acquire()
+    assert error.value.reason == "queue_timeout"
+    assert controller.stats()["rejected"] == {"queue_timeout": 2}
+
+
+@pytest.fixture
+def engine():
+    """Create a TursiEngine with admission control."""
+    engine = TursiEngine()
+    engine.WARMUP = False
+    engine.QUEUE_MAX_DEPTH = 1
+    engine.INFERENCE_CONCURRENCY = 1
+    return engine
+
+
+def test_overloaded_predict(engine, mock_loaded_model):
+    """Test /predict answers 503 with Retry-After when the queue is full."""
+    app = engine.create_app(engine.ALLOWED_MODELS[0])
+    client = app.test_client()
+    assert client.post("/predict", json={"text": "hi"}).status_code == 200
+
+    admission = client.get("/health").get_json()["admission"]
+    assert admission["concurrency"] == 1
+    assert admission["max_queue"] == 1
+
+    controller = app.service.admission
+    controller.acquire()
+    results = []
+    thread = queue_waiter(controller, results)
+
+    response = client.post("/predict", json={"text": "hi"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert response.get_json()["error"] == "Server overloaded, retry later"
+
+    metrics = client.get("/metrics").get_data(as_text=True)
+    assert "tursi_admission_queue_depth 1" in metrics
+    assert 'tursi_rejected_requests_total{reason="queue_full"} 1' in metrics
+
+    controller.release(0.0)
+    thread.join(timeout=5)
+    assert results == ["admitted"]
+
+
+def test_admission_disabled_by_default():
+    """Test no controller is created while the queue is unbounded."""
+    engine = TursiEngine()
+    engine.QUEUE_MAX_DEPTH = 0
+    engine.QUEUE_MAX_WAIT_MS = 0
+    assert engine.create_admission_controller() is None
+
+    engine.QUEUE_MAX_WAIT_MS = 100
+    engine.BATCH_MAX_SIZE = 8
+    engine.INFERENCE_CONCURRENCY = 0
+    assert engine.create_admission_controller().concurrency == 16
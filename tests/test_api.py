@@ -72,6 +72,21 @@ def test_deploy_model(client):
     assert data["status"] == "pending"
 
 
+def test_deploy_model_invalid_config(client):
+    """Test deploying a model with a config value that cannot be parsed."""
+    payload = {
+        "model_name": "test-model",
+        "host": "localhost",
+        "port": 5000,
+        "config": {"batch_size": "four"},
+    }
+
+    response = client.post("/api/v1/models", json=payload)
+
+    assert response.status_code == 400
+    assert "'batch_size'" in response.get_json()["error"]
+
+
 def test_deploy_model_missing_fields(client):
     """Test deploying a model with missing fields."""
     payload = {
@@ -0,0 +1,64 @@
+"""Tests for the model artifact cache."""
+
+import json
+import pytest
+from tursi.artifacts import MANIFEST_FILE, ArtifactCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create an artifact cache in a temporary directory."""
+    return ArtifactCache(tmp_path / "onnx")
+
+
+def test_entry_dir_depends_on_settings(cache):
+    """Test that every setting in the key gets its own entry."""
+    base = cache.entry_dir("org/model", "export", revision="main", opset=None)
+    assert base.parent.name == "org--model"
+    assert base.name.startswith("export-")
+    assert base == cache.entry_dir("org/model", "export", opset=None, revision="main")
+    assert base != cache.entry_dir("org/model", "export", revision="v2", opset=None)
+    assert base != cache.entry_dir("org/model", "export", revision="main", opset=17)
+    assert base != cache.entry_dir("org/other", "export", revision="main", opset=None)
+
+
+def test_publish_and_lookup(cache):
+    """Test that published entries are found with their manifest."""
+    entry = cache.entry_dir("model", "export", revision="main")
+    assert cache.lookup(entry) is None
+
+    scratch = cache.scratch_dir(entry)
+    (scratch / "model.onnx").write_bytes(b"onnx")
+    cache.publish(scratch, entry, {"model": "model", "revision": "main"})
+
+    manifest = cache.lookup(entry)
+    assert manifest["revision"] == "main"
+    assert "created_at" in manifest
+    assert (entry / "model.onnx").read_bytes() == b"onnx"
+    assert not scratch.exists()
+
+
+def test_publish_race_keeps_first_entry(cache):
+    """Test that a second publisher defers to an existing complete entry."""
+    entry = cache.entry_dir("model", "export")
+    first = cache.scratch_dir(entry)
+    cache.publish(first, entry, {"build": 1})
+
+    second = entry.with_name("second.tmp")
+    second.mkdir()
+    (second / "model.onnx").write_bytes(b"other")
+    assert cache.publish(second, entry, {"build": 2})["build"] == 1
+    assert not second.exists()
+
+
+def test_incomplete_entry_is_a_miss(cache):
+    """Test that an entry without a manifest is rebuilt."""
+    entry = cache.entry_dir("model", "export")
+    entry.mkdir(parents=True)
+    (entry / "model.onnx").write_bytes(b"partial")
+    assert cache.lookup(entry) is None
+
+    scratch = cache.scratch_dir(entry)
+    cache.publish(scratch, entry, {"build": 1})
+    assert json.loads((entry / MANIFEST_FILE).read_text())["build"] == 1
+    assert not (entry / "model.onnx").exists()
@@ -0,0 +1,108 @@
+"""Tests for the ASGI serving mode."""
+
+import asyncio
+import json
+import pytest
+from tursi.engine import TursiEngine
+
+
+def call(app, method, path, body=None, content_type="application/json"):
+    """Send one HTTP request through an ASGI app and decode the response."""
+    raw = json.dumps(body).encode() if body is not None else b""
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": [(b"content-type", content_type.encode())],
+        "client": ("127.0.0.1", 12345),
+    }
+    messages = [{"type": "http.request", "body": raw, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    assert sent[0]["type"] == "http.response.start"
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+@pytest.fixture
+def engine():
+    """Create a TursiEngine instance for testing."""
+    return TursiEngine()
+
+
+@pytest.fixture
+def apps(engine, mock_loaded_model):
+    """Create the Flask and ASGI apps for the same mocked model."""
+    model_name = engine.ALLOWED_MODELS[0]
+    engine.WARMUP = False  # warmup timings would differ between the two apps
+    flask_client = engine.create_app(model_name).test_client()
+    asgi_app = engine.create_asgi_app(model_name, rate_limit="5/minute")
+    yield flask_client, asgi_app
+    asgi_app.executor.shutdown()
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"text": "great product"},
+        {"text": "x" * 1000},
+        {"texts": ["good", 1, "bad"]},
+        {"texts": []},
+        {"nothing": True},
+    ],
+)
+def test_same_contract_as_flask(apps, body):
+    """Test that ASGI and Flask answer /predict identically."""
+    flask_client, asgi_app = apps
+    expected = flask_client.post("/predict", json=body)
+    status, data = call(asgi_app, "POST", "/predict", body)
+    assert status == expected.status_code
+    assert data == expected.get_json()
+
+
+def test_health(apps):
+    """Test that /health reports the same fields as the Flask app."""
+    flask_client, asgi_app = apps
+    status, data = call(asgi_app, "GET", "/health")
+    assert status == 200
+    assert data == flask_client.get("/health").get_json()
+
+
+def test_request_errors(apps):
+    """Test routing, content type and body validation."""
+    _, asgi_app = apps
+    assert call(asgi_app, "GET", "/missing")[0] == 404
+    assert call(asgi_app, "GET", "/predict")[0] == 405
+    assert call(asgi_app, "POST", "/predict", {"text": "a"}, "text/plain") == (
+        400,
+        {"error": "Request must be JSON"},
+    )
+
+
+def test_rate_limit(apps):
+    """Test that clients over the rate limit get 429."""
+    _, asgi_app = apps
+    statuses = [call(asgi_app, "POST", "/predict", {"text": "hi"})[0] for _ in range(6)]
+    assert statuses == [200] * 5 + [429]
+
+
+def test_lifespan(apps):
+    """Test that startup and shutdown are acknowledged."""
+    _, asgi_app = apps
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message["type"])
+
+    asyncio.run(asgi_app({"type": "lifespan"}, receive, send))
+    assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
@@ -0,0 +1,129 @@
+"""Tests for the micro-batching scheduler."""
+
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from tursi.batching import BatcherStopped, MicroBatcher, parse_buckets, plan_batches
+
+
+def test_single_request():
+    """Test that a lone request is processed after the wait window."""
+    batcher = MicroBatcher(lambda items: [i * 2 for i in items], max_wait_ms=1)
+    assert batcher.submit(21).result(timeout=5) == 42
+    batcher.stop()
+
+
+def test_concurrent_requests_are_batched():
+    """Test that concurrent requests share a batch and keep their own results."""
+    seen = []
+    gate = threading.Event()
+
+    def process(items):
+        gate.wait(timeout=5)
+        seen.append(len(items))
+        return [f"result-{i}" for i in items]
+
+    batcher = MicroBatcher(process, max_batch_size=4, max_wait_ms=200)
+    futures = [batcher.submit(i) for i in range(8)]
+    gate.set()
+
+    assert [f.result(timeout=5) for f in futures] == [f"result-{i}" for i in range(8)]
+    assert all(size <= 4 for size in seen)
+    assert sum(seen) == 8
+
+    stats = batcher.stats()
+    assert stats["requests"] == 8
+    assert stats["max_batch_size"] == 4
+    assert sum(stats["batch_sizes"].values()) == stats["batches"]
+    batcher.stop()
+
+
+def test_batches_fill_under_load():
+    """Test that requests arriving within the wait window are grouped."""
+    batcher = MicroBatcher(lambda items: items, max_batch_size=16, max_wait_ms=100)
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(
+            pool.map(lambda i: batcher.submit(i).result(timeout=5), range(16))
+        )
+
+    assert results == list(range(16))
+    assert batcher.stats()["batches"] < 16
+    batcher.stop()
+
+
+def test_batch_errors_propagate():
+    """Test that a failing batch raises in every caller."""
+
+    def process(items):
+        raise RuntimeError("inference failed")
+
+    batcher = MicroBatcher(process, max_wait_ms=1)
+    with pytest.raises(RuntimeError, match="inference failed"):
+        batcher.submit("text").result(timeout=5)
+    batcher.stop()
+
+
+def test_submit_after_stop():
+    """Test a stopped batcher rejects work instead of starting a new worker."""
+    batcher = MicroBatcher(lambda items: items, max_wait_ms=1)
+    assert batcher.submit(1).result(timeout=5) == 1
+    batcher.stop()
+    with pytest.raises(BatcherStopped):
+        batcher.submit(2)
+    assert batcher._thread is None
+
+
+@pytest.mark.parametrize("kwargs", [{"max_batch_size": 0}, {"max_wait_ms": -1}])
+def test_invalid_settings(kwargs):
+    """Test that invalid batching settings are rejected."""
+    with pytest.raises(ValueError):
+        MicroBatcher(lambda items: items, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("32,64,128", (32, 64, 128)),
+        ("128, 32,64,32", (32, 64, 128)),
+        ([64, 16], (16, 64)),
+        ("none", ()),
+        ("", ()),
+        (None, ()),
+    ],
+)
+def test_parse_buckets(value, expected):
+    """Test parsing bucket boundaries from env, CLI and config values."""
+    assert parse_buckets(value) == expected
+
+
+@pytest.mark.parametrize("value", ["32,abc", "0,64", [-1]])
+def test_parse_buckets_rejects_invalid(value):
+    """Test that invalid bucket boundaries are rejected."""
+    with pytest.raises(ValueError):
+        parse_buckets(value)
+
+
+def test_plan_batches_groups_by_length():
+    """Test that short rows are never padded to a long row's length."""
+    lengths = [10, 500, 12, 60, 30, 100]
+    batches = plan_batches(lengths, buckets=[32, 64, 128, 512], max_items=8)
+
+    assert sorted(i for batch in batches for i in batch) == list(range(6))
+    assert [sorted(batch) for batch in batches] == [[0, 2, 4], [3], [5], [1]]
+
+
+def test_plan_batches_without_buckets():
+    """Test that no buckets keeps every row in one group, split by row count."""
+    batches = plan_batches([5, 1, 3, 2, 4], max_items=2)
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+def test_plan_batches_token_budget():
+    """Test that a token budget caps rows times the padded length."""
+    lengths = [8] * 10 + [100]
+    batches = plan_batches(lengths, max_items=2, max_tokens=32)
+
+    for batch in batches:
+        padded = len(batch) * max(lengths[i] for i in batch)
+        assert padded <= 32 or len(batch) == 1
+    assert [len(batch) for batch in batches] == [4, 4, 2, 1]
@@ -0,0 +1,137 @@
+"""Tests for the tursi bench load generator."""
+
+import json
+import threading
+import pytest
+from typer.testing import CliRunner
+from werkzeug.serving import make_server
+from tursi.bench import (
+    build_payload,
+    latency_histogram,
+    load_corpus,
+    percentile,
+    run_bench,
+)
+from tursi.cli import app
+from tursi.engine import TursiEngine
+
+
+@pytest.fixture
+def server_url(mock_loaded_model):
+    """Serve the Flask app for a mocked model on a free port."""
+    engine = TursiEngine()
+    engine.WARMUP = False
+    flask_app = engine.create_app(engine.ALLOWED_MODELS[0], rate_limit="10 per minute")
+    server = make_server("127.0.0.1", 0, flask_app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/predict"
+    server.shutdown()
+    thread.join()
+
+
+def test_percentile():
+    """Test nearest-rank percentiles."""
+    values = list(range(1, 1001))
+    assert percentile(values, 50) == 500
+    assert percentile(values, 99) == 990
+    assert percentile(values, 99.9) == 999
+    assert percentile(values, 100) == 1000
+    assert percentile([7.0], 99.9) == 7.0
+    assert percentile([], 50) == 0.0
+
+
+def test_latency_histogram():
+    """Test latencies are counted in their bucket, overflow in the last."""
+    histogram = latency_histogram([0.5, 1.0, 3, 3, 20, 9000], bounds=(1, 5, 50))
+    assert histogram == [
+        {"le_ms": 1, "count": 2},
+        {"le_ms": 5, "count": 2},
+        {"le_ms": 50, "count": 1},
+        {"le_ms": None, "count": 1},
+    ]
+
+
+def test_load_corpus(tmp_path):
+    """Test reading texts from .jsonl and plain text files."""
+    jsonl = tmp_path / "corpus.jsonl"
+    jsonl.write_text('{"text": "first"}\n\n{"prompt": "second"}\n')
+    plain = tmp_path / "corpus.txt"
+    plain.write_text("one\n  \ntwo\n")
+
+    assert load_corpus(jsonl) == ["first", "second"]
+    assert load_corpus(plain) == ["one", "two"]
+    assert len(load_corpus()) > 1
+
+    (tmp_path / "bad.jsonl").write_text('{"label": 1}\n')
+    with pytest.raises(ValueError):
+        load_corpus(tmp_path / "bad.jsonl")
+    (tmp_path / "empty.txt").write_text("\n")
+    with pytest.raises(ValueError):
+        load_corpus(tmp_path / "empty.txt")
+
+
+def test_build_payload():
+    """Test the payload matches the endpoint's contract."""
+    assert json.loads(build_payload("/predict", "hi")) == {"text": "hi"}
+    assert json.loads(build_payload("/v1/generate", "hi")) == {"prompt": "hi"}
+
+
+def test_run_bench_closed_loop(server_url):
+    """Test a closed-loop run counts successes and rate-limit errors."""
+    report = run_bench(server_url, concurrency=3, duration=0, requests=15)
+
+    assert report["settings"]["mode"] == "closed"
+    assert report["requests"] == 15
+    assert report["successes"] == 10
+    assert report["error_kinds"] == {"429": 5}
+    assert report["status_codes"] == {"200": 10, "429": 5}
+    assert report["error_rate"] == pytest.approx(1 / 3, abs=1e-4)
+    latency = report["latency_ms"]
+    assert 0 < latency["p50"] <= latency["p90"] <= latency["p99"] <= latency["p99.9"]
+    assert sum(bucket["count"] for bucket in report["histogram"]) == 10
+
+
+def test_run_bench_open_loop(server_url):
+    """Test an open-loop run sends requests on a fixed schedule."""
+    report = run_bench(server_url, rate=20, duration=0, requests=6)
+
+    assert report["settings"]["mode"] == "open"
+    assert report["successes"] == 6
+    # Six requests at 20/s are scheduled over 250 ms
+    assert report["duration_s"] >= 0.25
+
+
+def test_run_bench_connection_errors():
+    """Test unreachable servers are reported as errors, not raised."""
+    report = run_bench("http://127.0.0.1:9/predict", duration=0, requests=3)
+    assert report["successes"] == 0
+    assert report["errors"] == 3
+    assert report["error_rate"] == 1.0
+
+    with pytest.raises(ValueError):
+        run_bench("http://127.0.0.1:9/predict", duration=0, requests=0)
+
+
+def test_bench_command_json(server_url, tmp_path):
+    """Test `tursi bench --json` prints and saves the report."""
+    output = tmp_path / "report.json"
+    result = CliRunner().invoke(
+        app,
+        [
+            "bench",
+            server_url,
+            "--requests",
+            "4",
+            "--duration",
+            "0",
+            "--json",
+            "--output",
+            str(output),
+        ],
+    )
+
+    assert result.exit_code == 0
+    report = json.loads(result.stdout)
+    assert report["successes"] == 4
+    assert json.loads(output.read_text()) == report
@@ -0,0 +1,70 @@
+"""Tests for the prediction cache."""
+
+import pytest
+from unittest.mock import patch
+from tursi.cache import PredictionCache, normalize_text
+
+
+def test_normalize_text():
+    """Test that whitespace and Unicode forms do not split cache entries."""
+    assert normalize_text("  great\tproduct \n") == "great product"
+    assert normalize_text("café") == normalize_text("café")
+
+
+def test_hit_and_miss():
+    """Test that cached results are returned as copies and counted."""
+    cache = PredictionCache(max_entries=4)
+    assert cache.get("good") is None
+    cache.put("good", {"label": "POSITIVE", "score": 0.9})
+
+    result = cache.get(" good ")
+    assert result == {"label": "POSITIVE", "score": 0.9}
+    result["label"] = "changed"
+    assert cache.get("good")["label"] == "POSITIVE"
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted first."""
+    cache = PredictionCache(max_entries=2)
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    cache.get("a")
+    cache.put("c", {"n": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+    assert cache.get("c") == {"n": 3}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry():
+    """Test that entries expire after the TTL."""
+    cache = PredictionCache(max_entries=2, ttl_seconds=10)
+    with patch("tursi.cache.time.monotonic", return_value=100.0):
+        cache.put("a", {"n": 1})
+    with patch("tursi.cache.time.monotonic", return_value=105.0):
+        assert cache.get("a") == {"n": 1}
+    with patch("tursi.cache.time.monotonic", return_value=111.0):
+        assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_namespace_separates_artifacts():
+    """Test that caches of different model artifacts never share keys."""
+    first = PredictionCache(max_entries=4, namespace="build-1")
+    second = PredictionCache(max_entries=4, namespace="build-2")
+    assert first.namespace == "build-1"
+    assert first.key("a") != second.key("a")
+    assert first.key("a") == PredictionCache(4, namespace="build-1").key("a")
+
+
+@pytest.mark.parametrize("kwargs", [{"max_entries": 0}, {"ttl_seconds": -1}])
+def test_invalid_settings(kwargs):
+    """Test that invalid cache settings are rejected."""
+    with pytest.raises(ValueError):
+        PredictionCache(**dict({"max_entries": 1}, **kwargs))
@@ -1,6 +1,9 @@
 """Tests for the CLI interface."""
 
+import json
 import os
+import subprocess
+import sys
 from pathlib import Path
 from unittest.mock import Mock, patch
 import pytest
@@ -19,6 +22,52 @@ def test_version():
     assert __version__ in result.stdout
 
 
+# Seconds `import tursi.cli` may take; the ML stack alone takes longer
+CLI_IMPORT_BUDGET = 1.5
+
+LIGHTWEIGHT_COMMAND_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from tursi.cli import app
+elapsed = time.perf_counter() - start
+from typer.testing import CliRunner
+result = CliRunner().invoke(app, sys.argv[1:])
+heavy = ["onnxruntime", "transformers", "optimum", "torch", "flask", "flask_limiter"]
+print(json.dumps({
+    "exit_code": result.exit_code,
+    "import_seconds": elapsed,
+    "loaded": [name for name in heavy if name in sys.modules],
+}))
+"""
+
+
+@pytest.mark.parametrize("args", [["--version"], ["ps"]])
+def test_lightweight_commands_import_budget(args):
+    """Test commands that do not serve a model skip the ML imports."""
+    output = subprocess.run(
+        [sys.executable, "-c", LIGHTWEIGHT_COMMAND_SCRIPT, *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).parent.parent,
+    ).stdout
+    report = json.loads(output.strip().splitlines()[-1])
+
+    assert report["exit_code"] == 0
+    assert report["loaded"] == []
+    assert report["import_seconds"] < CLI_IMPORT_BUDGET
+
+
+def test_package_exports_engine_lazily():
+    """Test ``tursi.TursiEngine`` still resolves through the lazy import."""
+    import tursi
+    from tursi.engine import TursiEngine
+
+    assert tursi.TursiEngine is TursiEngine
+    with pytest.raises(AttributeError):
+        tursi.NotAnEngine
+
+
 @pytest.mark.parametrize("help_flag", ["-h", "--help"])
 def test_help(help_flag):
     """Test help flags show help text."""
@@ -33,42 +82,63 @@ def test_help(help_flag):
     assert "down" in result.stdout
 
 
-@patch("tursi.cli.TursiEngine")
-def test_up_basic(mock_engine):
+def mock_engine_instance(mock_engine):
+    """Give the mocked engine the server settings a real engine reads."""
+    instance = Mock()
+    instance.SERVER_WORKERS = 1
+    instance.SERVER_MODE = "flask"
+    instance.SERVER_UDS = None
+    instance.SERVER_UDS_MODE = "660"
+    instance.MULTI_MODEL = False
+    mock_engine.return_value = instance
+    return instance
+
+
+@patch("tursi.cli.serve")
+@patch("tursi.engine.TursiEngine")
+def test_up_basic(mock_engine, mock_serve):
     """Test basic model deployment with default options."""
     # Setup mock
-    mock_engine_instance = Mock()
-    mock_engine.return_value = mock_engine_instance
+    engine = mock_engine_instance(mock_engine)
     mock_app = Mock()
-    mock_engine_instance.create_app.return_value = mock_app
+    engine.create_app.return_value = mock_app
 
     # Run command
     result = runner.invoke(app, ["up", "distilbert-base-uncased"])
 
     # Check exit code
-    assert result.exit_code == 0
+    assert result.exit_code == 0, result.stdout
 
     # Verify engine initialization
     mock_engine.assert_called_once()
 
     # Verify model deployment
-    mock_engine_instance.create_app.assert_called_once_with(
+    engine.create_app.assert_called_once_with(
         model_name="distilbert-base-uncased", rate_limit="100/minute"
     )
+    mock_serve.assert_called_once_with(
+        mock_app,
+        host="127.0.0.1",
+        port=5000,
+        workers=1,
+        mode="flask",
+        uds=None,
+        uds_mode=0o660,
+    )
 
     # Check output messages
-    assert "Deploying model with Tursi Engine" in result.stdout
-    assert "Model is running at http://127.0.0.1:5000" in result.stdout
+    assert "Model server started successfully" in result.stdout
+    assert "API server running at: http://127.0.0.1:5000" in result.stdout
 
 
-@patch("tursi.cli.TursiEngine")
-def test_up_with_options(mock_engine):
+@patch("tursi.cli.serve")
+@patch("tursi.engine.TursiEngine")
+def test_up_with_options(mock_engine, mock_serve):
     """Test model deployment with custom options."""
     # Setup mock
-    mock_engine_instance = Mock()
-    mock_engine.return_value = mock_engine_instance
+    engine = mock_engine_instance(mock_engine)
     mock_app = Mock()
-    mock_engine_instance.create_app.return_value = mock_app
+    engine.create_app.return_value = mock_app
 
     # Run command with options
     result = runner.invoke(
@@ -92,24 +162,45 @@ def test_up_with_options(mock_engine):
     )
 
     # Check exit code
-    assert result.exit_code == 0
+    assert result.exit_code == 0, result.stdout
 
     # Verify engine configuration
-    mock_engine_instance.setup_model_cache.assert_called_once()
-    assert mock_engine_instance.MODEL_CACHE_DIR == Path("/tmp/models")
-    assert mock_engine_instance.QUANTIZATION_MODE == "static"
-    assert mock_engine_instance.QUANTIZATION_BITS == 4
+    engine.setup_model_cache.assert_called_once()
+    assert engine.MODEL_CACHE_DIR == Path("/tmp/models")
+    assert engine.QUANTIZATION_MODE == "static"
+    assert engine.QUANTIZATION_BITS == 4
 
     # Verify model deployment
-    mock_engine_instance.create_app.assert_called_once_with(
+    engine.create_app.assert_called_once_with(
         model_name="bert-base-uncased", rate_limit="200/minute"
     )
+    assert mock_serve.call_args.kwargs["host"] == "0.0.0.0"
+    assert mock_serve.call_args.kwargs["port"] == 8000
 
     # Check output messages
-    assert "Model is running at http://0.0.0.0:8000" in result.stdout
+    assert "API server running at: http://0.0.0.0:8000" in result.stdout
+
+
+@patch("tursi.cli.serve")
+@patch("tursi.engine.TursiEngine")
+def test_up_multi_model_allow_list(mock_engine, mock_serve):
+    """Test --models sets the models a multi-model server may load."""
+    engine = mock_engine_instance(mock_engine)
+    result = runner.invoke(
+        app, ["up", "org/first", "--multi-model", "--models", "org/first,second"]
+    )
+
+    assert result.exit_code == 0, result.stdout
+    assert engine.ALLOWED_MODELS == ["org/first", "second"]
+    engine.create_multi_model_app.assert_called_once_with(
+        model_name="org/first", rate_limit="100/minute"
+    )
+
+    result = runner.invoke(app, ["up", "org/first", "--models", " , "])
+    assert result.exit_code == 2
 
 
-@patch("tursi.cli.TursiEngine")
+@patch("tursi.engine.TursiEngine")
 def test_up_error_handling(mock_engine):
     """Test error handling during model deployment."""
     # Setup mock to raise an error
@@ -151,7 +242,7 @@ def test_up_invalid_quantization_mode(invalid_mode):
     assert "Invalid value" in result.stdout
 
 
-@patch("tursi.cli.TursiEngine")
+@patch("tursi.engine.TursiEngine")
 def test_down(mock_engine):
     """Test stopping the model deployment."""
     mock_engine_instance = Mock()
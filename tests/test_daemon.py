@@ -7,7 +7,8 @@ import json
 import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock, call
-from tursi.daemon import TursiDaemon, ModelProcess
+from tursi.daemon import TursiDaemon, ModelProcess, apply_engine_config
+from tursi.engine import TursiEngine
 
 
 @pytest.fixture
@@ -233,3 +234,81 @@ def test_model_process_run(mock_engine, tmp_path):
         pid = process.start()
         mock_start.assert_called_once()
         assert pid is not None
+
+
+def test_apply_engine_config():
+    """Test that deployment config overrides engine settings."""
+    engine = TursiEngine()
+    inter_op_threads = engine.ORT_INTER_OP_THREADS
+    apply_engine_config(
+        engine,
+        {
+            "rate_limit": "100/minute",
+            "bits": 8,
+            "intra_op_threads": "auto",
+            "execution_mode": "parallel",
+            "spin_wait": False,
+            "inter_op_threads": None,
+        },
+    )
+    assert engine.QUANTIZATION_BITS == 8
+    assert engine.ORT_INTRA_OP_THREADS == "auto"
+    assert engine.ORT_EXECUTION_MODE == "parallel"
+    assert engine.ORT_ALLOW_SPINNING is False
+    assert engine.ORT_INTER_OP_THREADS == inter_op_threads
+
+
+def test_apply_engine_config_parses_strings():
+    """Test that string values are parsed like the environment settings."""
+    engine = TursiEngine()
+    apply_engine_config(
+        engine,
+        {
+            "multi_model": "false",
+            "warmup": "0",
+            "io_binding": "false",
+            "server_timing": "yes",
+            "bits": "8",
+            "batch_size": "4",
+            "batch_wait_ms": "2.5",
+            "batch_buckets": "64,32",
+            "intra_op_threads": 4,
+            "server": "ASGI",
+            "uds_mode": "600",
+            "allowed_models": "org/first, second",
+        },
+    )
+    assert engine.MULTI_MODEL is False
+    assert engine.WARMUP is False
+    assert engine.ORT_IO_BINDING is False
+    assert engine.SERVER_TIMING is True
+    assert engine.QUANTIZATION_BITS == 8
+    assert engine.BATCH_MAX_SIZE == 4
+    assert engine.BATCH_MAX_WAIT_MS == 2.5
+    assert engine.BATCH_BUCKETS == (32, 64)
+    assert engine.ORT_INTRA_OP_THREADS == "4"
+    assert engine.SERVER_MODE == "asgi"
+    assert engine.SERVER_UDS_MODE == 0o600
+    assert engine.ALLOWED_MODELS == ["org/first", "second"]
+    engine.create_batcher(MagicMock(), MagicMock()).stop()
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        {"warmup": "maybe"},
+        {"batch_size": "four"},
+        {"batch_size": 2.5},
+        {"bits": True},
+        {"batch_wait_ms": "soon"},
+        {"batch_buckets": "32,x"},
+        {"server": "gunicorn"},
+        {"intra_op_threads": "-1"},
+        {"uds_mode": "999"},
+        {"allowed_models": ","},
+    ],
+)
+def test_apply_engine_config_rejects_bad_values(config):
+    """Test that invalid values are rejected with the config key named."""
+    with pytest.raises(ValueError, match=f"'{next(iter(config))}'"):
+        apply_engine_config(TursiEngine(), config)
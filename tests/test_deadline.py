@@ -0,0 +1,115 @@
+"""Tests for per-request deadlines."""
+
+import time
+import numpy as np
+import pytest
+from tursi.batching import MicroBatcher
+from tursi.deadline import DeadlineExceeded, expired, parse_deadline
+from tursi.engine import TursiEngine
+from tursi.tokenization import NumpyTokenizer
+
+
+def test_parse_deadline():
+    """Test the header and the timeout field, the earlier one winning."""
+    assert parse_deadline() is None
+
+    now = time.monotonic()
+    assert parse_deadline(timeout_ms=200) == pytest.approx(now + 0.2, abs=0.05)
+    header = str(time.time() + 1)
+    assert parse_deadline(header) == pytest.approx(now + 1, abs=0.05)
+    assert parse_deadline(header, 200) == pytest.approx(now + 0.2, abs=0.05)
+
+    assert expired(parse_deadline(str(time.time() - 1)))
+    assert not expired(parse_deadline(timeout_ms=10000))
+
+    for header, timeout_ms in [("soon", None), ("inf", None), (None, -1), (None, "1")]:
+        with pytest.raises(ValueError):
+            parse_deadline(header, timeout_ms)
+
+
+def test_batcher_drops_expired_items():
+    """Test expired items are skipped when a batch is formed."""
+    batches = []
+
+    def process(items):
+        batches.append(items)
+        return items
+
+    batcher = MicroBatcher(
+        process, max_batch_size=4, max_wait_ms=50, expired=lambda item: item == "old"
+    )
+    stale = batcher.submit("old")
+    fresh = batcher.submit("new")
+
+    assert fresh.result(timeout=5) == "new"
+    with pytest.raises(DeadlineExceeded) as error:
+        stale.result(timeout=5)
+    assert error.value.stage == "batch"
+    assert batches == [["new"]]
+    assert batcher.stats()["expired"] == 1
+    batcher.stop()
+
+
+@pytest.fixture
+def engine():
+    """Create a TursiEngine instance for testing."""
+    engine = TursiEngine()
+    engine.WARMUP = False
+    return engine
+
+
+def test_predict_deadlines(engine, mock_loaded_model):
+    """Test expired requests get 504 without running inference."""
+    model, _ = mock_loaded_model
+    client = engine.create_app(engine.ALLOWED_MODELS[0]).test_client()
+
+    response = client.post("/predict", json={"text": "hi", "timeout_ms": 10000})
+    assert response.status_code == 200
+    calls = model.call_count
+
+    response = client.post("/predict", json={"text": "hi", "timeout_ms": 0})
+    assert response.status_code == 504
+    assert response.get_json() == {"error": "Deadline exceeded"}
+    response = client.post(
+        "/predict",
+        json={"texts": ["a", "b"]},
+        headers={"X-Request-Deadline": str(time.time() - 1)},
+    )
+    assert response.status_code == 504
+    assert model.call_count == calls
+
+    response = client.post("/predict", json={"text": "hi", "timeout_ms": "soon"})
+    assert response.status_code == 400
+
+    metrics = client.get("/metrics").get_data(as_text=True)
+    assert 'tursi_deadline_exceeded_total{stage="arrival"} 2' in metrics
+
+
+def test_predict_batch_stops_between_forward_passes(engine, tiny_model_dir):
+    """Test a deadline passing mid-request skips the remaining passes."""
+    tokenizer = NumpyTokenizer.from_pretrained(tiny_model_dir)
+
+    class Model:
+        calls = 0
+
+        def __call__(self, **inputs):
+            Model.calls += 1
+            time.sleep(0.05)
+            return np.zeros((len(inputs["input_ids"]), 2), dtype=np.float32)
+
+    engine.PREDICT_CHUNK_SIZE = 1
+    deadline = time.monotonic() + 0.02
+    with pytest.raises(DeadlineExceeded) as error:
+        engine.predict_batch(Model(), tokenizer, ["a", "b", "c"], deadline=deadline)
+    assert error.value.stage == "inference"
+    assert Model.calls == 1
+
+
+def test_generation_stops_at_deadline():
+    """Test generation is told to stop once the deadline passes."""
+    import torch
+    from tursi.model import DeadlineStoppingCriteria
+
+    input_ids = torch.ones((2, 3), dtype=torch.long)
+    assert not DeadlineStoppingCriteria(time.monotonic() + 60)(input_ids, None).any()
+    assert DeadlineStoppingCriteria(time.monotonic() - 1)(input_ids, None).all()
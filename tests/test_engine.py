@@ -16,8 +16,8 @@ def engine():
 
 @pytest.fixture
 def mock_pipeline():
-    """Mock the transformers pipeline."""
-    with patch("tursi.engine.ORTModelForSequenceClassification") as mock:
+    """Mock the ONNX Runtime classifier."""
+    with patch("tursi.engine.OnnxClassifier") as mock:
         # Create a mock model that returns a fixed result
         mock_model = MagicMock()
         mock_model.return_value = [{"label": "POSITIVE", "score": 0.9}]
@@ -83,3 +83,239 @@ def test_input_validation(engine, mock_pipeline):
     response = client.post("/predict", json={"text": 123})
     assert response.status_code == 400
     assert b"Invalid input" in response.data
+
+
+def test_predict_with_micro_batching(engine, mock_loaded_model):
+    """Test that /predict goes through the micro-batcher when enabled."""
+    engine.BATCH_MAX_SIZE = 4
+    engine.BATCH_MAX_WAIT_MS = 1
+    app = engine.create_app(engine.ALLOWED_MODELS[0])
+    client = app.test_client()
+
+    response = client.post("/predict", json={"text": "Hello, world!"})
+    assert response.status_code == 200
+    assert response.get_json()["label"] == "POSITIVE"
+
+    batching = client.get("/health").get_json()["batching"]
+    assert batching["enabled"] is True
+    assert batching["max_batch_size"] == 4
+    assert batching["requests"] == 1
+    assert batching["batch_sizes"] == {"1": 1}
+
+
+def test_predict_without_micro_batching(engine, mock_loaded_model):
+    """Test that batching is disabled by default."""
+    app = engine.create_app(engine.ALLOWED_MODELS[0])
+    client = app.test_client()
+
+    response = client.post("/predict", json={"text": "Hello, world!"})
+    assert response.status_code == 200
+    batching = client.get("/health").get_json()["batching"]
+    assert batching["enabled"] is False
+    assert batching["buckets"] == [32, 64, 128, 256, 512]
+
+
+def test_predict_texts_batch(engine, mock_loaded_model):
+    """Test scoring a list of texts with invalid items reported in place."""
+    model, tokenizer = mock_loaded_model
+    engine.PREDICT_CHUNK_SIZE = 2
+    engine.WARMUP = False  # only count calls made for the request
+    app = engine.create_app(engine.ALLOWED_MODELS[0])
+    client = app.test_client()
+
+    texts = ["good", 123, "great", "x" * 1000, "fine", "nice", "ok"]
+    response = client.post("/predict", json={"texts": texts})
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+
+    assert len(results) == len(texts)
+    assert "Invalid input" in results[1]["error"]
+    assert "Invalid input" in results[3]["error"]
+    for i in (0, 2, 4, 5, 6):
+        assert results[i]["label"] == "POSITIVE"
+
+    # One tokenizer call for the whole list, one forward pass per chunk
+    tokenizer.assert_called_once()
+    assert model.call_count == 3
+
+
+def test_predict_texts_validation(engine, mock_loaded_model):
+    """Test validation of the texts field itself."""
+    app = engine.create_app(engine.ALLOWED_MODELS[0])
+    client = app.test_client()
+
+    response = client.post("/predict", json={"texts": "not a list"})
+    assert response.status_code == 400
+
+    response = client.post("/predict", json={"texts": []})
+    assert response.status_code == 400
+
+    response = client.post(
+        "/predict", json={"texts": ["a"] * (engine.MAX_BATCH_TEXTS + 1)}
+    )
+    assert response.status_code == 400
+    assert b"Too many texts" in response.data
+
+
+def test_serving_does_not_import_torch(tiny_model_dir, tmp_path):
+    """Test that loading a cached model and predicting never imports torch."""
+    import subprocess
+    import sys
+
+    # Export and quantize up front; exporting needs torch, serving does not
+    engine = TursiEngine()
+    engine.MODEL_CACHE_DIR = tmp_path / "models"
+    engine.load_quantized_model(tiny_model_dir)
+
+    script = f"""
+import sys
+from pathlib import Path
+from tursi.engine import TursiEngine
+
+assert "torch" not in sys.modules, "importing tursi.engine imported torch"
+engine = TursiEngine()
+engine.MODEL_CACHE_DIR = Path({str(engine.MODEL_CACHE_DIR)!r})
+model, tokenizer = engine.load_quantized_model({tiny_model_dir!r})
+results = engine.predict_batch(model, tokenizer, ["i love it", "bad"])
+assert [r["label"] in ("POSITIVE", "NEGATIVE") for r in results] == [True, True]
+assert "torch" not in sys.modules, "serving imported torch"
+"""
+    subprocess.run([sys.executable, "-c", script], check=True, timeout=120)
+
+
+def test_predict_batch_pads_per_bucket(engine, tiny_model_dir):
+    """Test that rows are padded per length bucket and returned in order."""
+    import numpy as np
+    from tursi.tokenization import NumpyTokenizer
+
+    tokenizer = NumpyTokenizer.from_pretrained(tiny_model_dir)
+    shapes = []
+
+    def model(input_ids, attention_mask, token_type_ids):
+        shapes.append(input_ids.shape)
+        # Score each row by its length so results can be matched to inputs
+        lengths = attention_mask.sum(axis=1).astype(np.float32)
+        return np.stack([np.zeros_like(lengths), lengths - 10], axis=1)
+
+    engine.BATCH_BUCKETS = [8, 32, 64]
+    texts = ["good", "hello " * 50, "bad", "i love it", "hello " * 20]
+    results = engine.predict_batch(model, tokenizer, texts)
+
+    assert sorted(shapes) == [(1, 22), (1, 52), (3, 5)]
+    labels = [r["label"] for r in results]
+    assert labels == ["NEGATIVE", "POSITIVE", "NEGATIVE", "NEGATIVE", "POSITIVE"]
+
+    # A token budget limits padded tokens rather than rows
+    shapes.clear()
+    engine.BATCH_BUCKETS = []
+    engine.BATCH_MAX_TOKENS = 60
+    assert engine.predict_batch(model, tokenizer, texts) == results
+    assert all(rows * length <= 60 or rows == 1 for rows, length in shapes)
+
+
+def test_prediction_cache(engine, mock_loaded_model):
+    """Test that repeated texts are served from the prediction cache."""
+    model, _ = mock_loaded_model
+    engine.PREDICTION_CACHE_SIZE = 10
+    engine.WARMUP = False  # only count calls made for requests
+    app = engine.create_app(engine.ALLOWED_MODELS[0])
+    client = app.test_client()
+
+    first = client.post("/predict", json={"text": "great product"})
+    second = client.post("/predict", json={"text": " great  product"})
+    assert first.get_json() == second.get_json()
+    assert model.call_count == 1
+
+    # Cached and new texts are mixed in a batch request
+    response = client.post("/predict", json={"texts": ["great product", "new"]})
+    assert len(response.get_json()["results"]) == 2
+    assert model.call_count == 2
+
+    cache = client.get("/health").get_json()["cache"]
+    assert cache["enabled"] is True
+    assert cache["hits"] == 2
+    assert cache["misses"] == 2
+
+
+def test_prediction_cache_namespace_tracks_artifact(engine, tmp_path):
+    """Test that a rebuilt model artifact gets a new cache namespace."""
+    engine.MODEL_CACHE_DIR = tmp_path / "models"
+    model_name = engine.ALLOWED_MODELS[0]
+    before = engine.prediction_cache_namespace(model_name)
+
+    model_dir = engine.quantized_model_dir(model_name)
+    cache = engine.artifact_cache()
+    cache.publish(cache.scratch_dir(model_dir), model_dir, {"model": model_name})
+    built = engine.prediction_cache_namespace(model_name)
+    assert built != before
+
+    engine.QUANTIZATION_BITS = 4
+    assert engine.prediction_cache_namespace(model_name) != built
+
+
+def test_warmup_shapes(engine):
+    """Test that warmup covers every batch size and sequence bucket."""
+    engine.BATCH_MAX_SIZE = 8
+    engine.PREDICT_CHUNK_SIZE = 32
+    engine.BATCH_BUCKETS = [32, 128, 1024]
+    shapes = engine.warmup_shapes(tokenizer=None)
+    sizes = (1, 2, 3, 4, 5, 6, 7, 8, 32)
+    assert shapes == [(b, s) for s in (32, 128, 512) for b in sizes]
+
+    # Rows longer than every bucket are padded to the max input length
+    engine.BATCH_MAX_SIZE = 1
+    engine.BATCH_BUCKETS = [32, 128]
+    shapes = engine.warmup_shapes(tokenizer=None)
+    assert shapes == [(b, s) for s in (32, 128, 512) for b in (1, 32)]
+
+    engine.WARMUP_BATCH_SIZES = "1,4"
+    engine.BATCH_MAX_TOKENS = 256
+    assert engine.warmup_shapes(tokenizer=None) == [
+        (1, 32),
+        (4, 32),
+        (1, 128),
+        (1, 512),
+    ]
+
+
+def test_health_reports_warming_until_ready(engine, mock_loaded_model):
+    """Test that /health returns 503 while warming and requests are held."""
+    import threading
+
+    model, _ = mock_loaded_model
+    release = threading.Event()
+    original = engine.warmup
+
+    def slow_warmup(*args):
+        release.wait(timeout=5)
+        return original(*args)
+
+    engine.warmup = slow_warmup
+    client = engine.create_app(engine.ALLOWED_MODELS[0]).test_client()
+
+    response = client.get("/health")
+    assert response.status_code == 503
+    assert response.get_json()["state"] == "warming"
+
+    release.set()
+    assert client.post("/predict", json={"text": "good"}).status_code == 200
+    response = client.get("/health")
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["status"] == "healthy"
+    assert data["state"] == "ready"
+    assert data["warmup"]["shapes"] == len(engine.warmup_shapes(None))
+    # Every warmup shape ran through the model before the request
+    assert model.call_count == data["warmup"]["shapes"] + 2
+
+
+def test_warmup_runs_real_model(engine, tiny_model_dir, tmp_path):
+    """Test warming up an ONNX model at every bucket up to its max length."""
+    engine.MODEL_CACHE_DIR = tmp_path / "models"
+    model, tokenizer = engine.load_quantized_model(tiny_model_dir)
+
+    # Buckets above the model's 128 positions are capped
+    assert engine.warmup_shapes(tokenizer) == [
+        (b, s) for s in (32, 64, 128) for b in (1, 32)
+    ]
+    assert engine.warmup(model, tokenizer)["shapes"] == 6
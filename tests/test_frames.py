@@ -0,0 +1,184 @@
+"""Tests for binary request and response frames."""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from tursi.engine import TursiEngine
+from tursi.frames import (
+    FRAME_CONTENT_TYPE,
+    FrameError,
+    decode_request,
+    decode_response,
+    encode_request,
+    encode_response,
+    wants_frame,
+)
+
+FRAME_HEADERS = {"Content-Type": FRAME_CONTENT_TYPE, "Accept": FRAME_CONTENT_TYPE}
+
+
+def test_request_round_trip():
+    """Test requests decode to the body the JSON request would have."""
+    assert decode_request(encode_request("héllo")) == {"text": "héllo"}
+    assert decode_request(encode_request(["a", "", "ü"], top_k=3)) == {
+        "texts": ["a", "", "ü"],
+        "top_k": 3,
+    }
+    assert decode_request(encode_request([])) == {"texts": []}
+    assert decode_request(encode_request("hi", timeout_ms=2.5), "prompt") == {
+        "prompt": "hi",
+        "timeout_ms": 2.5,
+    }
+
+
+def test_response_round_trip():
+    """Test responses decode to the JSON body, scores at float32 precision."""
+    ranked = [
+        {"label": "POSITIVE", "score": 0.75},
+        {"label": "NEGATIVE", "score": 0.25},
+    ]
+    bodies = [
+        {"label": "POSITIVE", "score": 0.5},
+        {"results": [{"label": "NEGATIVE", "score": 1.0}, {"error": "bad input"}]},
+        {"results": [dict(ranked[0], labels=ranked)]},
+        {"results": []},
+        {"generated_text": "once upon a time"},
+        # More ranked labels than fit in a byte, e.g. top_k=300
+        {
+            "results": [
+                dict(
+                    label="L0",
+                    score=1.0,
+                    labels=[{"label": f"L{i}", "score": 1.0} for i in range(300)],
+                )
+            ]
+        },
+    ]
+    for body in bodies:
+        assert decode_response(encode_response(body)) == body
+    assert decode_response(encode_response({"label": "A", "score": 0.1}))[
+        "score"
+    ] == pytest.approx(0.1)
+
+
+def test_invalid_frames():
+    """Test malformed payloads raise FrameError."""
+    payload = encode_request(["a", "b"])
+    for bad in [b"", b"{}" + payload[2:], payload[:-1], payload + b"x"]:
+        with pytest.raises(FrameError):
+            decode_request(bad)
+    with pytest.raises(FrameError):
+        decode_request(encode_request([b"\xff".decode("latin-1")])[:-2] + b"\xff")
+    with pytest.raises(FrameError):
+        decode_response(encode_response({"label": "A", "score": 1.0})[:-1])
+    with pytest.raises(FrameError):
+        encode_response({"unknown": 1})
+
+
+def test_wants_frame():
+    """Test the Accept header wins, and requests get their own encoding back."""
+    assert wants_frame(FRAME_CONTENT_TYPE, False)
+    assert not wants_frame("application/json", True)
+    assert wants_frame("", True)
+    assert not wants_frame("*/*", False)
+
+
+@pytest.fixture
+def engine():
+    """Create a TursiEngine instance for testing."""
+    engine = TursiEngine()
+    engine.WARMUP = False
+    return engine
+
+
+@pytest.mark.parametrize(
+    "texts, options",
+    [("great product", {}), (["good", "bad"], {}), (["good"], {"top_k": 2})],
+)
+def test_predict_frames_match_json(engine, mock_loaded_model, texts, options):
+    """Test /predict gives the same results for frames and JSON."""
+    client = engine.create_app(engine.ALLOWED_MODELS[0]).test_client()
+    field = "text" if isinstance(texts, str) else "texts"
+    expected = client.post("/predict", json={field: texts, **options}).get_json()
+
+    response = client.post(
+        "/predict", data=encode_request(texts, **options), headers=FRAME_HEADERS
+    )
+    assert response.status_code == 200
+    assert response.content_type == FRAME_CONTENT_TYPE
+    assert decode_response(response.data) == pytest.approx(expected)
+
+    # Frame requests can still ask for a JSON response
+    response = client.post(
+        "/predict",
+        data=encode_request(texts, **options),
+        headers={"Content-Type": FRAME_CONTENT_TYPE, "Accept": "application/json"},
+    )
+    assert response.get_json() == expected
+
+
+def test_predict_frame_errors(engine, mock_loaded_model):
+    """Test invalid frames get 400 and errors stay JSON."""
+    client = engine.create_app(engine.ALLOWED_MODELS[0]).test_client()
+    response = client.post("/predict", data=b"TF\x09", headers=FRAME_HEADERS)
+    assert response.status_code == 400
+    assert response.get_json()["error"].startswith("Invalid frame")
+
+    response = client.post("/predict", data=encode_request([]), headers=FRAME_HEADERS)
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_asgi_frames(engine, mock_loaded_model):
+    """Test the ASGI app negotiates frames like the Flask app."""
+    app = engine.create_asgi_app(engine.ALLOWED_MODELS[0])
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/predict",
+        "headers": [
+            (b"content-type", FRAME_CONTENT_TYPE.encode()),
+            (b"accept", FRAME_CONTENT_TYPE.encode()),
+        ],
+        "client": ("127.0.0.1", 12345),
+    }
+    messages = [
+        {"type": "http.request", "body": encode_request(["a", "b"]), "more_body": False}
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    app.executor.shutdown()
+    assert sent[0]["status"] == 200
+    assert (b"content-type", FRAME_CONTENT_TYPE.encode()) in sent[0]["headers"]
+    results = decode_response(sent[1]["body"])["results"]
+    assert [result["label"] for result in results] == ["POSITIVE", "POSITIVE"]
+
+
+def test_client_helper(engine, mock_loaded_model):
+    """Test tursi.test.predict decodes both encodings to the same body."""
+    from tursi.test import predict
+
+    client = engine.create_app(engine.ALLOWED_MODELS[0]).test_client()
+
+    class Session:
+        def post(self, url, data=None, json=None, headers=None, timeout=None):
+            response = client.post(url, data=data, json=json, headers=headers)
+            return SimpleNamespace(
+                raise_for_status=lambda: None,
+                headers=response.headers,
+                content=response.data,
+                json=response.get_json,
+            )
+
+    binary = predict(
+        "/predict", ["good", "bad"], binary=True, session=Session(), top_k=2
+    )
+    plain = predict("/predict", ["good", "bad"], session=Session(), top_k=2)
+    assert binary == pytest.approx(plain)
@@ -0,0 +1,142 @@
+"""Tests for label mapping and logits post-processing."""
+
+import json
+import numpy as np
+import pytest
+from tursi.engine import TursiEngine
+from tursi.labels import LabelMap, parse_top_k, top_k_indices
+
+
+def write_config(path, **config):
+    """Write a Transformers config.json and return its path."""
+    config_path = path / "config.json"
+    config_path.write_text(json.dumps(config))
+    return config_path
+
+
+def test_top_k_indices():
+    """Test rows are ranked best first, matching a full sort."""
+    scores = np.random.default_rng(0).random((16, 40))
+    expected = np.argsort(-scores, axis=1)
+    np.testing.assert_array_equal(top_k_indices(scores, 3), expected[:, :3])
+    np.testing.assert_array_equal(top_k_indices(scores, 40), expected)
+
+
+def test_label_map_from_config(tmp_path):
+    """Test labels and the problem type are read from config.json."""
+    intents = [f"intent_{i}" for i in range(40)]
+    label_map = LabelMap.from_config(
+        write_config(
+            tmp_path,
+            id2label={str(i): label for i, label in enumerate(intents)},
+            problem_type="single_label_classification",
+        )
+    )
+    assert label_map.labels == intents
+    assert label_map.multi_label is False
+
+    # Keys are sorted numerically, not as strings
+    label_map = LabelMap.from_config(
+        write_config(
+            tmp_path,
+            id2label={str(i): f"tag_{i}" for i in range(12)},
+            problem_type="multi_label_classification",
+        )
+    )
+    assert label_map.labels[:3] == ["tag_0", "tag_1", "tag_2"]
+    assert label_map.multi_label is True
+
+    # Binary models without named labels keep the sentiment labels
+    config = write_config(tmp_path, id2label={"0": "LABEL_0", "1": "LABEL_1"})
+    assert LabelMap.from_config(config).labels == ["NEGATIVE", "POSITIVE"]
+    assert LabelMap.from_config(tmp_path / "missing.json").labels == [
+        "NEGATIVE",
+        "POSITIVE",
+    ]
+
+
+def test_postprocess_top_k():
+    """Test the best labels of every row, with a per-row top_k."""
+    label_map = LabelMap(["a", "b", "c", "d"])
+    logits = np.array([[0.0, 3.0, 1.0, 2.0], [4.0, 0.0, 0.0, 0.0]], dtype=np.float32)
+
+    first, second = label_map.postprocess(logits, top_k=[3, 1])
+    assert [entry["label"] for entry in first["labels"]] == ["b", "d", "c"]
+    assert first["label"] == "b"
+    assert first["score"] == first["labels"][0]["score"]
+    assert second["label"] == "a"
+    assert "labels" not in second
+
+    # top_k beyond the number of classes returns every class
+    result = label_map.postprocess(logits[:1], top_k=10)[0]
+    assert len(result["labels"]) == 4
+    assert sum(entry["score"] for entry in result["labels"]) == pytest.approx(1)
+
+
+def test_postprocess_multi_label():
+    """Test multi-label models score each class independently."""
+    label_map = LabelMap(["toxic", "spam", "ok"], multi_label=True)
+    result = label_map.postprocess(np.array([[5.0, 5.0, -5.0]]), top_k=3)[0]
+
+    scores = [entry["score"] for entry in result["labels"]]
+    assert scores[:2] == pytest.approx([0.9933, 0.9933], abs=1e-4)
+    assert scores[2] == pytest.approx(0.0067, abs=1e-4)
+
+
+def test_postprocess_unnamed_classes():
+    """Test classes beyond the configured labels get generic names."""
+    result = LabelMap().postprocess(np.array([[0.0, 0.0, 9.0]]))[0]
+    assert result["label"] == "LABEL_2"
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(None, 1), (1, 1), (5, 5), (0, None), (-1, None), (True, None), ("3", None)],
+)
+def test_parse_top_k(value, expected):
+    """Test validation of the top_k request parameter."""
+    assert parse_top_k(value) == expected
+
+
+@pytest.fixture
+def engine():
+    """Create a TursiEngine instance for testing."""
+    engine = TursiEngine()
+    engine.WARMUP = False
+    return engine
+
+
+def test_predict_top_k(engine, mock_loaded_model):
+    """Test /predict returns the top_k labels and rejects invalid values."""
+    engine.PREDICTION_CACHE_SIZE = 8
+    client = engine.create_app(engine.ALLOWED_MODELS[0]).test_client()
+
+    response = client.post("/predict", json={"text": "I love this!", "top_k": 2})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["label"] == "POSITIVE"
+    assert [entry["label"] for entry in data["labels"]] == ["POSITIVE", "NEGATIVE"]
+
+    # Results with a different top_k are cached separately
+    data = client.post("/predict", json={"text": "I love this!"}).get_json()
+    assert "labels" not in data
+    results = client.post(
+        "/predict", json={"texts": ["I love this!", "ok"], "top_k": 2}
+    ).get_json()["results"]
+    assert all(len(result["labels"]) == 2 for result in results)
+
+    response = client.post("/predict", json={"text": "hi", "top_k": 0})
+    assert response.status_code == 400
+    assert "top_k" in response.get_json()["error"]
+
+
+def test_predict_top_k_with_batching(engine, mock_loaded_model):
+    """Test requests with different top_k can share a micro-batch."""
+    engine.BATCH_MAX_SIZE = 4
+    engine.BATCH_MAX_WAIT_MS = 1
+    service = engine.create_service(engine.ALLOWED_MODELS[0])
+    try:
+        assert "labels" in service.predict_one("good", top_k=2)
+        assert "labels" not in service.predict_one("good")
+    finally:
+        service.batcher.stop()
@@ -0,0 +1,189 @@
+"""Tests for the Prometheus metrics."""
+
+import threading
+import pytest
+from tursi import metrics as metrics_module
+from tursi.engine import TursiEngine
+from tursi.metrics import Counter, Gauge, Histogram, MetricsRegistry, ServerMetrics
+from .test_asgi import call
+
+
+def sample(text: str, name: str) -> float:
+    """Read one sample value from rendered metrics."""
+    for line in text.splitlines():
+        if line.startswith(name + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{name} not found in:\n{text}")
+
+
+def test_counter_and_gauge():
+    """Test counters and gauges render their totals per label set."""
+    registry = MetricsRegistry()
+    requests = registry.register(Counter("requests_total", "Requests.", ("status",)))
+    in_flight = registry.register(Gauge("in_flight", "In flight."))
+    requests.inc("200")
+    requests.inc("200", amount=2)
+    requests.inc('4"0\\0')
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+
+    text = registry.render()
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{status="200"} 3' in text
+    assert 'requests_total{status="4\\"0\\\\0"} 1' in text
+    assert "# TYPE in_flight gauge" in text
+    assert sample(text, "in_flight") == 1
+    assert requests.value("200") == 3
+
+    with pytest.raises(ValueError):
+        requests.inc()
+
+
+def test_histogram():
+    """Test histograms render cumulative buckets, sum and count."""
+    histogram = Histogram("latency_seconds", "Latency.", ("stage",), buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value, "inference")
+
+    lines = histogram.collect()
+    assert 'latency_seconds_bucket{stage="inference",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{stage="inference",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{stage="inference",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{stage="inference"} 3.65' in lines
+    assert 'latency_seconds_count{stage="inference"} 4' in lines
+    assert histogram.count("inference") == 4
+
+    # Unlabeled histograms are exposed before the first observation
+    empty = Histogram("batch_size", "Rows.", buckets=(1, 2)).collect()
+    assert 'batch_size_bucket{le="+Inf"} 0' in empty
+    assert "batch_size_count 0" in empty
+
+
+def test_metric_function():
+    """Test metrics read from a callable at scrape time."""
+    gauge = Gauge("queue_depth", "Queued requests.")
+    gauge.set_function(lambda: 7)
+    assert "queue_depth 7" in gauge.collect()
+    gauge.set_function(lambda: 1 / 0)
+    assert "queue_depth NaN" in gauge.collect()
+
+
+def test_concurrent_updates(monkeypatch):
+    """Test updates from many threads are neither lost nor double counted."""
+    monkeypatch.setattr(metrics_module, "FOLD_THRESHOLD", 16)
+    counter = Counter("events_total", "Events.")
+    histogram = Histogram("values", "Values.")
+
+    def record():
+        for _ in range(2000):
+            counter.inc()
+            histogram.observe(0.01)
+
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.value() == 16000
+    assert histogram.count() == 16000
+
+
+def test_server_metrics_bindings():
+    """Test queue depth and cache statistics are read from their sources."""
+
+    class Batcher:
+        def pending(self):
+            return 3
+
+    class Cache:
+        hits, misses = 6, 2
+
+        def stats(self):
+            return {"hit_rate": 0.75}
+
+    server_metrics = ServerMetrics()
+    server_metrics.bind_batcher(Batcher())
+    server_metrics.bind_cache(Cache())
+    text = server_metrics.render()
+
+    assert sample(text, "tursi_queue_depth") == 3
+    assert sample(text, "tursi_cache_hits_total") == 6
+    assert sample(text, "tursi_cache_misses_total") == 2
+    assert sample(text, "tursi_cache_hit_ratio") == 0.75
+
+
+def test_render_merges_labeled_registries():
+    """Test registries with constant labels render into shared families."""
+    merged = ServerMetrics()
+    first, second = ServerMetrics({"model": "a"}), ServerMetrics({"model": "b"})
+    first.tokens.inc(amount=5)
+    second.stage_latency.observe(0.01, "inference")
+
+    text = merged.render(first, second)
+    assert text.count("# HELP tursi_tokens_total") == 1
+    assert sample(text, "tursi_tokens_total") == 0
+    assert 'tursi_tokens_total{model="a"} 5' in text
+    assert 'tursi_tokens_total{model="b"} 0' in text
+    assert 'tursi_stage_duration_seconds_count{model="b",stage="inference"} 1' in text
+
+
+@pytest.fixture
+def engine():
+    """Create a TursiEngine instance for testing."""
+    engine = TursiEngine()
+    engine.WARMUP = False
+    return engine
+
+
+def test_flask_metrics_endpoint(engine, mock_loaded_model):
+    """Test the Flask app records requests, stages and tokens."""
+    app = engine.create_app(engine.ALLOWED_MODELS[0], rate_limit="2/minute")
+    with app.test_client() as client:
+        for _ in range(3):
+            client.post("/predict", json={"text": "I love this!"})
+        client.post("/predict", json={"texts": ["good", "bad"]})
+        client.get("/nowhere")
+
+        # Scrapes are not rate limited
+        for _ in range(3):
+            response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.content_type.startswith("text/plain")
+        text = response.get_data(as_text=True)
+
+    assert sample(text, 'tursi_requests_total{endpoint="/predict",status="200"}') == 2
+    assert sample(text, 'tursi_requests_total{endpoint="/predict",status="429"}') == 2
+    assert sample(text, 'tursi_requests_total{endpoint="unmatched",status="404"}') == 1
+    assert (
+        sample(text, 'tursi_request_duration_seconds_count{endpoint="/predict"}') == 4
+    )
+    for stage in ("tokenize", "inference", "postprocess"):
+        assert (
+            sample(text, f'tursi_stage_duration_seconds_count{{stage="{stage}"}}') == 2
+        )
+    assert sample(text, "tursi_batch_size_count") == 2
+    assert sample(text, "tursi_batch_size_sum") == 2
+    # The mocked tokenizer returns 4 tokens per text
+    assert sample(text, "tursi_tokens_total") == 8
+    # The scrape itself is still in flight while rendering
+    assert sample(text, "tursi_requests_in_flight") == 1
+
+
+def test_asgi_metrics_endpoint(engine, mock_loaded_model):
+    """Test the ASGI app exposes the same metrics."""
+    app = engine.create_asgi_app(engine.ALLOWED_MODELS[0])
+    try:
+        call(app, "POST", "/predict", {"text": "I love this!"})
+        call(app, "POST", "/predict", {"text": 42})
+        assert call(app, "POST", "/metrics")[0] == 405
+        text = app.service.metrics.render()
+    finally:
+        app.executor.shutdown()
+
+    assert sample(text, 'tursi_requests_total{endpoint="/predict",status="200"}') == 1
+    assert sample(text, 'tursi_requests_total{endpoint="/predict",status="400"}') == 1
+    assert sample(text, 'tursi_requests_total{endpoint="/metrics",status="405"}') == 1
+    assert sample(text, 'tursi_stage_duration_seconds_count{stage="inference"}') == 1
+    assert sample(text, "tursi_requests_in_flight") == 0
@@ -1,10 +1,12 @@
 """Tests for model management and deployment."""
 
 import pytest
+import socket
 import threading
+import time
 import requests
-from unittest.mock import Mock, patch
-from tursi.model import ModelManager, ModelServer
+from unittest.mock import MagicMock, Mock, patch
+from tursi.model import ModelConfig, ModelInfo, ModelManager, ModelServer
 
 
 @pytest.fixture
@@ -70,6 +72,18 @@ def test_model_server_health_check(mock_server):
         assert response.json["model"] == "test-model"
 
 
+def test_model_server_metrics(mock_server):
+    """Test the metrics endpoint counts requests to the server."""
+    with mock_server.app.test_client() as client:
+        client.get("/v1/health")
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert (
+            'tursi_requests_total{endpoint="/v1/health",status="200"} 1'
+            in response.get_data(as_text=True)
+        )
+
+
 @patch("tursi.model.AutoModelForCausalLM")
 @patch("tursi.model.AutoTokenizer")
 def test_model_manager_load_model(mock_auto_tokenizer, mock_auto_model, model_manager):
@@ -123,6 +137,67 @@ def test_model_manager_deploy_model(model_manager, mock_model, mock_tokenizer):
             )
 
 
+def test_deployed_server_sheds_overload(model_manager, monkeypatch):
+    """Test a deployment serves requests concurrently, so overflow gets 503s."""
+    monkeypatch.setenv("QUEUE_MAX_DEPTH", "1")
+    monkeypatch.setenv("INFERENCE_CONCURRENCY", "1")
+    started, release = threading.Event(), threading.Event()
+
+    def generate(*args, **kwargs):
+        started.set()
+        release.wait(timeout=10)
+        return [[1, 2, 3]]
+
+    model = Mock()
+    model.generate.side_effect = generate
+    tokenizer = MagicMock()
+    tokenizer.decode.return_value = "Generated text"
+    model_manager.load_model = Mock(
+        return_value=ModelInfo(model, tokenizer, ModelConfig(model_name="test/busy"))
+    )
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    model_manager.deploy_model(model_name="test/busy", host="127.0.0.1", port=port)
+
+    base = f"http://127.0.0.1:{port}"
+    results = []
+
+    def generate_request():
+        response = requests.post(
+            f"{base}/v1/generate", json={"prompt": "hi"}, timeout=10
+        )
+        results.append(response.status_code)
+
+    clients = [threading.Thread(target=generate_request) for _ in range(2)]
+    try:
+        # The first request generates, the second waits in the queue
+        clients[0].start()
+        assert started.wait(timeout=10)
+        clients[1].start()
+        deadline = time.monotonic() + 10
+        while (
+            "tursi_admission_queue_depth 1"
+            not in requests.get(f"{base}/metrics", timeout=5).text
+        ):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        response = requests.post(
+            f"{base}/v1/generate", json={"prompt": "hi"}, timeout=5
+        )
+        assert response.status_code == 503
+        assert "Retry-After" in response.headers
+    finally:
+        release.set()
+        for client in clients:
+            if client.ident:
+                client.join(timeout=10)
+        model_manager.stop_model(port)
+        model_manager.models.pop("test/busy", None)
+    assert results == [200, 200]
+
+
 def test_model_manager_stop_model(model_manager):
     """Test stopping a model deployment."""
     # Setup mock server
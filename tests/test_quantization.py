@@ -1,6 +1,11 @@
 import os
+import shutil
+import onnx
 import pytest
+from unittest.mock import patch
 from tursi.engine import TursiEngine
+from tursi.quantization import QUANTIZED_MODEL_FILE, iter_calibration_texts
+from tursi.runtime import softmax
 
 # Test model name
 TEST_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
@@ -18,7 +23,7 @@ def test_quantization_loading(engine):
         model, tokenizer = engine.load_quantized_model(TEST_MODEL)
         assert model is not None
         assert tokenizer is not None
-        assert hasattr(model, "forward"), "Model should have forward method"
+        assert callable(model), "Model should be callable"
     except Exception as e:
         pytest.fail(f"Failed to load quantized model: {str(e)}")
 
@@ -35,14 +40,13 @@ def test_quantized_inference(engine):
     assert engine.validate_input(test_text), "Input validation should pass"
 
     # Tokenize
-    inputs = tokenizer(test_text, return_tensors="pt", padding=True, truncation=True)
+    inputs = tokenizer(test_text, return_tensors="np", padding=True, truncation=True)
 
     # Run inference
-    outputs = model(**inputs)
-    predictions = outputs.logits.softmax(dim=-1)
+    predictions = softmax(model(**inputs))
 
     # Check predictions shape and values
-    assert len(predictions.shape) == 2, "Predictions should be 2D tensor"
+    assert len(predictions.shape) == 2, "Predictions should be 2D array"
     assert predictions.shape[1] == 2, "Should have 2 classes (positive/negative)"
     assert 0 <= float(predictions[0][0]) <= 1, "Probabilities should be between 0 and 1"
     assert 0 <= float(predictions[0][1]) <= 1, "Probabilities should be between 0 and 1"
@@ -59,3 +63,150 @@ def test_quantization_settings(engine):
 
     assert mode in ["dynamic", "static"], "Invalid quantization mode"
     assert bits in [4, 8], "Invalid number of bits for quantization"
+
+
+@pytest.fixture
+def local_engine(tmp_path):
+    """Create a TursiEngine with an isolated model cache."""
+    engine = TursiEngine()
+    engine.MODEL_CACHE_DIR = tmp_path / "models"
+    engine.setup_model_cache()
+    engine.QUANTIZATION_MODE = "dynamic"
+    engine.QUANTIZATION_BITS = 8
+    return engine
+
+
+def test_dynamic_quantization_produces_int8_model(local_engine, tiny_model_dir):
+    """Test that dynamic mode writes an int8 model to the cache."""
+    model, tokenizer = local_engine.load_quantized_model(tiny_model_dir)
+
+    quantized = local_engine.quantized_model_dir(tiny_model_dir) / QUANTIZED_MODEL_FILE
+    assert quantized.exists()
+    op_types = {node.op_type for node in onnx.load(str(quantized)).graph.node}
+    assert "DynamicQuantizeLinear" in op_types
+    assert op_types & {"MatMulInteger", "DynamicQuantizeMatMul"}
+
+    inputs = tokenizer(["i love it"], return_tensors="np", padding=True)
+    assert model(**inputs).shape == (1, 2)
+
+
+def test_quantized_model_is_reused_from_cache(local_engine, tiny_model_dir):
+    """Test that later starts load the cached artifact without re-quantizing."""
+    local_engine.load_quantized_model(tiny_model_dir)
+
+    with patch("tursi.engine.quantize_dynamic_model") as mock_quantize:
+        model, _ = local_engine.load_quantized_model(tiny_model_dir)
+        mock_quantize.assert_not_called()
+    assert model is not None
+
+
+def test_quantization_variants_are_cached_separately(local_engine, tiny_model_dir):
+    """Test that each bit width gets its own cache entry."""
+    dir_8bit = local_engine.quantized_model_dir(tiny_model_dir)
+    local_engine.QUANTIZATION_BITS = 4
+    assert local_engine.quantized_model_dir(tiny_model_dir) != dir_8bit
+
+
+def test_export_is_cached_across_starts(local_engine, tiny_model_dir):
+    """Test that later starts load the saved ONNX export instead of re-exporting."""
+    local_engine.load_quantized_model(tiny_model_dir)
+    export_dir = local_engine.exported_model_dir(tiny_model_dir)
+    assert local_engine.artifact_cache().lookup(export_dir)["revision"] == "main"
+
+    # A different quantization variant reuses the export too
+    local_engine.QUANTIZATION_BITS = 4
+    with (
+        patch(
+            "optimum.exporters.onnx.main_export",
+            side_effect=AssertionError("re-export"),
+        ),
+        patch("tursi.engine.quantize_dynamic_model") as mock_quantize,
+    ):
+        mock_quantize.side_effect = lambda src, dst, bits: shutil.copy(src, dst)
+        model, tokenizer = local_engine.load_quantized_model(tiny_model_dir)
+    assert tokenizer is not None
+
+
+def test_export_cache_key_includes_revision_and_opset(local_engine, tiny_model_dir):
+    """Test that revision and opset select different cache entries."""
+    default_dir = local_engine.exported_model_dir(tiny_model_dir)
+    quantized_dir = local_engine.quantized_model_dir(tiny_model_dir)
+
+    local_engine.MODEL_REVISION = "v2"
+    assert local_engine.exported_model_dir(tiny_model_dir) != default_dir
+    assert local_engine.quantized_model_dir(tiny_model_dir) != quantized_dir
+
+    local_engine.MODEL_REVISION = "main"
+    local_engine.ONNX_OPSET = 17
+    assert local_engine.exported_model_dir(tiny_model_dir) != default_dir
+    assert local_engine.quantized_model_dir(tiny_model_dir) != quantized_dir
+
+
+@pytest.fixture
+def calibration_file(tmp_path):
+    """Write a small JSONL calibration dataset."""
+    path = tmp_path / "calibration.jsonl"
+    texts = ["i love this", "i hate it", "great", "terrible world", "hello"]
+    path.write_text("\n".join(f'{{"text": "{t}"}}' for t in texts) + "\n")
+    return path
+
+
+def test_iter_calibration_texts(tmp_path, calibration_file):
+    """Test reading calibration texts from JSONL and plain text files."""
+    assert list(iter_calibration_texts(calibration_file))[:2] == [
+        "i love this",
+        "i hate it",
+    ]
+    assert len(list(iter_calibration_texts(calibration_file, max_samples=3))) == 3
+
+    text_file = tmp_path / "calibration.txt"
+    text_file.write_text("first line\n\nsecond line\n")
+    assert list(iter_calibration_texts(text_file)) == ["first line", "second line"]
+
+    bad_file = tmp_path / "bad.jsonl"
+    bad_file.write_text('{"label": 1}\n')
+    with pytest.raises(ValueError, match="text"):
+        list(iter_calibration_texts(bad_file))
+
+
+def test_static_quantization_with_calibration(
+    local_engine, tiny_model_dir, calibration_file
+):
+    """Test that static mode calibrates and writes a QDQ int8 model."""
+    local_engine.QUANTIZATION_MODE = "static"
+    local_engine.CALIBRATION_DATA = str(calibration_file)
+    model, tokenizer = local_engine.load_quantized_model(tiny_model_dir)
+
+    quantized = local_engine.quantized_model_dir(tiny_model_dir) / QUANTIZED_MODEL_FILE
+    op_types = {node.op_type for node in onnx.load(str(quantized)).graph.node}
+    assert {"QuantizeLinear", "DequantizeLinear"} <= op_types
+    assert local_engine.calibration_table_path(tiny_model_dir).exists()
+
+    inputs = tokenizer(["i love it"], return_tensors="np", padding=True)
+    assert model(**inputs).shape == (1, 2)
+
+
+def test_static_quantization_reuses_calibration_table(
+    local_engine, tiny_model_dir, calibration_file
+):
+    """Test that rebuilding a static model skips recalibration."""
+    local_engine.QUANTIZATION_MODE = "static"
+    local_engine.CALIBRATION_DATA = str(calibration_file)
+    local_engine.load_quantized_model(tiny_model_dir)
+
+    # Drop the quantized model but keep the calibration table
+    shutil.rmtree(local_engine.quantized_model_dir(tiny_model_dir))
+    with patch(
+        "tursi.quantization.TextCalibrationReader.get_next",
+        side_effect=AssertionError("recalibrated"),
+    ):
+        model, _ = local_engine.load_quantized_model(tiny_model_dir)
+    assert model is not None
+
+
+def test_static_quantization_requires_calibration_data(local_engine, tiny_model_dir):
+    """Test that static mode without calibration data fails clearly."""
+    local_engine.QUANTIZATION_MODE = "static"
+    local_engine.CALIBRATION_DATA = None
+    with pytest.raises(ValueError, match="calibration dataset"):
+        local_engine.load_quantized_model(tiny_model_dir)
@@ -0,0 +1,169 @@
+"""Tests for the shared GCRA rate limiter."""
+
+import asyncio
+import json
+import multiprocessing as mp
+import pytest
+from tursi.engine import TursiEngine
+from tursi.ratelimit import GcraLimiter, parse_rate
+
+
+class Clock:
+    """Manually advanced clock."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_parse_rate():
+    """Test the rate limit formats accepted by flask_limiter."""
+    assert parse_rate("100/minute") == (100, 60.0)
+    assert parse_rate("100 per minute") == (100, 60.0)
+    assert parse_rate("10 per 5 seconds") == (10, 5.0)
+    assert parse_rate("1/Day") == (1, 86400.0)
+    for invalid in ("", "0/minute", "ten/minute", "5/fortnight"):
+        with pytest.raises(ValueError):
+            parse_rate(invalid)
+
+
+def test_burst_then_steady_rate():
+    """Test a client gets its burst, then one request per interval."""
+    clock = Clock()
+    limiter = GcraLimiter("6/minute", clock=clock)
+
+    results = [limiter.hit("a") for _ in range(7)]
+    assert [r.allowed for r in results] == [True] * 6 + [False]
+    assert [r.remaining for r in results[:6]] == [5, 4, 3, 2, 1, 0]
+    assert results[-1].retry_after == pytest.approx(10.0)
+
+    # Other clients have their own budget
+    assert limiter.hit("b").allowed
+
+    # Denied requests are not counted: one interval later one more fits
+    clock.now += 10.0
+    assert limiter.hit("a").allowed
+    assert not limiter.hit("a").allowed
+
+    # A full period restores the whole burst
+    clock.now += 60.0
+    assert limiter.hit("a").remaining == 5
+    limiter.close()
+
+
+def test_limits_share_a_file_independently(tmp_path):
+    """Test limiters on one file share clients only for the same limit."""
+    path = tmp_path / "limits.bin"
+    first = GcraLimiter("2/minute", path=path)
+    second = GcraLimiter("2/minute", path=path)
+    other = GcraLimiter("3/minute", path=path)
+
+    assert first.hit("client").allowed
+    assert second.hit("client").allowed
+    assert not first.hit("client").allowed
+    assert other.hit("client").allowed
+
+    (tmp_path / "bad.bin").write_bytes(b"not a state file")
+    with pytest.raises(ValueError):
+        GcraLimiter("2/minute", path=tmp_path / "bad.bin")
+
+
+def test_full_table_evicts_idle_clients():
+    """Test clients beyond the table size replace the idlest ones."""
+    clock = Clock()
+    limiter = GcraLimiter("1/minute", slots=8, clock=clock)
+    assert limiter.slots == 8
+
+    assert all(limiter.hit(f"client-{i}").allowed for i in range(8))
+    clock.now += 1
+    # A ninth client evicts the first one, which starts over
+    assert limiter.hit("client-8").allowed
+    assert limiter.hit("client-0").allowed
+
+    limiter.reset()
+    assert limiter.hit("client-8").allowed
+
+
+def hit_many(path, count, results):
+    limiter = GcraLimiter("10/minute", path=path)
+    results.put(sum(limiter.hit("client").allowed for _ in range(count)))
+
+
+def test_limit_shared_across_processes(tmp_path):
+    """Test processes using the same state file enforce one limit."""
+    path = tmp_path / "limits.bin"
+    results = mp.Queue()
+    processes = [mp.Process(target=hit_many, args=(path, 8, results)) for _ in range(3)]
+    for process in processes:
+        process.start()
+    allowed = [results.get(timeout=30) for _ in processes]
+    for process in processes:
+        process.join(timeout=30)
+
+    assert sum(allowed) == 10
+
+
+@pytest.fixture
+def engine():
+    """Create a TursiEngine using the GCRA limiter."""
+    engine = TursiEngine()
+    engine.WARMUP = False
+    engine.RATE_LIMIT_STRATEGY = "gcra"
+    return engine
+
+
+def test_flask_gcra_limit(engine, mock_loaded_model):
+    """Test Flask clients over the limit get 429 with Retry-After."""
+    client = engine.create_app(engine.ALLOWED_MODELS[0], "3/minute").test_client()
+    statuses = [
+        client.post("/predict", json={"text": "hi"}).status_code for _ in range(3)
+    ]
+    assert statuses == [200] * 3
+
+    response = client.post("/predict", json={"text": "hi"})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "20"
+    assert response.get_json()["error"] == "Rate limit exceeded: 3/minute"
+
+    # Metrics scrapes are exempt
+    assert client.get("/metrics").status_code == 200
+
+    engine.RATE_LIMIT_STRATEGY = "sliding"
+    with pytest.raises(ValueError):
+        engine.create_app(engine.ALLOWED_MODELS[0])
+
+
+def test_asgi_gcra_limit(engine, mock_loaded_model):
+    """Test the ASGI app enforces the same limit and header."""
+    app = engine.create_asgi_app(engine.ALLOWED_MODELS[0], rate_limit="1/minute")
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/predict",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 12345),
+    }
+
+    def post():
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b'{"text": "hi"}'}
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(app(scope, receive, send))
+        return sent[0]["status"], dict(sent[0]["headers"]), json.loads(sent[1]["body"])
+
+    try:
+        assert post()[0] == 200
+        status, headers, body = post()
+    finally:
+        app.executor.shutdown()
+
+    assert status == 429
+    assert headers[b"retry-after"] == b"60"
+    assert body["retry_after"] == pytest.approx(60, abs=1)
@@ -0,0 +1,208 @@
+"""Tests for multi-model serving."""
+
+import threading
+import time
+import pytest
+from tursi.engine import TursiEngine
+from tursi.registry import ModelRegistry, parse_models
+
+
+class Loader:
+    """Model factory recording loads and unloads."""
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.loads = []
+        self.unloaded = []
+
+    def load(self, name):
+        self.loads.append(name)
+        time.sleep(self.delay)
+        if name == "broken":
+            raise RuntimeError("cannot load")
+        return f"model:{name}"
+
+    def unload(self, model):
+        self.unloaded.append(model)
+
+
+def test_loads_lazily_once():
+    """Test a model is loaded on first use, once for concurrent requests."""
+    loader = Loader(delay=0.05)
+    registry = ModelRegistry(loader.load)
+    assert registry.peek("a") is None
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(registry.get("a")))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["model:a"] * 4
+    assert loader.loads == ["a"]
+    stats = registry.stats()["models"]["a"]
+    assert stats["loads"] == 1
+    assert stats["requests"] == 4
+    assert stats["loaded"] is True
+    assert stats["last_load_ms"] >= 50
+
+
+def test_evicts_least_recently_used_over_budget():
+    """Test models are evicted in LRU order to fit the memory budget."""
+    loader = Loader()
+    sizes = {"model:a": 40, "model:b": 40, "model:c": 40, "model:big": 500}
+    registry = ModelRegistry(
+        loader.load, memory_budget_bytes=100, size_of=sizes.get, unload=loader.unload
+    )
+
+    registry.get("a")
+    registry.get("b")
+    registry.get("a")  # b is now the least recently used
+    registry.get("c")
+    assert registry.loaded() == ["a", "c"]
+    assert loader.unloaded == ["model:b"]
+    assert registry.memory_bytes() == 80
+
+    # A model larger than the budget is still served, alone
+    registry.get("big")
+    assert registry.loaded() == ["big"]
+
+    stats = registry.stats()
+    assert stats["loads"] == 4
+    assert stats["evictions"] == 3
+    assert stats["models"]["b"]["evictions"] == 1
+    assert stats["models"]["b"]["loaded"] is False
+
+
+def test_max_models_and_failures():
+    """Test the model count limit and failed loads."""
+    loader = Loader()
+    registry = ModelRegistry(loader.load, max_models=2, unload=loader.unload)
+    for name in ("a", "b", "c"):
+        registry.get(name)
+    assert registry.loaded() == ["b", "c"]
+
+    with pytest.raises(RuntimeError):
+        registry.get("broken")
+    assert registry.stats()["models"]["broken"]["load_failures"] == 1
+    assert registry.loaded() == ["b", "c"]
+
+    assert registry.evict("b") is True
+    assert registry.evict("b") is False
+    assert loader.unloaded == ["model:a", "model:b"]
+
+    with pytest.raises(ValueError):
+        ModelRegistry(loader.load, max_models=-1)
+
+
+@pytest.fixture
+def engine():
+    """Create a TursiEngine allowing three models."""
+    engine = TursiEngine()
+    engine.WARMUP = False
+    engine.BATCH_MAX_SIZE = 4
+    engine.BATCH_MAX_WAIT_MS = 1
+    engine.ALLOWED_MODELS = ["org/first", "second", "third"]
+    engine.MAX_LOADED_MODELS = 2
+    return engine
+
+
+def test_multi_model_app(engine, mock_loaded_model):
+    """Test models are served under /models/<name>/predict and evicted."""
+    app = engine.create_multi_model_app("org/first")
+    client = app.test_client()
+    assert app.registry.loaded() == ["org/first"]
+    assert client.get("/models/second/health").get_json()["status"] == "unloaded"
+
+    for name in ("org/first", "second", "third"):
+        response = client.post(f"/models/{name}/predict", json={"text": "great"})
+        assert response.status_code == 200
+        assert response.get_json()["label"] == "POSITIVE"
+
+    response = client.post("/models/unknown/predict", json={"text": "great"})
+    assert response.status_code == 404
+
+    models = client.get("/models").get_json()
+    assert models["available"] == engine.ALLOWED_MODELS
+    assert models["loaded"] == ["second", "third"]
+    assert models["models"]["org/first"]["evictions"] == 1
+    assert models["models"]["org/first"]["requests"] == 2
+    assert client.get("/models/third/health").get_json()["state"] == "ready"
+    assert client.get("/health").get_json()["models"]["loads"] == 3
+
+
+def test_multi_model_requires_flask(engine):
+    """Test the ASGI server cannot serve several models."""
+    engine.SERVER_MODE = "asgi"
+    with pytest.raises(ValueError):
+        engine.create_multi_model_app()
+
+
+def test_multi_model_metrics(engine, mock_loaded_model):
+    """Test /metrics exposes each loaded model's metrics with a model label."""
+    app = engine.create_multi_model_app()
+    client = app.test_client()
+    for name in ("org/first", "second", "second"):
+        client.post(f"/models/{name}/predict", json={"texts": ["great", "bad"]})
+
+    text = client.get("/metrics").get_data(as_text=True)
+    assert text.count("# TYPE tursi_tokens_total counter") == 1
+    assert 'tursi_tokens_total{model="org/first"}' in text
+    assert 'tursi_batch_size_count{model="second"} 2' in text
+    assert 'tursi_requests_total{endpoint="/models/<path:name>/predict"' in text
+
+    app.registry.evict("org/first")
+    text = client.get("/metrics").get_data(as_text=True)
+    assert 'model="org/first"' not in text
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("org/first, second,,org/first", ["org/first", "second"]),
+        (["a", "b"], ["a", "b"]),
+    ],
+)
+def test_parse_models(value, expected):
+    """Test parsing the model allow-list from env, CLI and config values."""
+    assert parse_models(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", " , ", [], [1], 5])
+def test_parse_models_rejects_invalid(value):
+    """Test that an empty or malformed allow-list is rejected."""
+    with pytest.raises(ValueError):
+        parse_models(value)
+
+
+def test_allowed_models_from_env(monkeypatch, mock_loaded_model):
+    """Test models allowed through ALLOWED_MODELS are served side by side."""
+    monkeypatch.setenv("ALLOWED_MODELS", "org/first,second")
+    monkeypatch.setenv("MAX_LOADED_MODELS", "0")
+    engine = TursiEngine()
+    engine.WARMUP = False
+    assert engine.ALLOWED_MODELS == ["org/first", "second"]
+
+    client = engine.create_multi_model_app().test_client()
+    for name in ("org/first", "second"):
+        response = client.post(f"/models/{name}/predict", json={"text": "great"})
+        assert response.status_code == 200
+    assert client.get("/models").get_json()["loaded"] == ["org/first", "second"]
+    response = client.post("/models/third/predict", json={"text": "great"})
+    assert response.status_code == 404
+
+
+def test_evicted_service_rejects_requests(engine, mock_loaded_model):
+    """Test a request holding an evicted model gets a 503, not a new batcher."""
+    app = engine.create_multi_model_app("second")
+    service = app.registry.get("second")
+    app.registry.evict("second")
+
+    body, status = service.predict({"text": "great"})
+    assert status == 503
+    assert body["retry_after"] == 1
+    assert service.batcher._thread is None
@@ -0,0 +1,291 @@
+"""Tests for ONNX Runtime session configuration."""
+
+from pathlib import Path
+import numpy as np
+import pytest
+from tursi.engine import TursiEngine
+from tursi.runtime import (
+    OnnxClassifier,
+    SessionSettings,
+    autotune_session_settings,
+    candidate_settings,
+    cpu_features,
+    parse_bool,
+    sigmoid,
+    softmax,
+)
+
+
+@pytest.fixture(scope="module")
+def onnx_model_path(tiny_model_dir, tmp_path_factory):
+    """Export the tiny test model to ONNX."""
+    engine = TursiEngine()
+    engine.MODEL_CACHE_DIR = tmp_path_factory.mktemp("models")
+    return engine.export_model(tiny_model_dir) / "model.onnx"
+
+
+def test_session_options():
+    """Test that settings map onto ONNX Runtime session options."""
+    settings = SessionSettings(
+        intra_op_threads=4,
+        inter_op_threads=2,
+        execution_mode="parallel",
+        allow_spinning=False,
+    )
+    options = settings.session_options()
+    assert options.intra_op_num_threads == 4
+    assert options.inter_op_num_threads == 2
+    assert options.get_session_config_entry("session.intra_op.allow_spinning") == "0"
+    assert settings.to_dict()["execution_mode"] == "parallel"
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"intra_op_threads": -1},
+        {"inter_op_threads": -2},
+        {"execution_mode": "fastest"},
+    ],
+)
+def test_invalid_settings(kwargs):
+    """Test validation of session settings."""
+    with pytest.raises(ValueError):
+        SessionSettings(**kwargs).validate()
+
+
+def test_candidate_settings():
+    """Test that candidates never exceed the available cores."""
+    single = candidate_settings(SessionSettings(), cpu_count=1)
+    assert [c.intra_op_threads for c in single] == [1]
+
+    many = candidate_settings(SessionSettings(allow_spinning=False), cpu_count=32)
+    assert {c.intra_op_threads for c in many} >= {1, 2, 4, 16, 32}
+    assert any(c.execution_mode == "parallel" for c in many)
+    assert not any(c.allow_spinning for c in many)
+
+
+def test_autotune_picks_fastest(onnx_model_path):
+    """Test that auto-tuning benchmarks each candidate and returns the best."""
+    candidates = [
+        SessionSettings(intra_op_threads=1),
+        SessionSettings(intra_op_threads=2),
+    ]
+    best, results = autotune_session_settings(
+        onnx_model_path, [(1, 8), (4, 8)], candidates=candidates, repeats=2
+    )
+    assert best in candidates
+    assert len(results) == 2
+    fastest = min(results, key=lambda r: r["median_ms"])
+    assert fastest["settings"] == best.to_dict()
+
+
+def test_engine_session_settings(onnx_model_path):
+    """Test that engine threading settings resolve from configuration."""
+    engine = TursiEngine()
+    engine.ORT_INTRA_OP_THREADS = "4"
+    engine.ORT_ALLOW_SPINNING = "false"
+    settings = engine.resolve_session_settings(onnx_model_path)
+    assert settings == SessionSettings(intra_op_threads=4, allow_spinning=False)
+
+    engine.ORT_INTRA_OP_THREADS = "auto"
+    settings = engine.resolve_session_settings(onnx_model_path)
+    assert settings.intra_op_threads >= 1
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [("1", True), ("true", True), ("on", True), ("0", False), ("no", False)],
+)
+def test_parse_bool(value, expected):
+    """Test boolean parsing of environment values."""
+    assert parse_bool(value) is expected
+
+
+def test_softmax():
+    """Test that softmax is stable and normalizes the last axis."""
+    probs = softmax(np.array([[0.0, 0.0], [1000.0, 0.0]], dtype=np.float32))
+    np.testing.assert_allclose(probs, [[0.5, 0.5], [1.0, 0.0]])
+
+
+def test_sigmoid():
+    """Test that sigmoid is stable for large logits of either sign."""
+    probs = sigmoid(np.array([[0.0, 1000.0, -1000.0]], dtype=np.float32))
+    np.testing.assert_allclose(probs, [[0.5, 1.0, 0.0]])
+
+
+def test_onnx_classifier(onnx_model_path):
+    """Test that the classifier returns logits and ignores unknown inputs."""
+    model = OnnxClassifier(onnx_model_path, SessionSettings().session_options())
+    ids = np.array([[2, 5, 6, 9, 3], [2, 14, 3, 0, 0]], dtype=np.int64)
+    mask = (ids != 0).astype(np.int64)
+
+    logits = model(input_ids=ids, attention_mask=mask, token_type_ids=mask * 0)
+    assert isinstance(logits, np.ndarray)
+    assert logits.shape == (2, 2)
+
+
+def test_onnx_classifier_io_binding(onnx_model_path):
+    """Test bound buffers give the same logits and are reused per shape."""
+    options = SessionSettings().session_options()
+    bound = OnnxClassifier(onnx_model_path, options)
+    plain = OnnxClassifier(onnx_model_path, options, io_binding=False)
+    assert bound.io_binding is True
+    rng = np.random.default_rng(0)
+
+    for batch_size, length in [(1, 8), (4, 16), (1, 8)]:
+        ids = rng.integers(4, 16, size=(batch_size, length), dtype=np.int64)
+        mask = np.ones_like(ids)
+        expected = plain(input_ids=ids, attention_mask=mask)
+        logits = bound(input_ids=ids, attention_mask=mask, token_type_ids=mask * 0)
+        np.testing.assert_allclose(logits, expected, rtol=1e-5, atol=1e-5)
+
+    # Results are copies, so the next pass does not overwrite them
+    first = bound(input_ids=ids, attention_mask=mask)
+    bound(input_ids=ids * 0 + 5, attention_mask=mask)
+    np.testing.assert_allclose(first, expected, rtol=1e-5, atol=1e-5)
+
+    with bound.buffers(1, 8) as buffers:
+        reused = buffers
+    with bound.buffers(1, 8) as buffers:
+        assert buffers is reused
+        # Checked-out buffers are never handed to a concurrent caller
+        with bound.buffers(1, 8) as other:
+            assert other is not buffers
+
+
+def test_io_binding_reuses_buffers_after_warmup(
+    onnx_model_path, tiny_model_dir, monkeypatch
+):
+    """Test mixed-length traffic after warmup allocates no buffers or bindings."""
+    from tursi import runtime
+    from tursi.tokenization import NumpyTokenizer
+
+    engine = TursiEngine()
+    engine.PREDICT_CHUNK_SIZE = 4
+    engine.WARMUP_BATCH_SIZES = "1,2,3,4"
+    tokenizer = NumpyTokenizer.from_pretrained(tiny_model_dir)
+    model = OnnxClassifier(onnx_model_path, SessionSettings().session_options())
+    plain = OnnxClassifier(onnx_model_path, io_binding=False)
+    engine.warmup(model, tokenizer)
+
+    allocated = []
+    create_buffers = runtime.IOBuffers
+
+    def record(session, shape, *args):
+        allocated.append(shape)
+        return create_buffers(session, shape, *args)
+
+    monkeypatch.setattr(runtime, "IOBuffers", record)
+    rng = np.random.default_rng(0)
+    for _ in range(5):
+        texts = ["hello " * n for n in rng.integers(1, 200, size=11)]
+        results = engine.predict_batch(model, tokenizer, texts)
+        # Padding up to the bucket boundary leaves the predictions unchanged
+        for result, expected in zip(
+            results, engine.predict_batch(plain, tokenizer, texts)
+        ):
+            assert result["label"] == expected["label"]
+            assert result["score"] == pytest.approx(expected["score"], abs=1e-4)
+
+    assert allocated == []
+    # Every batch ran on a pooled (batch size, bucket) shape
+    assert {length for _, length in model._buffers} == {32, 64, 128}
+
+
+def test_warmup_covers_serving_shapes(onnx_model_path, tiny_model_dir, monkeypatch):
+    """Test requests of any length after warmup run on a warmed shape."""
+    from tursi import runtime
+    from tursi.tokenization import NumpyTokenizer
+
+    engine = TursiEngine()
+    engine.BATCH_MAX_SIZE = 3
+    engine.PREDICT_CHUNK_SIZE = 8
+    tokenizer = NumpyTokenizer.from_pretrained(tiny_model_dir)
+    model = OnnxClassifier(onnx_model_path, SessionSettings().session_options())
+    engine.warmup(model, tokenizer)
+    warmed = set(engine.warmup_shapes(tokenizer))
+    assert set(model._buffers) == warmed
+
+    allocated = []
+    create_buffers = runtime.IOBuffers
+
+    def record(session, shape, *args):
+        allocated.append(shape)
+        return create_buffers(session, shape, *args)
+
+    monkeypatch.setattr(runtime, "IOBuffers", record)
+    rng = np.random.default_rng(1)
+    # Single texts and micro-batches of up to BATCH_MAX_SIZE texts
+    for rows in (1, 1, 2, 3, 1, 3):
+        lengths = rng.integers(1, 300, size=rows)
+        engine.predict_batch(model, tokenizer, ["hello " * n for n in lengths])
+
+    assert allocated == []
+    assert set(model._buffers) == warmed
+
+
+def test_optimized_graph_cache(onnx_model_path, tmp_path, monkeypatch):
+    """Test the optimized graph is saved once, then loaded unoptimized."""
+    import shutil
+    import onnxruntime as ort
+    from tursi import runtime
+
+    model_path = tmp_path / "model.onnx"
+    shutil.copy(onnx_model_path, model_path)
+    cached = tmp_path / "model.optimized-test.onnx"
+    loaded = []
+    create_session = ort.InferenceSession
+
+    def record(path, sess_options=None, **kwargs):
+        level = getattr(sess_options, "graph_optimization_level", None)
+        loaded.append((Path(path).name, level))
+        return create_session(path, sess_options=sess_options, **kwargs)
+
+    monkeypatch.setattr(runtime.ort, "InferenceSession", record)
+    ids = np.array([[2, 5, 6, 9, 3]], dtype=np.int64)
+    mask = np.ones_like(ids)
+    expected = OnnxClassifier(model_path)(input_ids=ids, attention_mask=mask)
+
+    options = SessionSettings().session_options()
+    first = OnnxClassifier(model_path, options, optimized_model_path=cached)
+    assert cached.exists()
+    assert options.optimized_model_filepath == ""
+    assert not list(tmp_path.glob(".*.tmp"))
+
+    second = OnnxClassifier(
+        model_path, SessionSettings().session_options(), optimized_model_path=cached
+    )
+    disabled = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+    assert loaded[-1] == (cached.name, disabled)
+    for model in (first, second):
+        logits = model(input_ids=ids, attention_mask=mask)
+        np.testing.assert_allclose(logits, expected, rtol=1e-5, atol=1e-5)
+    assert second.io_binding is True
+
+    # An unreadable cached graph is rebuilt from the model
+    cached.write_bytes(b"not a graph")
+    OnnxClassifier(model_path, options, optimized_model_path=cached)
+    assert loaded[-1][0] == "model.onnx"
+    assert cached.stat().st_size > len(b"not a graph")
+    assert options.graph_optimization_level != disabled
+
+
+def test_optimized_model_path_key(monkeypatch):
+    """Test cached graphs are keyed by ONNX Runtime version and CPU."""
+    from tursi import runtime
+
+    engine = TursiEngine()
+    model_path = Path("/models/model_quantized.onnx")
+    path = engine.optimized_model_path(model_path)
+    assert path.parent == model_path.parent
+    assert path.name.startswith("model_quantized.optimized-")
+
+    monkeypatch.setattr(runtime.ort, "__version__", "0.0.1")
+    assert engine.optimized_model_path(model_path) != path
+    monkeypatch.undo()
+    monkeypatch.setattr(runtime, "cpu_features", lambda: ["sse2"])
+    assert engine.optimized_model_path(model_path) != path
+
+    engine.ORT_OPTIMIZED_MODEL_CACHE = False
+    assert engine.optimized_model_path(model_path) is None
+    assert all(isinstance(flag, str) for flag in cpu_features())
@@ -0,0 +1,279 @@
+"""Tests for pre-fork multi-worker serving."""
+
+import os
+import signal
+import socket
+import stat
+import subprocess
+import sys
+import threading
+import time
+import pytest
+import requests
+from tursi.bench import run_bench
+from tursi.engine import TursiEngine
+from tursi.runtime import OnnxClassifier, SessionSettings, is_fork_safe
+from tursi.serving import PreforkServer, bind_unix_socket, parse_socket_mode, serve
+from tursi.test import predict, unix_session
+
+SERVER_SCRIPT = """
+import logging, os, sys
+from flask import Flask, jsonify
+from tursi.serving import PreforkServer
+
+logging.basicConfig(level=logging.INFO)
+app = Flask(__name__)
+
+@app.route("/pid")
+def pid():
+    return jsonify({"pid": os.getpid(), "parent": os.getppid()})
+
+server = PreforkServer(
+    app, "127.0.0.1", 0, workers=2, heartbeat_interval=0.1, restart_delay=0.1
+)
+server.bind()
+print(server.port, flush=True)
+server.serve_forever()
+"""
+
+
+def get_pid(port, timeout=10.0):
+    """Request a worker pid, retrying until the server answers."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return requests.get(f"http://127.0.0.1:{port}/pid", timeout=2).json()
+        except requests.ConnectionError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+@pytest.fixture
+def prefork_server():
+    """Run a two-worker server in a subprocess."""
+    process = subprocess.Popen(
+        [sys.executable, "-c", SERVER_SCRIPT], stdout=subprocess.PIPE, text=True
+    )
+    port = int(process.stdout.readline())
+    yield process, port
+    if process.poll() is None:
+        process.kill()
+        process.wait()
+
+
+def test_workers_share_socket_and_restart(prefork_server):
+    """Test that workers are forked from the server and replaced on crash."""
+    process, port = prefork_server
+    first = get_pid(port)
+    assert first["parent"] == process.pid
+    assert first["pid"] != process.pid
+
+    os.kill(first["pid"], signal.SIGKILL)
+    deadline = time.monotonic() + 10
+    pids = set()
+    while len(pids - {first["pid"]}) < 2 and time.monotonic() < deadline:
+        response = get_pid(port)
+        assert response["parent"] == process.pid
+        pids.add(response["pid"])
+
+    assert first["pid"] not in pids
+
+
+def test_graceful_shutdown(prefork_server):
+    """Test that SIGTERM stops the supervisor and its workers."""
+    process, port = prefork_server
+    worker = get_pid(port)["pid"]
+
+    process.send_signal(signal.SIGTERM)
+    assert process.wait(timeout=15) == 0
+    with pytest.raises(ProcessLookupError):
+        os.kill(worker, 0)
+
+
+HUNG_WORKER_SCRIPT = """
+import os, sys, time
+from tursi.serving import PreforkServer
+
+def serve_worker(sock, heartbeat):
+    print(os.getpid(), flush=True)
+    time.sleep(60)  # a stuck loop: alive, but no heartbeats
+
+PreforkServer(
+    None, "127.0.0.1", 0, workers=1, heartbeat_interval=0.1,
+    heartbeat_timeout=0.5, restart_delay=0.1, serve_worker=serve_worker,
+).serve_forever()
+"""
+
+
+def test_stuck_worker_is_replaced():
+    """Test that a worker whose serve loop stops sending heartbeats is replaced."""
+    process = subprocess.Popen(
+        [sys.executable, "-c", HUNG_WORKER_SCRIPT], stdout=subprocess.PIPE, text=True
+    )
+    try:
+        first = int(process.stdout.readline())
+        second = int(process.stdout.readline())
+        assert second != first
+        with pytest.raises(ProcessLookupError):
+            os.kill(first, 0)
+    finally:
+        process.terminate()
+        process.wait(timeout=15)
+
+
+def test_invalid_worker_count():
+    """Test that at least one worker is required."""
+    with pytest.raises(ValueError):
+        PreforkServer(None, "127.0.0.1", 0, workers=0)
+
+
+def test_serve_handles_requests_concurrently():
+    """Test the stoppable in-process server serves requests in parallel."""
+    from flask import Flask
+
+    app = Flask(__name__)
+    barrier = threading.Barrier(2, timeout=5)
+
+    @app.route("/wait")
+    def wait():
+        barrier.wait()  # only returns once both requests are being handled
+        return "ok"
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    stopped = threading.Event()
+    thread = threading.Thread(
+        target=serve,
+        args=(app, "127.0.0.1", port),
+        kwargs={"should_stop": stopped.is_set},
+    )
+    thread.start()
+    try:
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port)).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+
+        results = []
+
+        def get():
+            url = f"http://127.0.0.1:{port}/wait"
+            results.append(requests.get(url, timeout=10).status_code)
+
+        clients = [threading.Thread(target=get) for _ in range(2)]
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+        assert results == [200, 200]
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def test_bind_unix_socket(tmp_path):
+    """Test socket permissions and replacing only stale sockets."""
+    path = str(tmp_path / "run" / "model.sock")
+    sock = bind_unix_socket(path, 0o600)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    with pytest.raises(ValueError, match="in use"):
+        bind_unix_socket(path)
+    sock.close()
+    bind_unix_socket(path).close()  # the server is gone, so its socket is stale
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o660
+
+    other = tmp_path / "model.txt"
+    other.write_text("not a socket")
+    with pytest.raises(ValueError, match="not a socket"):
+        bind_unix_socket(str(other))
+
+    assert parse_socket_mode("660") == parse_socket_mode("0o660") == 0o660
+    for mode in ["rw", "1777", -1]:
+        with pytest.raises(ValueError):
+            parse_socket_mode(mode)
+
+
+def test_serve_on_unix_socket(tmp_path, mock_loaded_model):
+    """Test /predict over a Unix domain socket with the client and bench."""
+    engine = TursiEngine()
+    engine.WARMUP = False
+    app = engine.create_app(engine.ALLOWED_MODELS[0], rate_limit="100/minute")
+    path = str(tmp_path / "model.sock")
+    stopped = threading.Event()
+    thread = threading.Thread(
+        target=serve,
+        args=(app, "127.0.0.1", 0),
+        kwargs={"should_stop": stopped.is_set, "uds": path},
+    )
+    thread.start()
+    try:
+        deadline = time.monotonic() + 10
+        while not os.path.exists(path) and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        session = unix_session(path)
+        result = predict("http://localhost/predict", "hi", session=session)
+        assert result["label"] == "POSITIVE"
+        assert session.get("http://localhost/health").status_code == 200
+
+        report = run_bench(
+            "http://localhost/predict", concurrency=2, duration=0, requests=4, uds=path
+        )
+        assert report["requests"] == 4
+        assert report["errors"] == 0
+    finally:
+        stopped.set()
+        thread.join()
+    assert not os.path.exists(path)
+    with pytest.raises(requests.ConnectionError):
+        unix_session(path).get("http://localhost/health")
+
+
+def test_fork_safety_of_session_settings():
+    """Test which sessions can be shared with forked workers."""
+    assert is_fork_safe(SessionSettings().session_options())
+    assert not is_fork_safe(SessionSettings(intra_op_threads=4).session_options())
+    assert not is_fork_safe(
+        SessionSettings(execution_mode="parallel").session_options()
+    )
+    assert not is_fork_safe(None)
+
+
+def test_classifier_rebuilds_thread_pool_after_fork(tiny_model_dir, tmp_path):
+    """Test that a thread-pooled session is rebuilt in a forked child."""
+    from tursi.engine import TursiEngine
+    import numpy as np
+
+    engine = TursiEngine()
+    engine.MODEL_CACHE_DIR = tmp_path / "models"
+    model_path = engine.export_model(tiny_model_dir) / "model.onnx"
+    inputs = {"input_ids": np.array([[2, 5, 6, 3]]), "attention_mask": np.ones((1, 4))}
+
+    shared = OnnxClassifier(model_path, SessionSettings().session_options())
+    pooled = OnnxClassifier(
+        model_path, SessionSettings(intra_op_threads=2).session_options()
+    )
+    expected = pooled(**inputs)
+
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            shared_session, pooled_session = shared.session, pooled.session
+            np.testing.assert_allclose(pooled(**inputs), expected, rtol=1e-5)
+            shared(**inputs)
+            kept = shared.session is shared_session
+            rebuilt = pooled.session is not pooled_session
+            code = 0 if kept and rebuilt else 1
+        finally:
+            os._exit(code)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
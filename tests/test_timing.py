@@ -0,0 +1,153 @@
+"""Tests for per-stage request timing."""
+
+import asyncio
+import json
+import logging
+import pytest
+from tursi.engine import TursiEngine
+from tursi.timing import RequestTimer, start_timer
+
+
+def stage_names(header: str) -> list:
+    """List the stage names of a Server-Timing header value."""
+    return [entry.split(";")[0] for entry in header.split(", ")]
+
+
+def test_request_timer_header():
+    """Test stages are accumulated and formatted in milliseconds."""
+    timer = RequestTimer()
+    timer.add("tokenize", 0.001)
+    timer.add("inference", 0.0025)
+    timer.add("tokenize", 0.001)
+
+    header = timer.header_value()
+    assert header.startswith("tokenize;dur=2.000, inference;dur=2.500, total;dur=")
+    assert stage_names(header) == ["tokenize", "inference", "total"]
+
+
+def test_start_timer_sampling(monkeypatch):
+    """Test requests are only timed when reported or sampled."""
+    assert start_timer(header=False, log_sample_rate=0) is None
+    assert start_timer(header=True, log_sample_rate=0).log is False
+
+    monkeypatch.setattr("tursi.timing.random.random", lambda: 0.3)
+    assert start_timer(header=False, log_sample_rate=0.2) is None
+    sampled = start_timer(header=False, log_sample_rate=0.5)
+    assert sampled.log is True
+    assert sampled.finish() is None
+
+
+def test_sampled_log_line(caplog):
+    """Test sampled requests are logged as one structured line."""
+    timer = RequestTimer(header=False, log=True)
+    timer.add("inference", 0.004)
+    with caplog.at_level(logging.INFO, logger="tursi.timing"):
+        timer.finish(endpoint="/predict", status=200)
+
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record["event"] == "request_timing"
+    assert record["endpoint"] == "/predict"
+    assert record["status"] == 200
+    assert record["stages_ms"] == {"inference": 4.0}
+    assert record["total_ms"] >= 0
+
+
+@pytest.fixture
+def engine():
+    """Create a TursiEngine instance for testing."""
+    engine = TursiEngine()
+    engine.WARMUP = False
+    engine.SERVER_TIMING = True
+    return engine
+
+
+def test_flask_server_timing_header(engine, mock_loaded_model):
+    """Test /predict responses report every stage of the request."""
+    client = engine.create_app(engine.ALLOWED_MODELS[0]).test_client()
+    response = client.post("/predict", json={"text": "I love this!"})
+
+    assert response.status_code == 200
+    assert stage_names(response.headers["Server-Timing"]) == [
+        "parse",
+        "tokenize",
+        "inference",
+        "postprocess",
+        "serialize",
+        "total",
+    ]
+
+    # Errors are timed too
+    response = client.post("/predict", json={"text": 42})
+    assert response.status_code == 400
+    assert "total;dur=" in response.headers["Server-Timing"]
+
+
+def test_server_timing_with_batching_and_cache(engine, mock_loaded_model):
+    """Test batched requests report their queue time and cache lookups."""
+    engine.BATCH_MAX_SIZE = 4
+    engine.BATCH_MAX_WAIT_MS = 1
+    engine.PREDICTION_CACHE_SIZE = 8
+    client = engine.create_app(engine.ALLOWED_MODELS[0]).test_client()
+
+    first = client.post("/predict", json={"text": "I love this!"})
+    assert stage_names(first.headers["Server-Timing"]) == [
+        "parse",
+        "cache",
+        "tokenize",
+        "inference",
+        "postprocess",
+        "queue",
+        "serialize",
+        "total",
+    ]
+    second = client.post("/predict", json={"text": "I love this!"})
+    assert stage_names(second.headers["Server-Timing"]) == [
+        "parse",
+        "cache",
+        "serialize",
+        "total",
+    ]
+
+
+def test_server_timing_disabled(engine, mock_loaded_model):
+    """Test no header is added when timing is disabled."""
+    engine.SERVER_TIMING = False
+    client = engine.create_app(engine.ALLOWED_MODELS[0]).test_client()
+    response = client.post("/predict", json={"text": "I love this!"})
+
+    assert response.status_code == 200
+    assert "Server-Timing" not in response.headers
+
+
+def test_asgi_server_timing_header(engine, mock_loaded_model):
+    """Test the ASGI app sends the same header."""
+    app = engine.create_asgi_app(engine.ALLOWED_MODELS[0])
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/predict",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 12345),
+    }
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b'{"text": "hi"}'}
+
+    async def send(message):
+        sent.append(message)
+
+    try:
+        asyncio.run(app(scope, receive, send))
+    finally:
+        app.executor.shutdown()
+
+    headers = dict(sent[0]["headers"])
+    assert stage_names(headers[b"server-timing"].decode()) == [
+        "parse",
+        "tokenize",
+        "inference",
+        "postprocess",
+        "serialize",
+        "total",
+    ]
@@ -0,0 +1,52 @@
+"""Tests for the torch-free tokenizer."""
+
+import numpy as np
+import pytest
+from tursi.tokenization import NumpyTokenizer, load_tokenizer
+
+
+@pytest.fixture(scope="module")
+def tokenizer(tiny_model_dir):
+    """Load the tiny test model's tokenizer."""
+    return NumpyTokenizer.from_pretrained(tiny_model_dir)
+
+
+def test_matches_transformers_tokenizer(tokenizer, tiny_model_dir):
+    """Test that NumPy inputs match the transformers fast tokenizer."""
+    from transformers import AutoTokenizer
+
+    reference = AutoTokenizer.from_pretrained(tiny_model_dir)
+    texts = ["i love it", "hello world this is great", "bad"]
+
+    expected = reference(texts, return_tensors="np", padding=True, truncation=True)
+    actual = tokenizer(texts, return_tensors="np", padding=True, truncation=True)
+
+    for name in ("input_ids", "attention_mask", "token_type_ids"):
+        assert actual[name].dtype == np.int64
+        np.testing.assert_array_equal(actual[name], expected[name])
+
+
+def test_single_text(tokenizer):
+    """Test that a single text is tokenized as a batch of one."""
+    inputs = tokenizer("i love it")
+    assert inputs["input_ids"].shape == (1, 5)  # [CLS] i love it [SEP]
+
+
+def test_truncates_to_model_limit(tokenizer):
+    """Test that long texts are cut to the model's maximum length."""
+    assert tokenizer.max_length == 128
+    inputs = tokenizer(["hello " * 500, "hello"])
+    assert inputs["input_ids"].shape == (2, 128)
+    assert inputs["input_ids"][0, -1] == 3  # still ends with [SEP]
+    assert inputs["attention_mask"][1].sum() == 3
+
+
+def test_rejects_other_tensor_types(tokenizer):
+    """Test that only NumPy arrays are produced."""
+    with pytest.raises(ValueError):
+        tokenizer("i love it", return_tensors="pt")
+
+
+def test_load_tokenizer_prefers_numpy_tokenizer(tiny_model_dir):
+    """Test that a saved fast tokenizer is loaded without transformers."""
+    assert isinstance(load_tokenizer(tiny_model_dir), NumpyTokenizer)
@@ -4,6 +4,14 @@ Tursi - Deploy AI models with unmatched simplicity
 
 __version__ = "0.3.0-alpha.1"
 
-from .engine import TursiEngine
-
 __all__ = ["TursiEngine"]
+
+
+def __getattr__(name):
+    # Import the engine on first use, so lightweight commands such as
+    # `tursi --version` do not load ONNX Runtime and Flask
+    if name == "TursiEngine":
+        from .engine import TursiEngine
+
+        return TursiEngine
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,161 @@
+"""Admission control: a bounded queue in front of inference."""
+
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Optional
+
+# Weight of the latest inference time in the moving average
+SERVICE_TIME_WEIGHT = 0.2
+
+# Shortest Retry-After sent to shed clients, in seconds
+MIN_RETRY_AFTER = 1.0
+
+
+class Overloaded(Exception):
+    """Raised when a request is rejected instead of queued."""
+
+    def __init__(self, reason: str, retry_after: float):
+        """Initialize the error.
+
+        Args:
+            reason: ``queue_full`` or ``queue_timeout``
+            retry_after: Seconds after which the client should retry
+        """
+        super().__init__(f"Server overloaded ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Bounds the inference work a server accepts.
+
+    At most ``concurrency`` requests run inference at once; the others wait
+    in a FIFO queue. A request is rejected on arrival, without waiting, when
+    ``max_queue`` requests are already queued or when its expected wait
+    (its queue position times the average inference time, divided by the
+    concurrency) exceeds ``max_wait_ms``. A queued request that still waits
+    ``max_wait_ms`` is rejected then. Overload is thus answered in
+    microseconds instead of by client timeouts.
+    """
+
+    def __init__(self, concurrency: int = 1, max_queue: int = 0, max_wait_ms=0.0):
+        """Initialize the controller.
+
+        Args:
+            concurrency: Requests allowed to run inference at once
+            max_queue: Requests allowed to wait for a slot, 0 for no limit
+            max_wait_ms: Longest time a request may wait, 0 for no limit
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must not be negative")
+
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.max_wait_ms = max_wait_ms
+        self._lock = threading.Lock()
+        self._running = 0
+        # Events of the queued requests, set when handed a slot
+        self._waiters: Deque[threading.Event] = deque()
+        self._service_time = 0.0  # moving average, in seconds
+        self.admitted = 0
+        self.rejected: Counter = Counter()
+
+    def acquire(self) -> float:
+        """Wait for an inference slot.
+
+        Returns:
+            Seconds spent queued
+
+        Raises:
+            Overloaded: If the request is shed
+        """
+        with self._lock:
+            if self._running < self.concurrency and not self._waiters:
+                self._running += 1
+                self.admitted += 1
+                return 0.0
+            position = len(self._waiters) + 1
+            if self.max_queue and position > self.max_queue:
+                raise self._reject("queue_full")
+            expected_ms = self._expected_wait(position) * 1000
+            if self.max_wait_ms and expected_ms > self.max_wait_ms:
+                raise self._reject("queue_timeout")
+            waiter = threading.Event()
+            self._waiters.append(waiter)
+
+        started = time.perf_counter()
+        timeout = self.max_wait_ms / 1000.0 if self.max_wait_ms else None
+        if not waiter.wait(timeout):
+            with self._lock:
+                # The slot may have been handed over since the wait timed out
+                if not waiter.is_set():
+                    self._waiters.remove(waiter)
+                    raise self._reject("queue_timeout")
+        return time.perf_counter() - started
+
+    def release(self, seconds: Optional[float] = None) -> None:
+        """Free a slot, handing it to the longest queued request.
+
+        Args:
+            seconds: Time the request spent running inference, or None if
+                it gave the slot up without running
+        """
+        with self._lock:
+            if seconds is not None:
+                self._service_time += SERVICE_TIME_WEIGHT * (
+                    seconds - self._service_time
+                )
+            if self._waiters:
+                self.admitted += 1
+                self._waiters.popleft().set()
+            else:
+                self._running -= 1
+
+    @contextmanager
+    def admit(self):
+        """Hold an inference slot for the duration of a ``with`` block.
+
+        Yields:
+            Seconds spent queued
+        """
+        waited = self.acquire()
+        started = time.perf_counter()
+        try:
+            yield waited
+        finally:
+            self.release(time.perf_counter() - started)
+
+    def waiting(self) -> int:
+        """Number of requests queued for a slot."""
+        return len(self._waiters)
+
+    def _expected_wait(self, position: int) -> float:
+        """Expected seconds until a request at ``position`` gets a slot."""
+        return position * self._service_time / self.concurrency
+
+    def _reject(self, reason: str) -> Overloaded:
+        """Count a rejection; the caller holds the lock."""
+        self.rejected[reason] += 1
+        retry_after = self._expected_wait(len(self._waiters) + 1)
+        return Overloaded(reason, max(retry_after, MIN_RETRY_AFTER))
+
+    def stats(self) -> Dict[str, Any]:
+        """Report the limits, the current load and the rejection counts."""
+        with self._lock:
+            return {
+                "enabled": True,
+                "concurrency": self.concurrency,
+                "max_queue": self.max_queue,
+                "max_wait_ms": self.max_wait_ms,
+                "running": self._running,
+                "waiting": len(self._waiters),
+                "admitted": self.admitted,
+                "rejected": dict(self.rejected),
+                "service_time_ms": round(self._service_time * 1000, 3),
+            }
@@ -2,13 +2,14 @@
 
 from pathlib import Path
 import json
-from typing import List, Any
+from typing import List, Any, Optional
 from flask import Flask, request, jsonify
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 import logging
 from .db import TursiDB
 from .model import ModelManager
+from .serving import DEFAULT_UDS_MODE, serve
 
 logger = logging.getLogger(__name__)
 
@@ -62,7 +63,9 @@ class TursiAPI:
             "config": {
                 "quantization": "dynamic",
                 "bits": 8,
-                "rate_limit": "100/minute"
+                "rate_limit": "100/minute",
+                "intra_op_threads": "auto",
+                "execution_mode": "sequential"
             }
         }
         """
@@ -83,6 +86,16 @@ class TursiAPI:
                     400,
                 )
 
+            # Reject settings the model process could not parse
+            from .daemon import parse_engine_config
+
+            if not isinstance(data["config"], dict):
+                return jsonify({"error": "'config' must be an object"}), 400
+            try:
+                parse_engine_config(data["config"])
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+
             # Add deployment to database
             deployment_id = self.db.add_deployment(
                 model_name=data["model_name"],
@@ -181,11 +194,19 @@ class TursiAPI:
             200,
         )
 
-    def run(self, host: str = "localhost", port: int = 5000):
+    def run(
+        self,
+        host: str = "localhost",
+        port: int = 5000,
+        uds: Optional[str] = None,
+        uds_mode: int = DEFAULT_UDS_MODE,
+    ):
         """Run the API server.
 
         Args:
             host: Host address to bind to
             port: Port number to listen on
+            uds: Unix domain socket path to listen on instead of host and port
+            uds_mode: File mode of the socket, deciding who may connect
         """
-        self.app.run(host=host, port=port)
+        serve(self.app, host, port, uds=uds, uds_mode=uds_mode)
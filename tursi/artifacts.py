@@ -0,0 +1,118 @@
+"""On-disk cache of exported and quantized ONNX model artifacts."""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Written last when an artifact is published; its presence marks a complete entry
+MANIFEST_FILE = "tursi-artifact.json"
+
+
+class ArtifactCache:
+    """Content-addressed cache of model artifacts under a root directory.
+
+    Each entry lives in ``<root>/<model>/<kind>-<key>``, where the key hashes
+    everything that affects the artifact (model id, revision, opset,
+    quantization settings, ...). Entries are built in a scratch directory and
+    published with an atomic rename, so concurrent starts never load a
+    partially written model.
+    """
+
+    def __init__(self, root: Path):
+        """Initialize the cache.
+
+        Args:
+            root: Directory holding all cached artifacts
+        """
+        self.root = Path(root)
+
+    @staticmethod
+    def cache_key(**parts: Any) -> str:
+        """Hash the settings that identify an artifact."""
+        encoded = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+    def entry_dir(self, model_name: str, kind: str, **parts: Any) -> Path:
+        """Get the directory of a cache entry.
+
+        Args:
+            model_name: Model id or local path
+            kind: Artifact kind (e.g. 'export' or 'dynamic-8bit')
+            **parts: Settings that identify the artifact
+
+        Returns:
+            Path of the entry directory (which may not exist yet)
+        """
+        model_dir = model_name.strip("/").replace("/", "--")
+        key = self.cache_key(model=model_name, kind=kind, **parts)
+        return self.root / model_dir / f"{kind}-{key}"
+
+    def lookup(self, entry_dir: Path) -> Optional[Dict[str, Any]]:
+        """Return the manifest of a complete entry, or None on a cache miss."""
+        manifest_path = Path(entry_dir) / MANIFEST_FILE
+        try:
+            with open(manifest_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(
+                f"Ignoring unreadable artifact manifest {manifest_path}: {e}"
+            )
+            return None
+
+    def scratch_dir(self, entry_dir: Path) -> Path:
+        """Create a private scratch directory next to an entry for building it."""
+        entry_dir = Path(entry_dir)
+        entry_dir.parent.mkdir(parents=True, exist_ok=True)
+        scratch = entry_dir.with_name(f".{entry_dir.name}.{os.getpid()}.tmp")
+        shutil.rmtree(scratch, ignore_errors=True)
+        scratch.mkdir()
+        return scratch
+
+    def publish(
+        self, scratch: Path, entry_dir: Path, manifest: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Atomically move a built artifact into place.
+
+        Args:
+            scratch: Scratch directory holding the built artifact
+            entry_dir: Final entry directory
+            manifest: Settings and metadata to record with the artifact
+
+        Returns:
+            The manifest of the published entry
+        """
+        scratch = Path(scratch)
+        entry_dir = Path(entry_dir)
+        manifest = dict(manifest, created_at=time.time())
+        with open(scratch / MANIFEST_FILE, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+        # A stale entry without a manifest is an interrupted build
+        if entry_dir.exists() and self.lookup(entry_dir) is None:
+            shutil.rmtree(entry_dir, ignore_errors=True)
+
+        try:
+            os.replace(scratch, entry_dir)
+        except OSError:
+            # Another process published the same entry first
+            shutil.rmtree(scratch, ignore_errors=True)
+            existing = self.lookup(entry_dir)
+            if existing is None:
+                raise
+            return existing
+
+        logger.info(f"Cached model artifact at {entry_dir}")
+        return manifest
+
+    def discard(self, scratch: Path) -> None:
+        """Remove a scratch directory after a failed build."""
+        shutil.rmtree(scratch, ignore_errors=True)
@@ -0,0 +1,357 @@
+"""ASGI serving mode for Tursi model servers."""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+from .deadline import DEADLINE_HEADER
+from .frames import (
+    FRAME_CONTENT_TYPE,
+    FrameError,
+    decode_request,
+    encode_response,
+    is_frame,
+    wants_frame,
+)
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from .ratelimit import GcraLimiter, retry_after_header
+from .service import PredictionService
+from .serving import (
+    DEFAULT_UDS_MODE,
+    PreforkServer,
+    bind_unix_socket,
+    remove_unix_socket,
+)
+from .timing import RequestTimer
+
+logger = logging.getLogger(__name__)
+
+# Largest request body accepted, in bytes
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+FRAME_CONTENT_TYPE_BYTES = FRAME_CONTENT_TYPE.encode("ascii")
+
+# Paths reported as metric labels; others are grouped as "unmatched"
+ROUTES = ("/predict", "/health", "/metrics")
+
+
+class AsgiApp:
+    """Raw ASGI application exposing ``/predict``, ``/health`` and ``/metrics``.
+
+    Connections are handled on the event loop, so idle keep-alive clients
+    cost no threads. Inference runs on a bounded thread pool (where ONNX
+    Runtime releases the GIL), and requests are otherwise handled exactly
+    like the Flask app, through the shared ``PredictionService``.
+    """
+
+    def __init__(
+        self,
+        service: PredictionService,
+        rate_limit: str = "100 per minute",
+        storage_uri: str = "memory://",
+        executor_threads: int = 32,
+        limiter: Optional[GcraLimiter] = None,
+    ):
+        """Initialize the application.
+
+        Args:
+            service: Request handlers for the served model
+            rate_limit: Per-client rate limit (e.g. '100/minute')
+            storage_uri: Rate limit storage backend
+            executor_threads: Threads available for inference
+            limiter: Shared GCRA limiter enforcing ``rate_limit`` instead of
+                a fixed window in ``storage_uri``
+        """
+        if executor_threads < 1:
+            raise ValueError("executor_threads must be at least 1")
+
+        self.service = service
+        self.rate_limit = rate_limit
+        self._limit = parse(rate_limit)
+        self._limiter = FixedWindowRateLimiter(storage_from_string(storage_uri))
+        self._gcra = limiter
+        self.executor = ThreadPoolExecutor(
+            max_workers=executor_threads, thread_name_prefix="tursi-asgi"
+        )
+
+    async def __call__(self, scope, receive, send) -> None:
+        """Handle an ASGI connection."""
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            metrics = self.service.metrics
+            started = time.perf_counter()
+            metrics.in_flight.inc()
+            try:
+                if scope["path"] == "/metrics" and scope["method"] == "GET":
+                    status = 200
+                    await self._send(
+                        send,
+                        status,
+                        metrics.render().encode("utf-8"),
+                        METRICS_CONTENT_TYPE.encode("ascii"),
+                    )
+                else:
+                    timer = (
+                        self.service.start_timer()
+                        if scope["path"] == "/predict"
+                        else None
+                    )
+                    status, body = await self._handle(scope, receive, timer)
+                    frame = status == 200 and wants_frame(
+                        self._header(scope, b"accept"),
+                        is_frame(self._header(scope, b"content-type")),
+                    )
+                    await self._send_json(send, status, body, timer, frame)
+            finally:
+                metrics.in_flight.dec()
+            path = scope["path"] if scope["path"] in ROUTES else "unmatched"
+            metrics.observe_request(path, status, time.perf_counter() - started)
+
+    async def _lifespan(self, receive, send) -> None:
+        """Handle server startup and shutdown."""
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _handle(
+        self, scope, receive, timer: Optional[RequestTimer] = None
+    ) -> Tuple[int, Dict[str, Any]]:
+        """Route a request and return its status and body."""
+        path, method = scope["path"], scope["method"]
+        loop = asyncio.get_running_loop()
+
+        if path == "/health":
+            if method != "GET":
+                return 405, {"error": "Method not allowed"}
+            body, status = self.service.health()
+            return status, body
+
+        if path == "/predict":
+            if method != "POST":
+                return 405, {"error": "Method not allowed"}
+            limited = self._check_rate_limit(scope)
+            if limited is not None:
+                return 429, limited
+            frame = is_frame(self._header(scope, b"content-type"))
+            if not (frame or self._is_json(scope)):
+                return 400, {"error": "Request must be JSON"}
+
+            parse_started = time.perf_counter()
+            raw = await self._read_body(receive)
+            if raw is None:
+                return 413, {"error": "Request body too large"}
+            try:
+                if frame:
+                    data = decode_request(raw)
+                else:
+                    data = json.loads(raw) if raw else None
+            except FrameError as e:
+                return 400, {"error": f"Invalid frame: {e}"}
+            except ValueError:
+                return 400, {"error": "Request body is not valid JSON"}
+            if timer is not None:
+                timer.add("parse", time.perf_counter() - parse_started)
+
+            deadline = self._header(scope, DEADLINE_HEADER.lower().encode("ascii"))
+            body, status = await loop.run_in_executor(
+                self.executor,
+                self.service.predict,
+                data,
+                timer,
+                deadline or None,
+            )
+            return status, body
+
+        if path == "/metrics":
+            return 405, {"error": "Method not allowed"}
+
+        return 404, {"error": "Not found"}
+
+    def _check_rate_limit(self, scope) -> Optional[Dict[str, Any]]:
+        """Count a request against the client's limit.
+
+        Returns:
+            None if allowed, otherwise the error body
+        """
+        client = (scope.get("client") or ("unknown", 0))[0]
+        error = f"Rate limit exceeded: {self.rate_limit}"
+        if self._gcra is not None:
+            result = self._gcra.hit(f"predict:{client}")
+            if result.allowed:
+                return None
+            return {"error": error, "retry_after": round(result.retry_after, 3)}
+        if self._limiter.hit(self._limit, "predict", client):
+            return None
+        return {"error": error}
+
+    @staticmethod
+    def _header(scope, name: bytes) -> str:
+        """Value of a request header (lowercase name), or an empty string."""
+        for key, value in scope.get("headers") or ():
+            if key == name:
+                return value.decode("latin-1")
+        return ""
+
+    @staticmethod
+    def _is_json(scope) -> bool:
+        """Check the request content type, like Flask's ``request.is_json``."""
+        headers = dict(scope.get("headers") or [])
+        content_type = headers.get(b"content-type", b"").split(b";")[0].strip()
+        return content_type == b"application/json" or (
+            content_type.startswith(b"application/") and content_type.endswith(b"+json")
+        )
+
+    @staticmethod
+    async def _read_body(receive) -> Optional[bytes]:
+        """Read the request body, or None if it exceeds ``MAX_BODY_BYTES``."""
+        chunks: List[bytes] = []
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > MAX_BODY_BYTES:
+                return None
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    async def _send_json(
+        self,
+        send,
+        status: int,
+        body: Dict[str, Any],
+        timer: Optional[RequestTimer] = None,
+        frame: bool = False,
+    ) -> None:
+        """Send a JSON (or binary frame) response, with Server-Timing if timed."""
+        serialize_started = time.perf_counter()
+        if frame:
+            payload, content_type = encode_response(body), FRAME_CONTENT_TYPE_BYTES
+        else:
+            payload, content_type = (
+                json.dumps(body).encode("utf-8"),
+                b"application/json",
+            )
+        headers = []
+        if "retry_after" in body:
+            retry_after = retry_after_header(body["retry_after"])
+            headers.append((b"retry-after", retry_after.encode("ascii")))
+        if timer is not None:
+            timer.add("serialize", time.perf_counter() - serialize_started)
+            header = self.service.finish_timer(timer, status)
+            if header is not None:
+                headers.append((b"server-timing", header.encode("ascii")))
+        await self._send(send, status, payload, content_type, headers)
+
+    @staticmethod
+    async def _send(
+        send, status: int, payload: bytes, content_type: bytes, headers=()
+    ) -> None:
+        """Send a complete response."""
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", content_type),
+                    (b"content-length", str(len(payload)).encode("ascii")),
+                    *headers,
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": payload})
+
+
+def run_asgi(
+    app: AsgiApp,
+    host: str,
+    port: int,
+    workers: int = 1,
+    should_stop: Optional[Callable[[], bool]] = None,
+    uds: Optional[str] = None,
+    uds_mode: int = DEFAULT_UDS_MODE,
+) -> None:
+    """Run an ASGI app with uvicorn.
+
+    Args:
+        app: ASGI application
+        host: Host to bind to
+        port: Port to bind to
+        workers: Number of worker processes sharing the loaded model
+        should_stop: Optional callable polled to shut the server down
+        uds: Unix domain socket path to listen on instead of host and port
+        uds_mode: File mode of the Unix domain socket
+
+    Raises:
+        RuntimeError: If uvicorn is not installed
+    """
+    try:
+        import uvicorn
+    except ImportError as e:
+        raise RuntimeError(
+            "The ASGI server requires uvicorn. Please install it: pip install 'tursi[asgi]'"
+        ) from e
+
+    config = uvicorn.Config(app, host=host, port=port, log_level="info")
+    if workers <= 1:
+        server = uvicorn.Server(config)
+        if should_stop is not None:
+
+            def watch():
+                while not should_stop():
+                    time.sleep(1)
+                server.should_exit = True
+
+            threading.Thread(target=watch, daemon=True).start()
+        if not uds:
+            server.run()
+            return
+
+        # Bound here rather than by uvicorn, which makes the socket world-writable
+        sock = bind_unix_socket(uds, uds_mode)
+        try:
+            server.run(sockets=[sock])
+        finally:
+            sock.close()
+            remove_unix_socket(uds)
+        return
+
+    class HeartbeatServer(uvicorn.Server):
+        """Uvicorn server sending a heartbeat on every tick of its main loop."""
+
+        def __init__(self, config, heartbeat):
+            super().__init__(config)
+            self.heartbeat = heartbeat
+
+        async def on_tick(self, counter: int) -> bool:
+            self.heartbeat()
+            return await super().on_tick(counter)
+
+    def serve_worker(sock, heartbeat):
+        HeartbeatServer(config, heartbeat).run(sockets=[sock])
+
+    PreforkServer(
+        app,
+        host,
+        port,
+        workers=workers,
+        serve_worker=serve_worker,
+        uds=uds,
+        uds_mode=uds_mode,
+    ).serve_forever(should_stop=should_stop)
@@ -0,0 +1,285 @@
+"""Dynamic micro-batching for Tursi inference."""
+
+import os
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from .deadline import DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+# Default token-length bucket boundaries for dynamic padding
+DEFAULT_BUCKETS = (32, 64, 128, 256, 512)
+
+
+class BatcherStopped(RuntimeError):
+    """Raised when submitting to a batcher that has been stopped."""
+
+
+def parse_buckets(value: Union[None, str, Sequence[int]]) -> Tuple[int, ...]:
+    """Parse bucket boundaries from a comma-separated string or a list.
+
+    An empty value or ``"none"`` disables bucketing.
+
+    Args:
+        value: Boundaries such as ``"32,64,128"`` or ``[32, 64, 128]``
+
+    Returns:
+        Sorted, unique boundaries
+
+    Raises:
+        ValueError: If a boundary is not a positive integer
+    """
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        if value.strip().lower() in ("", "none"):
+            return ()
+        value = [part for part in value.split(",") if part.strip()]
+    try:
+        buckets = tuple(sorted({int(b) for b in value}))
+    except (TypeError, ValueError):
+        raise ValueError("Bucket boundaries must be comma-separated integers")
+    if any(b < 1 for b in buckets):
+        raise ValueError("Bucket boundaries must be positive")
+    return buckets
+
+
+def plan_batches(
+    lengths: Sequence[int],
+    buckets: Sequence[int] = (),
+    max_items: int = 32,
+    max_tokens: int = 0,
+) -> List[List[int]]:
+    """Group rows into batches of similar token length.
+
+    Each row goes to the smallest bucket that fits its length (rows longer
+    than every boundary share an overflow bucket). Buckets are split into
+    batches of at most ``max_items`` rows, or, when ``max_tokens`` is set,
+    of at most ``max_tokens`` padded tokens (rows times the longest row), so
+    one long input never inflates the padding of short ones.
+
+    Args:
+        lengths: Token length of each row
+        buckets: Bucket boundaries; empty puts every row in one bucket
+        max_items: Maximum rows per batch when no token budget is set
+        max_tokens: Maximum padded tokens per batch, 0 to limit by rows
+
+    Returns:
+        Lists of row indices, one per batch; every row appears exactly once
+    """
+    groups: Dict[int, List[int]] = {}
+    for index, length in enumerate(lengths):
+        bucket = next((i for i, b in enumerate(buckets) if length <= b), len(buckets))
+        groups.setdefault(bucket, []).append(index)
+
+    batches = []
+    for bucket in sorted(groups):
+        batch: List[int] = []
+        longest = 0
+        for index in sorted(groups[bucket], key=lambda i: lengths[i]):
+            padded = max(longest, lengths[index])
+            if max_tokens > 0:
+                full = batch and (len(batch) + 1) * padded > max_tokens
+            else:
+                full = len(batch) >= max_items
+            if full:
+                batches.append(batch)
+                batch, padded = [], lengths[index]
+            batch.append(index)
+            longest = padded
+        if batch:
+            batches.append(batch)
+    return batches
+
+
+class MicroBatcher:
+    """Collect concurrent requests into batches for a single forward pass.
+
+    A background worker takes the first queued request, then keeps collecting
+    until either ``max_batch_size`` requests are waiting or ``max_wait_ms`` has
+    elapsed. The batch is handed to ``process_batch`` in one call and each
+    caller receives its own result through a ``Future``. Items whose deadline
+    passed while they were queued are dropped from the batch instead.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5.0,
+        name: str = "tursi-batcher",
+        expired: Optional[Callable[[Any], bool]] = None,
+    ):
+        """Initialize the batcher.
+
+        Args:
+            process_batch: Callable that maps a list of items to a list of
+                results of the same length and order
+            max_batch_size: Maximum number of items per batch
+            max_wait_ms: Maximum time to wait for a batch to fill up
+            name: Name of the background worker thread
+            expired: Returns whether an item's deadline has passed; expired
+                items are skipped and their futures raise DeadlineExceeded
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must not be negative")
+
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.name = name
+        self.expired = expired
+
+        self._queue: "queue.Queue[Optional[Tuple[Any, Future]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._stopped = False
+        self._batch_sizes: Counter = Counter()
+        self._expired_items = 0
+
+    def submit(self, item: Any) -> Future:
+        """Queue an item for the next batch.
+
+        Args:
+            item: Item to pass to ``process_batch``
+
+        Returns:
+            Future resolved with the item's result
+
+        Raises:
+            BatcherStopped: If the batcher has been stopped
+        """
+        if self._stopped:
+            raise BatcherStopped(f"{self.name} has been stopped")
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def _ensure_worker(self) -> None:
+        """Start the worker thread, restarting it in forked children."""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            if self._pid is not None and self._pid != os.getpid():
+                # Threads and queued work do not survive a fork
+                self._queue = queue.Queue()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, name=self.name, daemon=True
+            )
+            self._thread.start()
+
+    def _collect(self) -> List[Tuple[Any, Future]]:
+        """Block until a batch is ready and return it."""
+        first = self._queue.get()
+        if first is None:
+            return []
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    entry = self._queue.get(timeout=remaining)
+                else:
+                    entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is None:
+                # Put the stop sentinel back so the loop exits after this batch
+                self._queue.put(None)
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self) -> None:
+        """Worker loop."""
+        while True:
+            batch = self._collect()
+            if not batch:
+                return
+            if self.expired is not None:
+                batch = self._drop_expired(batch)
+                if not batch:
+                    continue
+
+            items = [item for item, _ in batch]
+            futures = [future for _, future in batch]
+            with self._lock:
+                self._batch_sizes[len(batch)] += 1
+
+            try:
+                results = self.process_batch(items)
+                if len(results) != len(items):
+                    raise RuntimeError(
+                        f"Batch returned {len(results)} results for {len(items)} items"
+                    )
+            except Exception as e:
+                logger.error(f"Error processing batch of {len(items)}: {e}")
+                for future in futures:
+                    future.set_exception(e)
+                continue
+
+            for future, result in zip(futures, results):
+                future.set_result(result)
+
+    def _drop_expired(
+        self, batch: List[Tuple[Any, Future]]
+    ) -> List[Tuple[Any, Future]]:
+        """Fail the items of a batch whose deadline has passed; return the rest."""
+        live = []
+        for item, future in batch:
+            if self.expired(item):
+                future.set_exception(DeadlineExceeded("batch"))
+            else:
+                live.append((item, future))
+        if len(live) < len(batch):
+            with self._lock:
+                self._expired_items += len(batch) - len(live)
+        return live
+
+    def pending(self) -> int:
+        """Number of queued requests waiting for a batch."""
+        return self._queue.qsize()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the worker thread after the queued work is processed.
+
+        Later submissions raise BatcherStopped instead of starting a new worker.
+        """
+        self._stopped = True
+        if self._thread is None or self._pid != os.getpid():
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Report the batching configuration and the batch sizes used."""
+        with self._lock:
+            sizes = dict(sorted(self._batch_sizes.items()))
+            expired = self._expired_items
+        batches = sum(sizes.values())
+        requests = sum(size * count for size, count in sizes.items())
+        return {
+            "enabled": True,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "batches": batches,
+            "requests": requests,
+            "mean_batch_size": round(requests / batches, 2) if batches else 0.0,
+            "batch_sizes": {str(size): count for size, count in sizes.items()},
+            "expired": expired,
+        }
@@ -0,0 +1,358 @@
+"""Load generator for benchmarking running Tursi model servers."""
+
+import asyncio
+import json
+import math
+import ssl
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+# Sample texts used when no corpus is given
+DEFAULT_CORPUS = (
+    "This product works great, I love it.",
+    "Terrible service, I will never order here again.",
+    "The package arrived on time and in good condition.",
+    "I am not sure how I feel about the new update.",
+    "Absolutely fantastic experience from start to finish!",
+    "The battery barely lasts half a day, very disappointing.",
+)
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# Percentiles reported for request latency
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def load_corpus(path: Optional[Path] = None) -> List[str]:
+    """Load the texts to send.
+
+    Args:
+        path: A .jsonl file of objects with a "text" or "prompt" field, or a
+            text file with one input per line; None for the built-in corpus
+
+    Returns:
+        Non-empty list of texts
+
+    Raises:
+        ValueError: If the file holds no texts
+    """
+    if path is None:
+        return list(DEFAULT_CORPUS)
+
+    texts = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            if Path(path).suffix == ".jsonl":
+                record = json.loads(line)
+                text = record.get("text", record.get("prompt"))
+                if not isinstance(text, str):
+                    raise ValueError(
+                        f"{path}:{line_number}: expected a 'text' or 'prompt' string"
+                    )
+                texts.append(text)
+            else:
+                texts.append(line)
+    if not texts:
+        raise ValueError(f"No texts found in {path}")
+    return texts
+
+
+def build_payload(path: str, text: str) -> bytes:
+    """Build the request body for an endpoint.
+
+    ``/v1/generate`` endpoints take a prompt, every other endpoint the
+    ``/predict`` contract.
+    """
+    key = "prompt" if path.rstrip("/").endswith("/generate") else "text"
+    return json.dumps({key: text}).encode("utf-8")
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values (0 if empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(q * len(sorted_values) / 100)
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+def latency_histogram(
+    latencies_ms: Sequence[float], bounds: Sequence[float] = HISTOGRAM_BOUNDS_MS
+) -> List[Dict[str, Any]]:
+    """Count latencies per bucket; the last bucket has no upper bound."""
+    counts = [0] * (len(bounds) + 1)
+    for latency in latencies_ms:
+        for i, bound in enumerate(bounds):
+            if latency <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    return [
+        {"le_ms": bound, "count": count}
+        for bound, count in zip(list(bounds) + [None], counts)
+    ]
+
+
+def summarize(
+    latencies_ms: List[float],
+    statuses: Counter,
+    errors: Counter,
+    elapsed: float,
+    settings: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Build the benchmark report.
+
+    Args:
+        latencies_ms: Latency of every successful request
+        statuses: Responses per HTTP status code
+        errors: Failed requests per error kind (status code or exception)
+        elapsed: Wall-clock duration of the run in seconds
+        settings: Benchmark settings, echoed in the report
+
+    Returns:
+        JSON-serializable report
+    """
+    latencies_ms = sorted(latencies_ms)
+    total = len(latencies_ms) + sum(errors.values())
+    return {
+        "settings": settings,
+        "duration_s": round(elapsed, 3),
+        "requests": total,
+        "successes": len(latencies_ms),
+        "errors": sum(errors.values()),
+        "error_rate": round(sum(errors.values()) / total, 4) if total else 0.0,
+        "error_kinds": dict(errors),
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+        "throughput_rps": round(len(latencies_ms) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": (
+                round(sum(latencies_ms) / len(latencies_ms), 3) if latencies_ms else 0.0
+            ),
+            "min": round(latencies_ms[0], 3) if latencies_ms else 0.0,
+            "max": round(latencies_ms[-1], 3) if latencies_ms else 0.0,
+            **{f"p{q:g}": round(percentile(latencies_ms, q), 3) for q in PERCENTILES},
+        },
+        "histogram": latency_histogram(latencies_ms),
+    }
+
+
+class HttpConnection:
+    """Minimal keep-alive HTTP/1.1 client connection for JSON POSTs."""
+
+    def __init__(self, url: str, timeout: float, uds: Optional[str] = None):
+        """Initialize the connection.
+
+        Args:
+            url: Endpoint URL
+            timeout: Seconds to wait for a response
+            uds: Unix domain socket to connect to instead of the URL's host
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {parts.scheme!r}")
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.path = parts.path or "/"
+        if parts.query:
+            self.path += f"?{parts.query}"
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.timeout = timeout
+        self.uds = uds
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def post(self, body: bytes) -> int:
+        """Send a POST request and return the response status code.
+
+        Reconnects when the server closed the previous connection.
+        """
+        if self._writer is None:
+            if self.uds:
+                connect = asyncio.open_unix_connection(self.uds)
+            else:
+                connect = asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+            self._reader, self._writer = await asyncio.wait_for(connect, self.timeout)
+        try:
+            return await asyncio.wait_for(self._exchange(body), self.timeout)
+        except BaseException:
+            self.close()
+            raise
+
+    async def _exchange(self, body: bytes) -> int:
+        """Write a request and read the whole response."""
+        self._writer.write(
+            f"POST {self.path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body
+        )
+        await self._writer.drain()
+
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise ConnectionError("Server closed the connection")
+        status = int(status_line.split()[1])
+        length, keep_alive = None, True
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.partition(b":")
+            name = name.strip().lower()
+            if name == b"content-length":
+                length = int(value)
+            elif name == b"connection":
+                keep_alive = value.strip().lower() != b"close"
+
+        if length is None:
+            await self._reader.read()
+            keep_alive = False
+        else:
+            await self._reader.readexactly(length)
+        if not keep_alive:
+            self.close()
+        return status
+
+    def close(self) -> None:
+        """Close the connection; the next request reconnects."""
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+
+async def _run(
+    url: str,
+    corpus: Sequence[str],
+    concurrency: int,
+    rate: float,
+    duration: float,
+    requests: int,
+    timeout: float,
+    uds: Optional[str] = None,
+) -> Tuple[List[float], Counter, Counter, float]:
+    """Drive the load and collect raw results."""
+    connections: "asyncio.Queue[HttpConnection]" = asyncio.Queue()
+    for _ in range(concurrency):
+        connections.put_nowait(HttpConnection(url, timeout, uds))
+    path = urlsplit(url).path or "/"
+    payloads = [build_payload(path, text) for text in corpus]
+
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    errors: Counter = Counter()
+    start = time.perf_counter()
+    deadline = start + duration if duration else math.inf
+
+    async def send(index: int, scheduled: float) -> None:
+        connection = await connections.get()
+        try:
+            status = await connection.post(payloads[index % len(payloads)])
+        except asyncio.TimeoutError:
+            errors["timeout"] += 1
+        except (OSError, ValueError, asyncio.IncompleteReadError) as e:
+            errors[type(e).__name__] += 1
+        else:
+            statuses[status] += 1
+            if 200 <= status < 300:
+                latencies.append((time.perf_counter() - scheduled) * 1000)
+            else:
+                errors[str(status)] += 1
+        finally:
+            connections.put_nowait(connection)
+
+    def more(sent: int) -> bool:
+        return (not requests or sent < requests) and time.perf_counter() < deadline
+
+    if rate:
+        # Open loop: send on a fixed schedule whatever the server's speed,
+        # timing each request from its scheduled start so client-side
+        # queueing (coordinated omission) counts against latency
+        tasks = []
+        sent = 0
+        while more(sent):
+            scheduled = start + sent / rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                if not more(sent):
+                    break
+            tasks.append(asyncio.ensure_future(send(sent, scheduled)))
+            sent += 1
+        await asyncio.gather(*tasks)
+    else:
+        # Closed loop: each client sends its next request once the last is done
+        counter = [0]
+
+        async def client() -> None:
+            while more(counter[0]):
+                index = counter[0]
+                counter[0] += 1
+                await send(index, time.perf_counter())
+
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+
+    elapsed = time.perf_counter() - start
+    while not connections.empty():
+        connections.get_nowait().close()
+    return latencies, statuses, errors, elapsed
+
+
+def run_bench(
+    url: str,
+    corpus: Optional[Sequence[str]] = None,
+    concurrency: int = 8,
+    rate: float = 0,
+    duration: float = 10.0,
+    requests: int = 0,
+    timeout: float = 30.0,
+    uds: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Benchmark a model server endpoint.
+
+    Args:
+        url: Endpoint URL, e.g. http://127.0.0.1:5000/predict
+        corpus: Texts to send, cycled through in order
+        concurrency: Closed-loop clients, or the maximum number of requests
+            in flight in open-loop mode
+        rate: Requests per second to send on a fixed schedule (open loop);
+            0 runs ``concurrency`` closed-loop clients instead
+        duration: Seconds to run, 0 for no time limit
+        requests: Number of requests to send, 0 for no limit
+        timeout: Seconds to wait for each response
+        uds: Unix domain socket to send requests to; only the URL's path
+            is used
+
+    Returns:
+        Report with throughput, latency percentiles, errors and histogram
+
+    Raises:
+        ValueError: If the settings are invalid
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if rate < 0 or duration < 0 or requests < 0:
+        raise ValueError("rate, duration and requests must not be negative")
+    if not duration and not requests:
+        raise ValueError("Set a duration or a number of requests")
+
+    corpus = list(corpus) if corpus else list(DEFAULT_CORPUS)
+    latencies, statuses, errors, elapsed = asyncio.run(
+        _run(url, corpus, concurrency, rate, duration, requests, timeout, uds)
+    )
+    settings = {
+        "url": url,
+        "uds": uds,
+        "mode": "open" if rate else "closed",
+        "concurrency": concurrency,
+        "rate": rate,
+        "duration_s": duration,
+        "requests": requests,
+        "corpus_size": len(corpus),
+    }
+    return summarize(latencies, statuses, errors, elapsed, settings)
@@ -0,0 +1,123 @@
+"""In-process LRU cache of prediction results."""
+
+import hashlib
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so trivially different inputs share a cache entry.
+
+    Applies Unicode NFC normalization, strips surrounding whitespace and
+    collapses internal runs of whitespace, none of which change how the
+    tokenizer splits the text.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class PredictionCache:
+    """Thread-safe LRU cache with an optional time-to-live.
+
+    Keys hash the normalized text together with a namespace identifying the
+    model, its quantization settings and the exact artifact being served, so
+    entries from a different model build can never be returned.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float = 0, namespace: str = ""):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached results
+            ttl_seconds: Seconds before an entry expires, 0 to never expire
+            namespace: Identifies the model artifact the results belong to
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if ttl_seconds < 0:
+            raise ValueError("ttl_seconds must not be negative")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._namespace = namespace
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def namespace(self) -> str:
+        """Identifier of the model artifact the cached results belong to."""
+        return self._namespace
+
+    def key(self, text: str, variant: str = "") -> str:
+        """Build the cache key of a text.
+
+        Args:
+            text: Input text
+            variant: Identifies request options that change the result,
+                such as the number of labels returned
+        """
+        digest = hashlib.sha256(self._namespace.encode("utf-8"))
+        if variant:
+            digest.update(b"\0")
+            digest.update(variant.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(normalize_text(text).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, text: str, variant: str = "") -> Optional[Dict]:
+        """Return a copy of the cached result for a text, or None on a miss."""
+        key = self.key(text, variant)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds and entry[0] <= now:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, text: str, result: Dict, variant: str = "") -> None:
+        """Cache the result for a text, evicting the least recently used."""
+        key = self.key(text, variant)
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else 0
+        with self._lock:
+            self._entries[key] = (expires_at, dict(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Report the cache configuration and hit/miss counters."""
+        with self._lock:
+            size = len(self._entries)
+            hits, misses = self.hits, self.misses
+            evictions, expirations = self.evictions, self.expirations
+        lookups = hits + misses
+        return {
+            "enabled": True,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "size": size,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "evictions": evictions,
+            "expirations": expirations,
+        }
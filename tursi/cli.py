@@ -1,5 +1,6 @@
 """Command-line interface for Tursi AI model deployment."""
 
+import json
 import os
 import sys
 import signal
@@ -14,7 +15,9 @@ from rich.panel import Panel
 from rich import print as rprint
 from rich.table import Table
 from . import __version__
-from .engine import TursiEngine
+from .batching import parse_buckets
+from .registry import parse_models
+from .serving import parse_socket_mode, serve
 from datetime import datetime, timedelta
 
 # Create console for rich output
@@ -35,14 +38,65 @@ def print_help(command: Optional[str] = None):
 [bold]Options:[/bold]
   --port, -p INTEGER           Port to run the API server on [default: 5000]
   --host TEXT                  Host to bind the API server to [default: 127.0.0.1]
+  --uds PATH                   Listen on a Unix domain socket instead of host and port [env: SERVER_UDS]
+  --uds-mode TEXT              Octal file mode of the socket, deciding who may connect [default: 660] [env: SERVER_UDS_MODE]
+  --workers, -w INTEGER        Worker processes sharing one loaded model [env: SERVER_WORKERS]
+  --server TEXT                Server implementation: 'flask' or 'asgi' (needs uvicorn) [env: SERVER_MODE]
+  --warmup/--no-warmup         Run synthetic batches at every serving shape before reporting ready [env: WARMUP]
+  --server-timing/--no-server-timing  Add per-stage Server-Timing headers to /predict responses [env: SERVER_TIMING]
+  --timing-log-sample-rate FLOAT      Fraction of requests logged with their stage timings [env: TIMING_LOG_SAMPLE_RATE]
+  --multi-model/--single-model  Serve every allowed model under /models/<name>/predict, loading them on first use [env: MULTI_MODEL]
+  --models TEXT               Comma-separated models that may be served [env: ALLOWED_MODELS]
+  --memory-budget-mb FLOAT    Memory loaded models may use before the least recently used is evicted, 0 unlimited [env: MODEL_MEMORY_BUDGET_MB]
+  --max-models INTEGER        Models kept loaded in multi-model mode, 0 unlimited [env: MAX_LOADED_MODELS]
   --quantization, -q TEXT      Quantization mode: 'dynamic' or 'static' [default: dynamic]
   --bits, -b INTEGER          Number of bits for quantization (4 or 8) [default: 8]
+  --calibration-data PATH     Calibration texts (.jsonl or .txt) for static quantization [env: CALIBRATION_DATA]
+  --calibration-method TEXT   Calibration method: 'minmax', 'entropy' or 'percentile' [default: minmax]
   --rate-limit, -r TEXT       API rate limit (e.g., '100/minute') [default: 100/minute]
+  --rate-limit-strategy TEXT  Rate limiter: 'fixed-window' or 'gcra' (shared by all workers) [env: RATE_LIMIT_STRATEGY]
+  --rate-limit-state-file PATH  File holding the GCRA limiter state, shared by every server using it [env: RATE_LIMIT_STATE_FILE]
   --cache-dir, -c PATH        Directory to cache models (default: ~/.tursi/models)
+  --batch-size INTEGER        Max requests per micro-batch, 1 disables batching [env: BATCH_MAX_SIZE]
+  --batch-wait-ms FLOAT       Max time to wait for a micro-batch to fill [env: BATCH_MAX_WAIT_MS]
+  --batch-buckets TEXT        Token-length buckets for dynamic padding, e.g. '32,64,128' or 'none' [env: BATCH_BUCKETS]
+  --batch-max-tokens INTEGER  Max padded tokens per forward pass instead of a row count, 0 disables [env: BATCH_MAX_TOKENS]
+  --prediction-cache-size INTEGER  Cache results of up to N distinct texts, 0 disables [env: PREDICTION_CACHE_SIZE]
+  --prediction-cache-ttl FLOAT     Seconds before a cached result expires, 0 never [env: PREDICTION_CACHE_TTL]
+  --queue-depth INTEGER       Requests waiting for inference before new ones get a 503, 0 unbounded [env: QUEUE_MAX_DEPTH]
+  --queue-wait-ms FLOAT       Longest expected or actual wait for inference before a 503, 0 unbounded [env: QUEUE_MAX_WAIT_MS]
+  --inference-concurrency INTEGER  Requests running inference at once under admission control, 0 automatic [env: INFERENCE_CONCURRENCY]
+  --intra-op-threads TEXT     ONNX Runtime intra-op threads, 0 for all cores or 'auto' to benchmark [env: ORT_INTRA_OP_THREADS]
+  --inter-op-threads INTEGER  ONNX Runtime inter-op threads for parallel mode [env: ORT_INTER_OP_THREADS]
+  --execution-mode TEXT       ONNX Runtime execution mode: 'sequential' or 'parallel' [env: ORT_EXECUTION_MODE]
+  --spin-wait/--no-spin-wait  Let idle ONNX Runtime threads spin for new work [env: ORT_ALLOW_SPINNING]
+  --io-binding/--no-io-binding  Run inference on preallocated buffers bound to the session [env: ORT_IO_BINDING]
   -h, --help                  Show this message and exit
 
 [bold]Example:[/bold]
   $ tursi up distilbert-base-uncased --port 8000 --quantization dynamic
+"""
+        )
+    elif command == "bench":
+        console.print(
+            """
+[bold]Usage:[/bold]
+  tursi bench [OPTIONS] [URL]
+
+[bold]Arguments:[/bold]
+  URL  Endpoint to benchmark [default: http://127.0.0.1:5000/predict]
+
+[bold]Options:[/bold]
+  --concurrency, -c INTEGER  Closed-loop clients, or max requests in flight with --rate [default: 8]
+  --rate, -r FLOAT           Requests per second on a fixed schedule (open loop), 0 for closed loop [default: 0]
+  --duration, -d FLOAT       Seconds to run, 0 for no limit [default: 10]
+  --requests, -n INTEGER     Number of requests to send, 0 for no limit [default: 0]
+  --corpus PATH              Texts to send (.jsonl with "text"/"prompt" fields, or one per line)
+  --timeout FLOAT            Seconds to wait for each response [default: 30]
+  --uds PATH                 Send requests to a Unix domain socket; only the URL's path is used
+  --json                     Print the report as JSON
+  --output, -o PATH          Also write the JSON report to a file
+  -h, --help                 Show this message and exit
 """
         )
     else:
@@ -59,6 +113,7 @@ def print_help(command: Optional[str] = None):
   ps        List running models
   logs      View server logs
   stats     Show resource usage statistics
+  bench     Benchmark a running model server
 
 [bold]Options:[/bold]
   -h, --help     Show this message and exit
@@ -82,6 +137,31 @@ class QuantizationMode(str, Enum):
     STATIC = "static"
 
 
+# Define valid server implementations
+class ServerMode(str, Enum):
+    FLASK = "flask"
+    ASGI = "asgi"
+
+
+# Define valid rate limiting strategies
+class RateLimitStrategy(str, Enum):
+    FIXED_WINDOW = "fixed-window"
+    GCRA = "gcra"
+
+
+# Define valid ONNX Runtime execution modes
+class ExecutionMode(str, Enum):
+    SEQUENTIAL = "sequential"
+    PARALLEL = "parallel"
+
+
+# Define valid calibration methods for static quantization
+class CalibrationMethod(str, Enum):
+    MINMAX = "minmax"
+    ENTROPY = "entropy"
+    PERCENTILE = "percentile"
+
+
 def version_callback(value: bool):
     """Print version and exit."""
     if value:
@@ -89,6 +169,50 @@ def version_callback(value: bool):
         raise typer.Exit()
 
 
+def validate_threads(value: Optional[str]) -> Optional[str]:
+    """Validate an ONNX Runtime thread count."""
+    if value is None or value.strip().lower() == "auto":
+        return value
+    if not value.isdigit():
+        raise typer.BadParameter(
+            "Thread count must be a non-negative integer or 'auto'"
+        )
+    return value
+
+
+def validate_socket_mode(value: Optional[str]) -> Optional[str]:
+    """Validate a Unix domain socket file mode."""
+    if value is None:
+        return value
+    try:
+        parse_socket_mode(value)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+    return value
+
+
+def validate_buckets(value: Optional[str]) -> Optional[str]:
+    """Validate token-length bucket boundaries."""
+    if value is None:
+        return value
+    try:
+        parse_buckets(value)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+    return value
+
+
+def validate_models(value: Optional[str]) -> Optional[str]:
+    """Validate a comma-separated model allow-list."""
+    if value is None:
+        return value
+    try:
+        parse_models(value)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+    return value
+
+
 def validate_bits(value: int) -> int:
     """Validate quantization bits."""
     if value not in (4, 8):
@@ -136,6 +260,71 @@ def up(
         "--host",
         help="Host to bind the API server to",
     ),
+    uds: Optional[Path] = typer.Option(
+        None,
+        "--uds",
+        help="Listen on a Unix domain socket instead of host and port [env: SERVER_UDS]",
+        dir_okay=False,
+    ),
+    uds_mode: Optional[str] = typer.Option(
+        None,
+        "--uds-mode",
+        help="Octal file mode of the socket, deciding who may connect [env: SERVER_UDS_MODE]",
+        callback=validate_socket_mode,
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        "-w",
+        help="Worker processes sharing one loaded model [env: SERVER_WORKERS]",
+        min=1,
+    ),
+    server_mode: Optional[ServerMode] = typer.Option(
+        None,
+        "--server",
+        help="Server implementation: 'flask' or 'asgi' (needs uvicorn) [env: SERVER_MODE]",
+        case_sensitive=False,
+    ),
+    warmup: Optional[bool] = typer.Option(
+        None,
+        "--warmup/--no-warmup",
+        help="Run synthetic batches at every serving shape before reporting ready [env: WARMUP]",
+    ),
+    server_timing: Optional[bool] = typer.Option(
+        None,
+        "--server-timing/--no-server-timing",
+        help="Add per-stage Server-Timing headers to /predict responses [env: SERVER_TIMING]",
+    ),
+    timing_log_sample_rate: Optional[float] = typer.Option(
+        None,
+        "--timing-log-sample-rate",
+        help="Fraction of requests logged with their stage timings [env: TIMING_LOG_SAMPLE_RATE]",
+        min=0,
+        max=1,
+    ),
+    multi_model: Optional[bool] = typer.Option(
+        None,
+        "--multi-model/--single-model",
+        help="Serve every allowed model under /models/<name>/predict, loading them on first use [env: MULTI_MODEL]",
+    ),
+    models: Optional[str] = typer.Option(
+        None,
+        "--models",
+        callback=validate_models,
+        help="Comma-separated models that may be served [env: ALLOWED_MODELS]",
+    ),
+    memory_budget_mb: Optional[float] = typer.Option(
+        None,
+        "--memory-budget-mb",
+        help="Memory the loaded models may use before the least recently used is evicted, 0 unlimited [env: MODEL_MEMORY_BUDGET_MB]",
+        min=0,
+    ),
+    max_models: Optional[int] = typer.Option(
+        None,
+        "--max-models",
+        help="Models kept loaded in multi-model mode, 0 unlimited [env: MAX_LOADED_MODELS]",
+        min=0,
+    ),
     quantization_mode: QuantizationMode = typer.Option(
         QuantizationMode.DYNAMIC,
         "--quantization",
@@ -150,18 +339,124 @@ def up(
         help="Number of bits for quantization (4 or 8)",
         callback=validate_bits,
     ),
+    calibration_data: Optional[Path] = typer.Option(
+        None,
+        "--calibration-data",
+        help="Calibration texts (.jsonl or .txt) for static quantization [env: CALIBRATION_DATA]",
+        exists=True,
+        dir_okay=False,
+    ),
+    calibration_method: Optional[CalibrationMethod] = typer.Option(
+        None,
+        "--calibration-method",
+        help="Calibration method: 'minmax', 'entropy' or 'percentile'",
+        case_sensitive=False,
+    ),
     rate_limit: str = typer.Option(
         "100/minute",
         "--rate-limit",
         "-r",
         help="API rate limit (e.g., '100/minute')",
     ),
+    rate_limit_strategy: Optional[RateLimitStrategy] = typer.Option(
+        None,
+        "--rate-limit-strategy",
+        help="Rate limiter: 'fixed-window' or 'gcra' (shared by all workers) [env: RATE_LIMIT_STRATEGY]",
+        case_sensitive=False,
+    ),
+    rate_limit_state_file: Optional[Path] = typer.Option(
+        None,
+        "--rate-limit-state-file",
+        help="File holding the GCRA limiter state, shared by every server using it [env: RATE_LIMIT_STATE_FILE]",
+    ),
     cache_dir: Optional[Path] = typer.Option(
         None,
         "--cache-dir",
         "-c",
         help="Directory to cache models (default: ~/.tursi/models)",
     ),
+    batch_size: Optional[int] = typer.Option(
+        None,
+        "--batch-size",
+        help="Max requests per micro-batch, 1 disables batching [env: BATCH_MAX_SIZE]",
+        min=1,
+    ),
+    batch_wait_ms: Optional[float] = typer.Option(
+        None,
+        "--batch-wait-ms",
+        help="Max time to wait for a micro-batch to fill [env: BATCH_MAX_WAIT_MS]",
+        min=0,
+    ),
+    batch_buckets: Optional[str] = typer.Option(
+        None,
+        "--batch-buckets",
+        help="Token-length buckets for dynamic padding, e.g. '32,64,128' or 'none' [env: BATCH_BUCKETS]",
+        callback=validate_buckets,
+    ),
+    batch_max_tokens: Optional[int] = typer.Option(
+        None,
+        "--batch-max-tokens",
+        help="Max padded tokens per forward pass instead of a row count, 0 disables [env: BATCH_MAX_TOKENS]",
+        min=0,
+    ),
+    prediction_cache_size: Optional[int] = typer.Option(
+        None,
+        "--prediction-cache-size",
+        help="Cache results of up to N distinct texts, 0 disables [env: PREDICTION_CACHE_SIZE]",
+        min=0,
+    ),
+    prediction_cache_ttl: Optional[float] = typer.Option(
+        None,
+        "--prediction-cache-ttl",
+        help="Seconds before a cached result expires, 0 never [env: PREDICTION_CACHE_TTL]",
+        min=0,
+    ),
+    queue_depth: Optional[int] = typer.Option(
+        None,
+        "--queue-depth",
+        help="Requests waiting for inference before new ones get a 503, 0 unbounded [env: QUEUE_MAX_DEPTH]",
+        min=0,
+    ),
+    queue_wait_ms: Optional[float] = typer.Option(
+        None,
+        "--queue-wait-ms",
+        help="Longest expected or actual wait for inference before a 503, 0 unbounded [env: QUEUE_MAX_WAIT_MS]",
+        min=0,
+    ),
+    inference_concurrency: Optional[int] = typer.Option(
+        None,
+        "--inference-concurrency",
+        help="Requests running inference at once under admission control, 0 automatic [env: INFERENCE_CONCURRENCY]",
+        min=0,
+    ),
+    intra_op_threads: Optional[str] = typer.Option(
+        None,
+        "--intra-op-threads",
+        help="ONNX Runtime intra-op threads, 0 for all cores or 'auto' to benchmark [env: ORT_INTRA_OP_THREADS]",
+        callback=validate_threads,
+    ),
+    inter_op_threads: Optional[int] = typer.Option(
+        None,
+        "--inter-op-threads",
+        help="ONNX Runtime inter-op threads for parallel mode [env: ORT_INTER_OP_THREADS]",
+        min=0,
+    ),
+    execution_mode: Optional[ExecutionMode] = typer.Option(
+        None,
+        "--execution-mode",
+        help="ONNX Runtime execution mode: 'sequential' or 'parallel' [env: ORT_EXECUTION_MODE]",
+        case_sensitive=False,
+    ),
+    spin_wait: Optional[bool] = typer.Option(
+        None,
+        "--spin-wait/--no-spin-wait",
+        help="Let idle ONNX Runtime threads spin for new work [env: ORT_ALLOW_SPINNING]",
+    ),
+    io_binding: Optional[bool] = typer.Option(
+        None,
+        "--io-binding/--no-io-binding",
+        help="Run inference on preallocated buffers bound to the session [env: ORT_IO_BINDING]",
+    ),
     help: Optional[bool] = typer.Option(
         None,
         "--help",
@@ -192,6 +487,9 @@ def up(
             console=console,
         ) as progress:
             progress.add_task("Initializing Tursi engine...", total=None)
+            # Imported here so other commands start without the ML stack
+            from .engine import TursiEngine
+
             engine = TursiEngine()
 
             # Set cache directory if provided
@@ -202,23 +500,116 @@ def up(
             # Configure quantization
             engine.QUANTIZATION_MODE = quantization_mode.value
             engine.QUANTIZATION_BITS = quantization_bits
-
-            # Create Flask app
+            if calibration_data is not None:
+                engine.CALIBRATION_DATA = str(calibration_data)
+            if calibration_method is not None:
+                engine.CALIBRATION_METHOD = calibration_method.value
+
+            # Configure micro-batching (falls back to environment settings)
+            if batch_size is not None:
+                engine.BATCH_MAX_SIZE = batch_size
+            if batch_wait_ms is not None:
+                engine.BATCH_MAX_WAIT_MS = batch_wait_ms
+            if batch_buckets is not None:
+                engine.BATCH_BUCKETS = parse_buckets(batch_buckets)
+            if batch_max_tokens is not None:
+                engine.BATCH_MAX_TOKENS = batch_max_tokens
+
+            # Configure worker processes (falls back to environment settings)
+            if workers is not None:
+                engine.SERVER_WORKERS = workers
+            if server_mode is not None:
+                engine.SERVER_MODE = server_mode.value
+            if uds is not None:
+                engine.SERVER_UDS = str(uds)
+            if uds_mode is not None:
+                engine.SERVER_UDS_MODE = uds_mode
+            if warmup is not None:
+                engine.WARMUP = warmup
+            if server_timing is not None:
+                engine.SERVER_TIMING = server_timing
+            if timing_log_sample_rate is not None:
+                engine.TIMING_LOG_SAMPLE_RATE = timing_log_sample_rate
+
+            # Configure multi-model serving (falls back to environment settings)
+            if multi_model is not None:
+                engine.MULTI_MODEL = multi_model
+            if models is not None:
+                engine.ALLOWED_MODELS = parse_models(models)
+            if memory_budget_mb is not None:
+                engine.MODEL_MEMORY_BUDGET_MB = memory_budget_mb
+            if max_models is not None:
+                engine.MAX_LOADED_MODELS = max_models
+
+            # Configure the prediction cache (falls back to environment settings)
+            if prediction_cache_size is not None:
+                engine.PREDICTION_CACHE_SIZE = prediction_cache_size
+            if prediction_cache_ttl is not None:
+                engine.PREDICTION_CACHE_TTL = prediction_cache_ttl
+
+            # Configure admission control (falls back to environment settings)
+            if queue_depth is not None:
+                engine.QUEUE_MAX_DEPTH = queue_depth
+            if queue_wait_ms is not None:
+                engine.QUEUE_MAX_WAIT_MS = queue_wait_ms
+            if inference_concurrency is not None:
+                engine.INFERENCE_CONCURRENCY = inference_concurrency
+
+            # Configure ONNX Runtime threading (falls back to environment settings)
+            if intra_op_threads is not None:
+                engine.ORT_INTRA_OP_THREADS = intra_op_threads
+            if inter_op_threads is not None:
+                engine.ORT_INTER_OP_THREADS = inter_op_threads
+            if execution_mode is not None:
+                engine.ORT_EXECUTION_MODE = execution_mode.value
+            if spin_wait is not None:
+                engine.ORT_ALLOW_SPINNING = spin_wait
+            if io_binding is not None:
+                engine.ORT_IO_BINDING = io_binding
+
+            # Configure rate limiting (falls back to environment settings)
+            if rate_limit_strategy is not None:
+                engine.RATE_LIMIT_STRATEGY = rate_limit_strategy.value
+            if rate_limit_state_file is not None:
+                engine.RATE_LIMIT_STATE_FILE = str(rate_limit_state_file)
+
+            # Create the Flask or ASGI app
             progress.add_task("Creating API server...", total=None)
-            app = engine.create_app(
+            if engine.MULTI_MODEL:
+                create_app = engine.create_multi_model_app
+            elif engine.SERVER_MODE == "asgi":
+                create_app = engine.create_asgi_app
+            else:
+                create_app = engine.create_app
+            app = create_app(
                 model_name=model_name,
                 rate_limit=rate_limit,
             )
 
             # Show success message
             console.print("\n[green]✓[/green] Model server started successfully!")
-            console.print(f"\nAPI server running at: http://{host}:{port}")
+            if engine.SERVER_UDS:
+                console.print(f"\nAPI server running at: unix:{engine.SERVER_UDS}")
+            else:
+                console.print(f"\nAPI server running at: http://{host}:{port}")
             console.print("Available endpoints:")
-            console.print("  • POST /predict - Make predictions")
+            if engine.MULTI_MODEL:
+                console.print("  • POST /models/<name>/predict - Make predictions")
+                console.print("  • GET  /models - List models and load stats")
+            else:
+                console.print("  • POST /predict - Make predictions")
             console.print("  • GET  /health - Check server health")
 
-            # Run Flask app
-            app.run(host=host, port=port)
+            # Run the API server, forking workers once the model is loaded
+            serve(
+                app,
+                host=host,
+                port=port,
+                workers=engine.SERVER_WORKERS,
+                mode=engine.SERVER_MODE,
+                uds=engine.SERVER_UDS,
+                uds_mode=parse_socket_mode(engine.SERVER_UDS_MODE),
+            )
 
     except Exception as e:
         console.print(f"\n[red]Error:[/red] {str(e)}")
@@ -331,6 +722,144 @@ def stats():
     raise typer.Exit(1)
 
 
+@app.command()
+def bench(
+    url: str = typer.Argument(
+        "http://127.0.0.1:5000/predict",
+        help="Endpoint to benchmark (/predict or /v1/generate)",
+    ),
+    concurrency: int = typer.Option(
+        8,
+        "--concurrency",
+        "-c",
+        help="Closed-loop clients, or max requests in flight with --rate",
+        min=1,
+    ),
+    rate: float = typer.Option(
+        0,
+        "--rate",
+        "-r",
+        help="Requests per second on a fixed schedule (open loop), 0 for closed loop",
+        min=0,
+    ),
+    duration: float = typer.Option(
+        10.0,
+        "--duration",
+        "-d",
+        help="Seconds to run, 0 for no limit",
+        min=0,
+    ),
+    requests: int = typer.Option(
+        0,
+        "--requests",
+        "-n",
+        help="Number of requests to send, 0 for no limit",
+        min=0,
+    ),
+    corpus: Optional[Path] = typer.Option(
+        None,
+        "--corpus",
+        help="Texts to send (.jsonl with 'text'/'prompt' fields, or one per line)",
+        exists=True,
+        dir_okay=False,
+    ),
+    timeout: float = typer.Option(
+        30.0,
+        "--timeout",
+        help="Seconds to wait for each response",
+        min=0,
+    ),
+    uds: Optional[Path] = typer.Option(
+        None,
+        "--uds",
+        help="Send requests to a Unix domain socket; only the URL's path is used",
+        dir_okay=False,
+    ),
+    as_json: bool = typer.Option(
+        False,
+        "--json",
+        help="Print the report as JSON",
+    ),
+    output: Optional[Path] = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Also write the JSON report to a file",
+    ),
+    help: Optional[bool] = typer.Option(
+        None,
+        "--help",
+        "-h",
+        is_eager=True,
+        callback=lambda x: print_help("bench") if x else None,
+        help="Show this message and exit",
+    ),
+):
+    """Benchmark a running model server.
+
+    Example:
+        $ tursi bench http://127.0.0.1:5000/predict --concurrency 16 --duration 30
+    """
+    from .bench import load_corpus, run_bench
+
+    try:
+        report = run_bench(
+            url,
+            corpus=load_corpus(corpus),
+            concurrency=concurrency,
+            rate=rate,
+            duration=duration,
+            requests=requests,
+            timeout=timeout,
+            uds=str(uds) if uds else None,
+        )
+    except (OSError, ValueError) as e:
+        console.print(f"\n[red]Error:[/red] {str(e)}")
+        raise typer.Exit(1)
+
+    if output is not None:
+        output.write_text(json.dumps(report, indent=2) + "\n")
+    if as_json:
+        print(json.dumps(report, indent=2))
+        return
+
+    settings = report["settings"]
+    console.print(
+        f"\n[bold]{settings['url']}[/bold]"
+        + (f" via unix:{settings['uds']}" if settings["uds"] else "")
+        + f" - {settings['mode']} loop, "
+        f"{settings['concurrency']} connections"
+        + (f", {settings['rate']:g} req/s" if settings["rate"] else "")
+    )
+    console.print(
+        f"{report['requests']} requests in {report['duration_s']:.2f}s, "
+        f"[green]{report['throughput_rps']:.1f} req/s[/green], "
+        f"errors: {report['errors']} ({report['error_rate']:.2%})"
+    )
+    if report["error_kinds"]:
+        console.print(f"Error kinds: {report['error_kinds']}")
+
+    latency = Table(title="Latency (ms)")
+    for name in report["latency_ms"]:
+        latency.add_column(name, justify="right")
+    latency.add_row(*(f"{value:.2f}" for value in report["latency_ms"].values()))
+    console.print(latency)
+
+    histogram = Table(title="Latency histogram")
+    histogram.add_column("<= ms", justify="right")
+    histogram.add_column("Count", justify="right")
+    histogram.add_column("")
+    peak = max(bucket["count"] for bucket in report["histogram"]) or 1
+    for bucket in report["histogram"]:
+        if bucket["count"]:
+            histogram.add_row(
+                "inf" if bucket["le_ms"] is None else str(bucket["le_ms"]),
+                str(bucket["count"]),
+                "#" * max(1, round(40 * bucket["count"] / peak)),
+            )
+    console.print(histogram)
+
+
 def main():
     """Deploy AI models with unmatched simplicity."""
     app()
@@ -12,11 +12,139 @@ import json
 import multiprocessing as mp
 import threading
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Any, Callable, Dict, Optional, Tuple
 import psutil
+from .batching import parse_buckets
 from .db import TursiDB
 from .engine import TursiEngine
+from .registry import parse_models
+from .runtime import parse_bool
 from .api import TursiAPI
+from .serving import parse_socket_mode, serve
+
+FALSE_VALUES = ("0", "false", "no", "off")
+
+
+def config_bool(value: Any) -> bool:
+    """Parse a boolean config value, rejecting anything but true/false spellings."""
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text not in FALSE_VALUES and not parse_bool(text):
+        raise ValueError(f"expected a boolean, got {value!r}")
+    return parse_bool(text)
+
+
+def config_int(value: Any) -> int:
+    """Parse an integer config value such as 4 or "4"."""
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(f"expected an integer, got {value!r}")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"expected an integer, got {value!r}")
+
+
+def config_float(value: Any) -> float:
+    """Parse a number config value such as 2.5 or "2.5"."""
+    if isinstance(value, bool):
+        raise ValueError(f"expected a number, got {value!r}")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"expected a number, got {value!r}")
+
+
+def config_choice(*choices: str) -> Callable[[Any], str]:
+    """Build a parser accepting one of ``choices``, case-insensitively."""
+
+    def parse(value: Any) -> str:
+        text = str(value).strip().lower()
+        if text not in choices:
+            raise ValueError(f"expected one of {', '.join(choices)}, got {value!r}")
+        return text
+
+    return parse
+
+
+def config_threads(value: Any) -> str:
+    """Parse an ONNX Runtime thread count: a non-negative integer or 'auto'."""
+    text = str(value).strip().lower()
+    if isinstance(value, bool) or not (text == "auto" or text.isdigit()):
+        raise ValueError(f"expected a non-negative integer or 'auto', got {value!r}")
+    return text
+
+
+# Deployment config keys, the engine settings they override and their parsers,
+# matching how the same settings are parsed from the environment and the CLI
+ENGINE_CONFIG_KEYS: Dict[str, Tuple[str, Callable[[Any], Any]]] = {
+    "quantization": ("QUANTIZATION_MODE", config_choice("dynamic", "static")),
+    "bits": ("QUANTIZATION_BITS", config_int),
+    "batch_size": ("BATCH_MAX_SIZE", config_int),
+    "batch_wait_ms": ("BATCH_MAX_WAIT_MS", config_float),
+    "batch_buckets": ("BATCH_BUCKETS", parse_buckets),
+    "batch_max_tokens": ("BATCH_MAX_TOKENS", config_int),
+    "prediction_cache_size": ("PREDICTION_CACHE_SIZE", config_int),
+    "prediction_cache_ttl": ("PREDICTION_CACHE_TTL", config_float),
+    "queue_max_depth": ("QUEUE_MAX_DEPTH", config_int),
+    "queue_max_wait_ms": ("QUEUE_MAX_WAIT_MS", config_float),
+    "inference_concurrency": ("INFERENCE_CONCURRENCY", config_int),
+    "workers": ("SERVER_WORKERS", config_int),
+    "server": ("SERVER_MODE", config_choice("flask", "asgi")),
+    "uds": ("SERVER_UDS", str),
+    "uds_mode": ("SERVER_UDS_MODE", parse_socket_mode),
+    "warmup": ("WARMUP", config_bool),
+    "server_timing": ("SERVER_TIMING", config_bool),
+    "timing_log_sample_rate": ("TIMING_LOG_SAMPLE_RATE", config_float),
+    "allowed_models": ("ALLOWED_MODELS", parse_models),
+    "multi_model": ("MULTI_MODEL", config_bool),
+    "model_memory_budget_mb": ("MODEL_MEMORY_BUDGET_MB", config_float),
+    "max_loaded_models": ("MAX_LOADED_MODELS", config_int),
+    "intra_op_threads": ("ORT_INTRA_OP_THREADS", config_threads),
+    "inter_op_threads": ("ORT_INTER_OP_THREADS", config_int),
+    "execution_mode": ("ORT_EXECUTION_MODE", config_choice("sequential", "parallel")),
+    "spin_wait": ("ORT_ALLOW_SPINNING", config_bool),
+    "io_binding": ("ORT_IO_BINDING", config_bool),
+    "optimized_model_cache": ("ORT_OPTIMIZED_MODEL_CACHE", config_bool),
+    "rate_limit_strategy": (
+        "RATE_LIMIT_STRATEGY",
+        config_choice("fixed-window", "gcra"),
+    ),
+    "rate_limit_state_file": ("RATE_LIMIT_STATE_FILE", str),
+}
+
+
+def parse_engine_config(config: Dict) -> Dict[str, Any]:
+    """Parse the engine settings of a deployment config.
+
+    Args:
+        config: Deployment config, as JSON; unset (None) keys are skipped
+
+    Returns:
+        Engine attribute names mapped to their parsed values
+
+    Raises:
+        ValueError: If a value cannot be parsed, naming the config key
+    """
+    settings = {}
+    for key, (attribute, parse) in ENGINE_CONFIG_KEYS.items():
+        if config.get(key) is None:
+            continue
+        try:
+            settings[attribute] = parse(config[key])
+        except ValueError as e:
+            raise ValueError(f"Invalid deployment config '{key}': {e}")
+    return settings
+
+
+def apply_engine_config(engine: TursiEngine, config: Dict) -> None:
+    """Override engine settings with values from a deployment config.
+
+    Raises:
+        ValueError: If a value cannot be parsed
+    """
+    for attribute, value in parse_engine_config(config).items():
+        setattr(engine, attribute, value)
 
 
 class ModelProcess:
@@ -53,26 +181,28 @@ class ModelProcess:
         """Run the model in a separate process."""
         try:
             engine = TursiEngine()
-            app = engine.create_app(
+            apply_engine_config(engine, self.config)
+            if engine.MULTI_MODEL:
+                create_app = engine.create_multi_model_app
+            elif engine.SERVER_MODE == "asgi":
+                create_app = engine.create_asgi_app
+            else:
+                create_app = engine.create_app
+            app = create_app(
                 model_name=self.model_name, rate_limit=self.config.get("rate_limit")
             )
 
-            # Run the Flask app with the stop event
-            from werkzeug.serving import make_server
-
-            server = make_server(self.host, self.port, app)
-
-            # Run server in a separate thread so we can check the stop event
-            server_thread = threading.Thread(target=server.serve_forever)
-            server_thread.start()
-
-            # Wait for stop event
-            while not stop_event.is_set():
-                time.sleep(1)
-
-            # Cleanup
-            server.shutdown()
-            server_thread.join()
+            # Serve until the stop event is set
+            serve(
+                app,
+                self.host,
+                self.port,
+                workers=engine.SERVER_WORKERS,
+                mode=engine.SERVER_MODE,
+                should_stop=stop_event.is_set,
+                uds=engine.SERVER_UDS,
+                uds_mode=parse_socket_mode(engine.SERVER_UDS_MODE),
+            )
 
         except Exception as e:
             logging.error(f"Error in model process: {e}")
@@ -91,6 +221,8 @@ class TursiDaemon:
         db_path: Optional[str] = None,
         api_host: str = "localhost",
         api_port: int = 5000,
+        api_uds: Optional[str] = None,
+        api_uds_mode: str = "660",
     ):
         self.pid_file = pid_file
         self.is_running = False
@@ -98,6 +230,8 @@ class TursiDaemon:
         self.db = TursiDB(db_path)
         self.api_host = api_host
         self.api_port = api_port
+        self.api_uds = api_uds
+        self.api_uds_mode = parse_socket_mode(api_uds_mode)
         self.api_server = None
         self.api_thread = None
 
@@ -261,10 +395,17 @@ class TursiDaemon:
         """Start the API server in a separate thread."""
         self.api_server = TursiAPI(self.db)
         self.api_thread = threading.Thread(
-            target=self.api_server.run, args=(self.api_host, self.api_port), daemon=True
+            target=self.api_server.run,
+            args=(self.api_host, self.api_port, self.api_uds, self.api_uds_mode),
+            daemon=True,
         )
         self.api_thread.start()
-        self.logger.info(f"API server started on {self.api_host}:{self.api_port}")
+        address = (
+            f"unix:{self.api_uds}"
+            if self.api_uds
+            else f"{self.api_host}:{self.api_port}"
+        )
+        self.logger.info(f"API server started on {address}")
 
     def start(self) -> None:
         """Start the daemon process."""
@@ -444,10 +585,23 @@ def main():
         "--pid-file", default="/tmp/tursid.pid", help="Path to PID file"
     )
     parser.add_argument("--db-path", help="Path to SQLite database file")
+    parser.add_argument(
+        "--api-uds", help="Serve the API on a Unix domain socket instead of TCP"
+    )
+    parser.add_argument(
+        "--api-uds-mode",
+        default="660",
+        help="Octal file mode of the API socket, deciding who may connect",
+    )
 
     args = parser.parse_args()
 
-    daemon = TursiDaemon(pid_file=args.pid_file, db_path=args.db_path)
+    daemon = TursiDaemon(
+        pid_file=args.pid_file,
+        db_path=args.db_path,
+        api_uds=args.api_uds,
+        api_uds_mode=args.api_uds_mode,
+    )
 
     if args.action == "start":
         daemon.start()
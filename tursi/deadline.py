@@ -0,0 +1,72 @@
+"""Per-request deadlines, so work for clients that gave up is dropped."""
+
+import math
+import time
+from typing import Any, Optional
+
+# Request header carrying an absolute deadline, in Unix seconds
+DEADLINE_HEADER = "X-Request-Deadline"
+
+# Request body field carrying a timeout relative to arrival
+TIMEOUT_FIELD = "timeout_ms"
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request's deadline passes before its work is done."""
+
+    def __init__(self, stage: str):
+        """Initialize the error.
+
+        Args:
+            stage: Where the request was dropped: ``arrival``, ``queue``,
+                ``batch``, ``inference`` or ``decode``
+        """
+        super().__init__(f"Deadline exceeded ({stage})")
+        self.stage = stage
+
+
+def parse_deadline(
+    header: Optional[str] = None, timeout_ms: Any = None
+) -> Optional[float]:
+    """Combine a deadline header and a timeout field into one deadline.
+
+    The header is an absolute Unix time in seconds, so a deadline can be
+    passed along a chain of services; ``timeout_ms`` counts from now. When
+    both are given the earlier one applies.
+
+    Returns:
+        Deadline on the ``time.monotonic`` clock, or None if there is none
+
+    Raises:
+        ValueError: If a value is not a finite, non-negative number
+    """
+    deadlines = []
+    if header is not None:
+        try:
+            at = float(header)
+        except ValueError:
+            raise ValueError(f"{DEADLINE_HEADER} must be a Unix time in seconds")
+        if not math.isfinite(at):
+            raise ValueError(f"{DEADLINE_HEADER} must be a Unix time in seconds")
+        deadlines.append(time.monotonic() + at - time.time())
+    if timeout_ms is not None:
+        if (
+            isinstance(timeout_ms, bool)
+            or not isinstance(timeout_ms, (int, float))
+            or not math.isfinite(timeout_ms)
+            or timeout_ms < 0
+        ):
+            raise ValueError(f"'{TIMEOUT_FIELD}' must be a non-negative number")
+        deadlines.append(time.monotonic() + timeout_ms / 1000.0)
+    return min(deadlines) if deadlines else None
+
+
+def expired(deadline: Optional[float]) -> bool:
+    """Check whether a deadline from ``parse_deadline`` has passed."""
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def check_deadline(deadline: Optional[float], stage: str) -> None:
+    """Raise ``DeadlineExceeded`` for ``stage`` if the deadline has passed."""
+    if expired(deadline):
+        raise DeadlineExceeded(stage)
@@ -1,15 +1,61 @@
 import argparse
 import os
 import logging
+import shutil
 import sys
+import time
+from contextlib import nullcontext
 from pathlib import Path
-from flask import Flask, request, jsonify
+from typing import Dict, Optional
+import numpy as np
+from flask import Flask, Response, request, jsonify
 from dotenv import load_dotenv
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-from optimum.onnxruntime import ORTModelForSequenceClassification
-from transformers import AutoTokenizer, AutoConfig
-import onnxruntime as ort
+from .admission import AdmissionController
+from .artifacts import ArtifactCache
+from .cache import PredictionCache
+from .deadline import DEADLINE_HEADER, check_deadline, expired
+from .frames import (
+    FRAME_CONTENT_TYPE,
+    FrameError,
+    decode_request,
+    encode_response,
+    is_frame,
+    wants_frame,
+)
+from .labels import LabelMap
+from .metrics import ServerMetrics, instrument_flask_app
+from .ratelimit import GcraLimiter, limit_flask_app, retry_after_header
+from .registry import ModelRegistry, parse_models
+from .service import PredictionService
+from .batching import DEFAULT_BUCKETS, MicroBatcher, parse_buckets, plan_batches
+from .runtime import (
+    OnnxClassifier,
+    SessionSettings,
+    autotune_session_settings,
+    optimized_graph_key,
+    parse_bool,
+    synthetic_inputs,
+)
+from .quantization import (
+    EXPORTED_MODEL_FILE,
+    QUANTIZED_MODEL_FILE,
+    TextCalibrationReader,
+    calibration_data_hash,
+    iter_calibration_texts,
+    onnx_input_names,
+    quantize_dynamic_model,
+    quantize_static_model,
+)
+from .tokenization import NumpyTokenizer, load_tokenizer
+
+
+# Stages of a forward pass, as reported in metrics and Server-Timing headers
+INFERENCE_STAGES = ("tokenize", "inference", "postprocess")
+
+# Models that may be served unless ALLOWED_MODELS says otherwise
+DEFAULT_ALLOWED_MODELS = ("distilbert-base-uncased-finetuned-sst-2-english",)
 
 
 class TursiEngine:
@@ -25,14 +71,20 @@ class TursiEngine:
 
         # Security constants
         self.MAX_INPUT_LENGTH = 512  # Maximum length of input text
-        self.ALLOWED_MODELS = [
-            "distilbert-base-uncased-finetuned-sst-2-english",
-            # Add other allowed models here
-        ]
+        self.MAX_BATCH_TEXTS = 1024  # Maximum number of texts per batch request
+        self.ALLOWED_MODELS = parse_models(
+            os.getenv("ALLOWED_MODELS", ",".join(DEFAULT_ALLOWED_MODELS))
+        )
 
         # Rate limiting constants
         self.RATE_LIMIT = "100 per minute"  # Adjust based on your needs
         self.RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+        # "fixed-window" (flask_limiter, per process unless the storage is
+        # shared) or "gcra" (built-in, shared by all workers through a file)
+        self.RATE_LIMIT_STRATEGY = os.getenv("RATE_LIMIT_STRATEGY", "fixed-window")
+        self.RATE_LIMIT_STATE_FILE = os.getenv(
+            "RATE_LIMIT_STATE_FILE"
+        )  # shared GCRA state; default is private to this process and its workers
 
         # Quantization settings
         self.QUANTIZATION_MODE = os.getenv(
@@ -40,6 +92,95 @@ class TursiEngine:
         )  # dynamic or static
         self.QUANTIZATION_BITS = int(os.getenv("QUANTIZATION_BITS", "8"))  # 8 or 4 bits
 
+        # ONNX export settings (part of the artifact cache key)
+        self.MODEL_REVISION = os.getenv("MODEL_REVISION", "main")
+        onnx_opset = os.getenv("ONNX_OPSET")
+        self.ONNX_OPSET = int(onnx_opset) if onnx_opset else None
+
+        # Static quantization calibration settings
+        self.CALIBRATION_DATA = os.getenv("CALIBRATION_DATA")  # .jsonl or .txt file
+        self.CALIBRATION_METHOD = os.getenv(
+            "CALIBRATION_METHOD", "minmax"
+        )  # minmax, entropy or percentile
+        self.CALIBRATION_MAX_SAMPLES = int(os.getenv("CALIBRATION_MAX_SAMPLES", "500"))
+
+        # Micro-batching settings (a max batch size of 1 disables batching)
+        self.BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "1"))
+        self.BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", "5"))
+
+        # Rows per forward pass when scoring a list of texts
+        self.PREDICT_CHUNK_SIZE = int(os.getenv("PREDICT_CHUNK_SIZE", "32"))
+
+        # Dynamic padding: token-length buckets ("none" pads to the longest row),
+        # parsed once here; assign parsed values when overriding it
+        self.BATCH_BUCKETS = parse_buckets(
+            os.getenv("BATCH_BUCKETS", ",".join(map(str, DEFAULT_BUCKETS)))
+        )
+        # Padded tokens per forward pass, replaces PREDICT_CHUNK_SIZE when set
+        self.BATCH_MAX_TOKENS = int(os.getenv("BATCH_MAX_TOKENS", "0"))
+
+        # Prediction cache for repeated inputs (0 entries disables it)
+        self.PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "0"))
+        self.PREDICTION_CACHE_TTL = float(
+            os.getenv("PREDICTION_CACHE_TTL", "0")
+        )  # seconds, 0 never expires
+
+        # ONNX Runtime threading ("auto" benchmarks a few settings at startup)
+        self.ORT_INTRA_OP_THREADS = os.getenv("ORT_INTRA_OP_THREADS", "1")
+        self.ORT_INTER_OP_THREADS = int(os.getenv("ORT_INTER_OP_THREADS", "1"))
+        self.ORT_EXECUTION_MODE = os.getenv(
+            "ORT_EXECUTION_MODE", "sequential"
+        )  # sequential or parallel
+        self.ORT_ALLOW_SPINNING = parse_bool(os.getenv("ORT_ALLOW_SPINNING", "1"))
+        self.ORT_AUTOTUNE_SEQUENCE_LENGTH = 128  # Tokens per row when auto-tuning
+        # Run on preallocated input/output buffers bound to the session
+        self.ORT_IO_BINDING = parse_bool(os.getenv("ORT_IO_BINDING", "1"))
+        # Save the fully optimized graph so later starts skip optimization
+        self.ORT_OPTIMIZED_MODEL_CACHE = parse_bool(
+            os.getenv("ORT_OPTIMIZED_MODEL_CACHE", "1")
+        )
+        self.session_settings = {}  # Model name -> chosen SessionSettings
+
+        # Warmup: run synthetic batches at every configured shape before serving
+        self.WARMUP = parse_bool(os.getenv("WARMUP", "1"))
+        self.WARMUP_BATCH_SIZES = os.getenv("WARMUP_BATCH_SIZES")  # e.g. "1,8"
+
+        # Worker processes forked after the model is loaded (1 serves in-process)
+        self.SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "1"))
+
+        # Server implementation: "flask" (WSGI, thread per request) or "asgi"
+        self.SERVER_MODE = os.getenv("SERVER_MODE", "flask")
+        # Threads running inference for the ASGI server
+        self.ASGI_EXECUTOR_THREADS = int(os.getenv("ASGI_EXECUTOR_THREADS", "32"))
+        # Unix domain socket to listen on instead of the host and port; its
+        # file mode (octal) decides which local users may connect
+        self.SERVER_UDS = os.getenv("SERVER_UDS") or None
+        self.SERVER_UDS_MODE = os.getenv("SERVER_UDS_MODE", "660")
+
+        # Per-stage request timing: Server-Timing headers and sampled log lines
+        self.SERVER_TIMING = parse_bool(os.getenv("SERVER_TIMING", "0"))
+        self.TIMING_LOG_SAMPLE_RATE = float(
+            os.getenv("TIMING_LOG_SAMPLE_RATE", "0")
+        )  # fraction of requests, 0 disables
+
+        # Admission control: requests beyond the inference concurrency wait
+        # in a bounded queue and are shed with a 503 once it is full or slow
+        self.QUEUE_MAX_DEPTH = int(os.getenv("QUEUE_MAX_DEPTH", "0"))  # 0 is unbounded
+        self.QUEUE_MAX_WAIT_MS = float(
+            os.getenv("QUEUE_MAX_WAIT_MS", "0")
+        )  # 0 is unbounded
+        self.INFERENCE_CONCURRENCY = int(
+            os.getenv("INFERENCE_CONCURRENCY", "0")
+        )  # 0 picks one per core, or two batches when batching
+
+        # Multi-model serving: allowed models load on first request under
+        # /models/<name>/predict, least recently used ones are evicted
+        self.MULTI_MODEL = parse_bool(os.getenv("MULTI_MODEL", "0"))
+        self.MODEL_MEMORY_BUDGET_MB = float(
+            os.getenv("MODEL_MEMORY_BUDGET_MB", "0")
+        )  # 0 is unlimited
+        self.MAX_LOADED_MODELS = int(os.getenv("MAX_LOADED_MODELS", "0"))
+
         # Model storage
         self.MODEL_CACHE_DIR = Path.home() / ".tursi" / "models"
         self.setup_model_cache()
@@ -66,6 +207,8 @@ class TursiEngine:
     def check_model_compatibility(self, model_name: str) -> bool:
         """Check if the model is compatible with our system."""
         try:
+            from transformers import AutoConfig
+
             config = AutoConfig.from_pretrained(model_name)
             # Check if model architecture is supported
             supported_architectures = ["DistilBert", "Bert", "RoBERTa", "GPT2"]
@@ -77,29 +220,204 @@ class TursiEngine:
             self.logger.error(f"Error checking model compatibility: {str(e)}")
             return False
 
+    def calibration_key(self) -> str:
+        """Identify the calibration data and method used for static quantization."""
+        if not self.CALIBRATION_DATA:
+            raise ValueError(
+                "Static quantization requires a calibration dataset "
+                "(--calibration-data or CALIBRATION_DATA)"
+            )
+        data_hash = calibration_data_hash(Path(self.CALIBRATION_DATA))
+        return f"{self.CALIBRATION_METHOD}-{self.CALIBRATION_MAX_SAMPLES}-{data_hash}"
+
+    def artifact_cache(self) -> ArtifactCache:
+        """Get the cache of exported and quantized ONNX models."""
+        return ArtifactCache(self.MODEL_CACHE_DIR / "onnx")
+
+    def exported_model_dir(self, model_name: str) -> Path:
+        """Get the cache directory for a model's fp32 ONNX export."""
+        return self.artifact_cache().entry_dir(
+            model_name,
+            "export",
+            revision=self.MODEL_REVISION,
+            opset=self.ONNX_OPSET,
+        )
+
+    def quantized_model_dir(self, model_name: str) -> Path:
+        """Get the cache directory for a model's quantized ONNX artifact."""
+        calibration = (
+            self.calibration_key() if self.QUANTIZATION_MODE == "static" else None
+        )
+        return self.artifact_cache().entry_dir(
+            model_name,
+            f"{self.QUANTIZATION_MODE}-{self.QUANTIZATION_BITS}bit",
+            revision=self.MODEL_REVISION,
+            opset=self.ONNX_OPSET,
+            calibration=calibration,
+        )
+
+    def calibration_table_path(self, model_name: str) -> Path:
+        """Get the cache path of a model's static calibration table."""
+        model_dir = model_name.strip("/").replace("/", "--")
+        export_key = self.exported_model_dir(model_name).name
+        return (
+            self.MODEL_CACHE_DIR
+            / "calibration"
+            / model_dir
+            / f"{export_key}-{self.calibration_key()}.json"
+        )
+
+    def export_model(self, model_name: str) -> Path:
+        """Export a model to ONNX once and keep the result in the model cache."""
+        cache = self.artifact_cache()
+        export_dir = self.exported_model_dir(model_name)
+        if cache.lookup(export_dir) is not None:
+            self.logger.info(f"Using cached ONNX export: {export_dir}")
+            return export_dir
+
+        from optimum.exporters.onnx import main_export
+
+        scratch = cache.scratch_dir(export_dir)
+        try:
+            self.logger.info(f"Exporting {model_name} to ONNX...")
+            main_export(
+                model_name,
+                scratch,
+                task="text-classification",
+                opset=self.ONNX_OPSET,
+                revision=self.MODEL_REVISION,
+                cache_dir=str(self.MODEL_CACHE_DIR),
+            )
+        except Exception:
+            cache.discard(scratch)
+            raise
+
+        cache.publish(
+            scratch,
+            export_dir,
+            {
+                "model": model_name,
+                "revision": self.MODEL_REVISION,
+                "opset": self.ONNX_OPSET,
+            },
+        )
+        return export_dir
+
+    def build_quantized_model(self, model_name: str, tokenizer) -> Path:
+        """Quantize a model's ONNX export into the model cache."""
+        cache = self.artifact_cache()
+        target_dir = self.quantized_model_dir(model_name)
+        if cache.lookup(target_dir) is not None:
+            self.logger.info(f"Using cached quantized model: {target_dir}")
+            return target_dir
+
+        if self.QUANTIZATION_MODE == "static" and self.QUANTIZATION_BITS != 8:
+            raise ValueError("Static quantization only supports 8 bits")
+
+        export_dir = self.export_model(model_name)
+        exported_model = export_dir / EXPORTED_MODEL_FILE
+        scratch = cache.scratch_dir(target_dir)
+        try:
+            if self.QUANTIZATION_MODE == "static":
+                texts = iter_calibration_texts(
+                    Path(self.CALIBRATION_DATA), self.CALIBRATION_MAX_SAMPLES
+                )
+                reader = TextCalibrationReader(
+                    texts, tokenizer, onnx_input_names(exported_model)
+                )
+                quantize_static_model(
+                    exported_model,
+                    scratch / QUANTIZED_MODEL_FILE,
+                    reader,
+                    method=self.CALIBRATION_METHOD,
+                    calibration_cache=self.calibration_table_path(model_name),
+                )
+            else:
+                quantize_dynamic_model(
+                    exported_model,
+                    scratch / QUANTIZED_MODEL_FILE,
+                    bits=self.QUANTIZATION_BITS,
+                )
+            shutil.copy(export_dir / "config.json", scratch / "config.json")
+        except Exception:
+            cache.discard(scratch)
+            raise
+
+        cache.publish(
+            scratch,
+            target_dir,
+            {
+                "model": model_name,
+                "revision": self.MODEL_REVISION,
+                "opset": self.ONNX_OPSET,
+                "quantization": {
+                    "mode": self.QUANTIZATION_MODE,
+                    "bits": self.QUANTIZATION_BITS,
+                },
+                "source": export_dir.name,
+            },
+        )
+        return target_dir
+
+    def optimized_model_path(self, model_path: Path) -> Optional[Path]:
+        """Get the cache file of a model's optimized graph, None if disabled.
+
+        The graph is saved next to the model, under a name keyed by the ONNX
+        Runtime version and the CPU, so upgrading either re-optimizes.
+        """
+        if not self.ORT_OPTIMIZED_MODEL_CACHE:
+            return None
+        key = ArtifactCache.cache_key(**optimized_graph_key())
+        return model_path.with_name(f"{model_path.stem}.optimized-{key}.onnx")
+
+    def resolve_session_settings(self, model_path: Path) -> SessionSettings:
+        """Resolve ONNX Runtime threading settings, auto-tuning if requested."""
+        auto = str(self.ORT_INTRA_OP_THREADS).strip().lower() == "auto"
+        settings = SessionSettings(
+            intra_op_threads=0 if auto else int(self.ORT_INTRA_OP_THREADS),
+            inter_op_threads=int(self.ORT_INTER_OP_THREADS),
+            execution_mode=self.ORT_EXECUTION_MODE,
+            allow_spinning=parse_bool(self.ORT_ALLOW_SPINNING),
+        )
+        settings.validate()
+        if not auto:
+            return settings
+
+        # Benchmark against the batch shapes the server will actually run
+        length = self.ORT_AUTOTUNE_SEQUENCE_LENGTH
+        shapes = sorted({(1, length), (max(1, self.BATCH_MAX_SIZE), length)})
+        self.logger.info(f"Auto-tuning ONNX Runtime threading for shapes {shapes}...")
+        settings, _ = autotune_session_settings(model_path, shapes, base=settings)
+        return settings
+
     def load_quantized_model(self, model_name: str):
         """Load a quantized model using ONNX Runtime."""
         try:
             self.logger.info(f"Loading quantized model: {model_name}...")
 
-            # Load tokenizer
-            tokenizer = AutoTokenizer.from_pretrained(
-                model_name, cache_dir=self.MODEL_CACHE_DIR
-            )
+            # Export once; later starts load the cached graph and tokenizer
+            export_dir = self.export_model(model_name)
+
+            # Load a NumPy tokenizer so serving does not need torch
+            tokenizer = load_tokenizer(export_dir)
+
+            # Build the quantized model on first use
+            model_dir = self.build_quantized_model(model_name, tokenizer)
 
             # Configure ONNX Runtime session options
-            session_options = ort.SessionOptions()
-            session_options.graph_optimization_level = (
-                ort.GraphOptimizationLevel.ORT_ENABLE_ALL
-            )
-            session_options.intra_op_num_threads = 1
+            settings = self.resolve_session_settings(model_dir / QUANTIZED_MODEL_FILE)
+            self.session_settings[model_name] = settings
+            self.logger.info(f"ONNX Runtime session settings: {settings.to_dict()}")
 
-            # Load model with quantization
-            model = ORTModelForSequenceClassification.from_pretrained(
-                model_name,
-                export=True,
-                session_options=session_options,
-                cache_dir=self.MODEL_CACHE_DIR,
+            # Load the quantized model straight into ONNX Runtime
+            model = OnnxClassifier(
+                model_dir / QUANTIZED_MODEL_FILE,
+                settings.session_options(),
+                label_map=LabelMap.from_config(model_dir / "config.json"),
+                io_binding=self.ORT_IO_BINDING,
+                optimized_model_path=self.optimized_model_path(
+                    model_dir / QUANTIZED_MODEL_FILE
+                ),
             )
 
             self.logger.info(
@@ -116,6 +434,8 @@ class TursiEngine:
         """Download model and tokenizer files."""
         try:
             self.logger.info(f"Downloading model: {model_name}")
+            from transformers import AutoConfig, AutoTokenizer
+
             AutoTokenizer.from_pretrained(model_name, cache_dir=self.MODEL_CACHE_DIR)
             AutoConfig.from_pretrained(model_name, cache_dir=self.MODEL_CACHE_DIR)
             return True
@@ -123,11 +443,328 @@ class TursiEngine:
             self.logger.error(f"Failed to download model: {str(e)}")
             return False
 
-    def create_app(self, model_name: str, rate_limit: str = None):
-        """Create and configure the Flask application."""
-        if rate_limit is None:
-            rate_limit = self.RATE_LIMIT
+    @staticmethod
+    def label_map(model) -> LabelMap:
+        """Labels of a loaded model; models without any get the sentiment labels."""
+        label_map = getattr(model, "label_map", None)
+        return label_map if isinstance(label_map, LabelMap) else LabelMap()
+
+    def postprocess(self, logits, label_map: LabelMap = None, top_k=1) -> list:
+        """Turn classifier logits into labels and scores.
+
+        Args:
+            logits: Logits matrix of shape (rows, classes)
+            label_map: Labels of the model; defaults to the sentiment labels
+            top_k: Number of labels to return, for all rows or per row
+
+        Returns:
+            One prediction per row
+        """
+        if label_map is None:
+            label_map = LabelMap()
+        return label_map.postprocess(logits, top_k)
+
+    def predict_batch(
+        self,
+        model,
+        tokenizer,
+        texts: list,
+        metrics=None,
+        timers=(),
+        top_k=1,
+        deadline: Optional[float] = None,
+    ) -> list:
+        """Classify a list of texts, grouping rows of similar length.
+
+        Args:
+            model: Loaded model
+            tokenizer: Tokenizer matching the model
+            texts: Texts to classify
+            metrics: Optional ServerMetrics recording stage timings, batch
+                sizes and token counts
+            timers: RequestTimers of the requests in the batch, each given
+                the batch's stage timings
+            top_k: Number of labels to return, for all texts or per text
+            deadline: Monotonic deadline; remaining forward passes are
+                skipped once it passes
+
+        Returns:
+            One prediction per text, in order
+
+        Raises:
+            DeadlineExceeded: If the deadline passes before all texts ran
+        """
+        check_deadline(deadline, "inference")
+        if not isinstance(tokenizer, NumpyTokenizer):
+            return self._predict_padded(model, tokenizer, texts, metrics, timers, top_k)
+
+        label_map = self.label_map(model)
+        top_ks = [top_k] * len(texts) if isinstance(top_k, int) else top_k
+
+        # Tokenize all inputs in one call, then pad each batch separately
+        started = time.perf_counter()
+        encodings = tokenizer.encode(texts)
+        lengths = [len(encoding.ids) for encoding in encodings]
+        if self.uses_io_binding(model):
+            # Bound buffers are pooled per shape, so pad to bucket boundaries
+            padded_lengths = [
+                self.bucket_length(n, tokenizer.max_length) for n in lengths
+            ]
+        else:
+            padded_lengths = lengths
+        batches = plan_batches(
+            padded_lengths,
+            buckets=self.BATCH_BUCKETS,
+            max_items=max(1, self.PREDICT_CHUNK_SIZE),
+            max_tokens=self.BATCH_MAX_TOKENS,
+        )
+        timings = [time.perf_counter() - started, 0.0, 0.0]
+
+        results = [None] * len(texts)
+        for rows in batches:
+            check_deadline(deadline, "inference")
+            start = time.perf_counter()
+            length = max(padded_lengths[i] for i in rows)
+            with self.input_buffers(model, len(rows), length) as buffers:
+                # Pad straight into the model's bound input buffers if it has any
+                inputs = tokenizer.pad(
+                    [encodings[i] for i in rows],
+                    length,
+                    out=buffers.inputs if buffers is not None else None,
+                )
+                padded = time.perf_counter()
+                logits = buffers.run() if buffers is not None else model(**inputs)
+                inferred = time.perf_counter()
+                predictions = self.postprocess(
+                    logits, label_map, [top_ks[i] for i in rows]
+                )
+            for i, result in zip(rows, predictions):
+                results[i] = result
+            timings[0] += padded - start
+            timings[1] += inferred - padded
+            timings[2] += time.perf_counter() - inferred
+
+        for timer in timers:
+            for stage, seconds in zip(INFERENCE_STAGES, timings):
+                timer.add(stage, seconds)
+        if metrics is not None:
+            self._record_inference(
+                metrics, timings, [len(rows) for rows in batches], sum(lengths)
+            )
+        return results
+
+    @staticmethod
+    def uses_io_binding(model) -> bool:
+        """Check whether a model runs its forward passes on bound buffers."""
+        return isinstance(model, OnnxClassifier) and model.io_binding
+
+    def bucket_length(self, length: int, max_length: int) -> int:
+        """Sequence length a row of ``length`` tokens is padded to in its bucket.
+
+        That is the smallest bucket boundary that fits the row, capped at the
+        tokenizer's ``max_length``; rows longer than every boundary (or all
+        rows, without buckets) are padded to ``max_length``.
+        """
+        boundary = next((b for b in self.BATCH_BUCKETS if length <= b), max_length)
+        return max(min(boundary, max_length), length)
+
+    @classmethod
+    def input_buffers(cls, model, batch_size: int, sequence_length: int):
+        """Check out a model's preallocated I/O buffers for one forward pass.
+
+        Returns a context manager yielding the buffers, or None for models
+        that do not run with I/O binding.
+        """
+        if cls.uses_io_binding(model):
+            return model.buffers(batch_size, sequence_length)
+        return nullcontext()
+
+    def _predict_padded(
+        self, model, tokenizer, texts: list, metrics=None, timers=(), top_k=1
+    ) -> list:
+        """Classify texts padded to the longest one, in chunks of rows."""
+        label_map = self.label_map(model)
+        top_ks = [top_k] * len(texts) if isinstance(top_k, int) else top_k
+
+        # Tokenize all inputs in one call
+        started = time.perf_counter()
+        inputs = tokenizer(texts, return_tensors="np", padding=True, truncation=True)
+        timings = [time.perf_counter() - started, 0.0, 0.0]
+
+        chunk_size = max(1, self.PREDICT_CHUNK_SIZE)
+        results = []
+        for start in range(0, len(texts), chunk_size):
+            chunk = {k: v[start : start + chunk_size] for k, v in inputs.items()}
+
+            # Run inference
+            before = time.perf_counter()
+            logits = model(**chunk)
+            inferred = time.perf_counter()
+            results.extend(
+                self.postprocess(logits, label_map, top_ks[start : start + chunk_size])
+            )
+            timings[1] += inferred - before
+            timings[2] += time.perf_counter() - inferred
+
+        for timer in timers:
+            for stage, seconds in zip(INFERENCE_STAGES, timings):
+                timer.add(stage, seconds)
+        if metrics is not None:
+            mask = inputs.get("attention_mask", inputs["input_ids"])
+            self._record_inference(
+                metrics,
+                timings,
+                [
+                    min(chunk_size, len(texts) - start)
+                    for start in range(0, len(texts), chunk_size)
+                ],
+                int(np.count_nonzero(mask)),
+            )
+        return results
+
+    @staticmethod
+    def _record_inference(metrics, timings, batch_sizes, tokens) -> None:
+        """Record the stage timings, batch sizes and tokens of a batch."""
+        for stage, seconds in zip(INFERENCE_STAGES, timings):
+            metrics.observe_stage(stage, seconds)
+        for size in batch_sizes:
+            metrics.batch_size.observe(size)
+        metrics.tokens.inc(amount=tokens)
+
+    def warmup_shapes(self, tokenizer) -> list:
+        """List the (batch size, sequence length) shapes run during warmup.
+
+        These are the shapes ``predict_batch`` pads to: every bucket length
+        and the overflow length (see ``bucket_length``), at every row count
+        a micro-batch of single texts can have and at full chunks.
+        """
+        if self.WARMUP_BATCH_SIZES:
+            batch_sizes = parse_buckets(self.WARMUP_BATCH_SIZES)
+        else:
+            chunk = max(1, self.PREDICT_CHUNK_SIZE)
+            batch_sizes = sorted(
+                {*range(1, min(max(1, self.BATCH_MAX_SIZE), chunk) + 1), chunk}
+            )
+        max_length = getattr(tokenizer, "max_length", None)
+        if not isinstance(max_length, int):
+            max_length = self.MAX_INPUT_LENGTH
+        lengths = sorted(
+            {min(b, max_length) for b in self.BATCH_BUCKETS} | {max_length}
+        )
+
+        shapes = []
+        for length in lengths:
+            for batch_size in batch_sizes:
+                # Batches never exceed the padded token budget
+                if self.BATCH_MAX_TOKENS > 0 and batch_size * length > max(
+                    self.BATCH_MAX_TOKENS, length
+                ):
+                    continue
+                shapes.append((batch_size, length))
+        return shapes
+
+    def warmup(self, model, tokenizer) -> dict:
+        """Run synthetic inputs through the model at every serving shape.
+
+        Pays for ONNX Runtime's lazy allocations, arena growth and tokenizer
+        initialization before the first real request.
+
+        Returns:
+            Number of shapes run and the total warmup time in milliseconds
+        """
+        start = time.perf_counter()
+        shapes = self.warmup_shapes(tokenizer)
+        input_names = ["input_ids", "attention_mask", "token_type_ids"]
+        for batch_size, length in shapes:
+            model(**synthetic_inputs(input_names, batch_size, length))
+        # Exercise tokenization and post-processing too
+        self.predict_batch(model, tokenizer, ["warmup"])
 
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+        self.logger.info(f"Warmed up {len(shapes)} shapes in {elapsed_ms} ms")
+        return {"shapes": len(shapes), "duration_ms": elapsed_ms}
+
+    def create_batcher(self, model, tokenizer, metrics=None):
+        """Create a micro-batcher for the model, or None if batching is disabled."""
+        if self.BATCH_MAX_SIZE <= 1:
+            return None
+        self.logger.info(
+            f"Micro-batching enabled: up to {self.BATCH_MAX_SIZE} requests "
+            f"or {self.BATCH_MAX_WAIT_MS} ms per batch"
+        )
+        return MicroBatcher(
+            lambda items: self.predict_batch(
+                model,
+                tokenizer,
+                [text for text, _, _, _ in items],
+                metrics,
+                [timer for _, timer, _, _ in items if timer is not None],
+                [top_k for _, _, top_k, _ in items],
+            ),
+            max_batch_size=self.BATCH_MAX_SIZE,
+            max_wait_ms=self.BATCH_MAX_WAIT_MS,
+            expired=lambda item: expired(item[3]),
+        )
+
+    def create_admission_controller(self) -> Optional[AdmissionController]:
+        """Create an admission controller, or None if the queue is unbounded."""
+        if self.QUEUE_MAX_DEPTH <= 0 and self.QUEUE_MAX_WAIT_MS <= 0:
+            return None
+        concurrency = self.INFERENCE_CONCURRENCY
+        if concurrency <= 0:
+            # Let one batch fill while the previous one runs
+            batching = self.BATCH_MAX_SIZE > 1
+            concurrency = 2 * self.BATCH_MAX_SIZE if batching else os.cpu_count() or 1
+        self.logger.info(
+            f"Admission control enabled: {concurrency} concurrent requests, "
+            f"queue of {self.QUEUE_MAX_DEPTH or 'unbounded'} for at most "
+            f"{self.QUEUE_MAX_WAIT_MS or 'unbounded'} ms"
+        )
+        return AdmissionController(
+            concurrency,
+            max_queue=max(self.QUEUE_MAX_DEPTH, 0),
+            max_wait_ms=max(self.QUEUE_MAX_WAIT_MS, 0),
+        )
+
+    def prediction_cache_namespace(self, model_name: str) -> str:
+        """Identify the model artifact whose predictions may be cached together.
+
+        Includes the quantization settings and the build time of the cached
+        artifact, so results are never shared across model builds.
+        """
+        model_dir = self.quantized_model_dir(model_name)
+        manifest = self.artifact_cache().lookup(model_dir) or {}
+        return ArtifactCache.cache_key(
+            model=model_name,
+            quantization=self.QUANTIZATION_MODE,
+            bits=self.QUANTIZATION_BITS,
+            artifact=model_dir.name,
+            created_at=manifest.get("created_at"),
+        )
+
+    def create_prediction_cache(self, model_name: str):
+        """Create a prediction cache for the model, or None if disabled."""
+        if self.PREDICTION_CACHE_SIZE <= 0:
+            return None
+        self.logger.info(
+            f"Prediction cache enabled: {self.PREDICTION_CACHE_SIZE} entries, "
+            f"TTL {self.PREDICTION_CACHE_TTL or 'none'}"
+        )
+        return PredictionCache(
+            self.PREDICTION_CACHE_SIZE,
+            ttl_seconds=self.PREDICTION_CACHE_TTL,
+            namespace=self.prediction_cache_namespace(model_name),
+        )
+
+    def create_service(
+        self, model_name: str, metrics_labels: Optional[Dict[str, str]] = None
+    ) -> PredictionService:
+        """Load a model and create the request handlers shared by all servers.
+
+        Args:
+            model_name: Model to load
+            metrics_labels: Labels added to every sample of the model's metrics
+        """
         try:
             # Validate model name
             if model_name not in self.ALLOWED_MODELS:
@@ -139,6 +776,14 @@ class TursiEngine:
             # Load model with quantization
             model, tokenizer = self.load_quantized_model(model_name)
             self.logger.info("Model loaded successfully!")
+
+            metrics = ServerMetrics(metrics_labels)
+            batcher = self.create_batcher(model, tokenizer, metrics)
+            cache = self.create_prediction_cache(model_name)
+            admission = self.create_admission_controller()
+            metrics.bind_batcher(batcher)
+            metrics.bind_cache(cache)
+            metrics.bind_admission(admission)
         except ValueError as e:
             self.logger.error(f"Invalid model: {str(e)}")
             raise
@@ -146,12 +791,80 @@ class TursiEngine:
             self.logger.error(f"Failed to load model: {str(e)}")
             raise
 
+        service = PredictionService(
+            self, model_name, model, tokenizer, batcher, cache, metrics, admission
+        )
+        # Warm up before forking workers so they all start warm; otherwise in
+        # the background while /health reports "warming"
+        service.start_warmup(background=self.SERVER_WORKERS <= 1)
+        return service
+
+    def create_app(self, model_name: str, rate_limit: str = None):
+        """Create and configure the Flask application."""
+        if rate_limit is None:
+            rate_limit = self.RATE_LIMIT
+
+        service = self.create_service(model_name)
+
         app = Flask(__name__)
 
         # Store rate limit in app config
         app.config["RATE_LIMIT"] = rate_limit
+        app.service = service
+
+        # Instrument first so requests rejected by the limiter are counted
+        metrics_view = instrument_flask_app(app, service.metrics)
+
+        # Scrapes must not use up the clients' rate limit
+        limit = self._limit_app(app, rate_limit, exempt=[metrics_view])
+
+        @app.route("/predict", methods=["POST"])
+        @limit
+        def predict():
+            return self._flask_predict(service)
+
+        @app.route("/health", methods=["GET"])
+        def health_check():
+            """Health check endpoint."""
+            body, status = service.health()
+            return jsonify(body), status
+
+        return app
+
+    def create_rate_limiter(self, rate_limit: str) -> Optional[GcraLimiter]:
+        """Create the built-in limiter if ``RATE_LIMIT_STRATEGY`` is ``gcra``.
+
+        Its state is shared by the worker processes and, with
+        ``RATE_LIMIT_STATE_FILE`` set, by every server using the same file.
+
+        Returns:
+            The limiter, or None for flask_limiter's fixed window
+
+        Raises:
+            ValueError: If the strategy is unknown
+        """
+        if self.RATE_LIMIT_STRATEGY == "gcra":
+            return GcraLimiter(rate_limit, path=self.RATE_LIMIT_STATE_FILE or None)
+        if self.RATE_LIMIT_STRATEGY != "fixed-window":
+            raise ValueError(f"Unknown rate limit strategy: {self.RATE_LIMIT_STRATEGY}")
+        return None
+
+    def _limit_app(self, app: Flask, rate_limit: str, exempt=()):
+        """Rate limit every route of a Flask app with ``RATE_LIMIT_STRATEGY``.
+
+        Args:
+            app: Flask application
+            rate_limit: Rate limit per client
+            exempt: View functions that are not limited
+
+        Returns:
+            Decorator applying the limit to a route
+        """
+        gcra = self.create_rate_limiter(rate_limit)
+        if gcra is not None:
+            limit_flask_app(app, gcra, exempt=exempt)
+            return lambda view: view
 
-        # Initialize rate limiter
         limiter = Limiter(
             app=app,
             key_func=get_remote_address,
@@ -159,72 +872,167 @@ class TursiEngine:
             default_limits=[rate_limit],
             strategy="fixed-window",
         )
+        for view in exempt:
+            limiter.exempt(view)
+        return limiter.limit(rate_limit)
 
-        @app.route("/predict", methods=["POST"])
-        @limiter.limit(rate_limit)
-        def predict():
-            try:
-                if not request.is_json:
-                    return jsonify({"error": "Request must be JSON"}), 400
-
-                data = request.get_json()
-                if not data or "text" not in data:
-                    return jsonify({"error": "Missing 'text' field in request"}), 400
-
-                text = data.get("text", "")
-
-                # Validate input
-                if not self.validate_input(text):
-                    return (
-                        jsonify(
-                            {
-                                "error": (
-                                    "Invalid input. Text must be a string of maximum "
-                                    "length 512 characters."
-                                )
-                            }
-                        ),
-                        400,
-                    )
-
-                # Tokenize input
-                inputs = tokenizer(
-                    text, return_tensors="pt", padding=True, truncation=True
-                )
+    def _flask_predict(self, service: PredictionService):
+        """Handle a Flask ``/predict`` request with a model's service.
 
-                # Run inference
-                outputs = model(**inputs)
-                predictions = outputs.logits.softmax(dim=-1)
+        Bodies may be JSON or binary frames; successful responses use the
+        encoding the client accepts, errors are always JSON.
+        """
+        frame = is_frame(request.content_type or "")
+        try:
+            if not (frame or request.is_json):
+                return jsonify({"error": "Request must be JSON"}), 400
+            timer = service.start_timer()
+            parse_started = time.perf_counter()
+            data = decode_request(request.get_data()) if frame else request.get_json()
+            if timer is not None:
+                timer.add("parse", time.perf_counter() - parse_started)
+        except FrameError as e:
+            return jsonify({"error": f"Invalid frame: {e}"}), 400
+        except Exception as e:
+            self.logger.error(f"Error during prediction: {str(e)}")
+            return jsonify({"error": "Internal server error"}), 500
 
-                # Get prediction
-                label = (
-                    "POSITIVE" if predictions[0][1] > predictions[0][0] else "NEGATIVE"
-                )
-                score = float(
-                    predictions[0][1] if label == "POSITIVE" else predictions[0][0]
-                )
+        body, status = service.predict(
+            data, timer, request.headers.get(DEADLINE_HEADER)
+        )
+        encode = (
+            self._frame_response
+            if status == 200 and wants_frame(request.headers.get("Accept", ""), frame)
+            else jsonify
+        )
+        if timer is None:
+            response = encode(body)
+        else:
+            serialize_started = time.perf_counter()
+            response = encode(body)
+            timer.add("serialize", time.perf_counter() - serialize_started)
+            header = service.finish_timer(timer, status)
+            if header is not None:
+                response.headers["Server-Timing"] = header
+        if "retry_after" in body:
+            response.headers["Retry-After"] = retry_after_header(body["retry_after"])
+        return response, status
+
+    @staticmethod
+    def _frame_response(body) -> Response:
+        """Encode a response body as a binary frame."""
+        return Response(encode_response(body), mimetype=FRAME_CONTENT_TYPE)
+
+    @staticmethod
+    def model_memory_bytes(service: PredictionService) -> int:
+        """Estimate the memory a loaded model uses from its ONNX file size."""
+        model_path = getattr(service.model, "model_path", None)
+        if isinstance(model_path, Path) and model_path.exists():
+            return model_path.stat().st_size
+        return 0
+
+    def create_model_registry(self) -> ModelRegistry:
+        """Create a registry loading services for the allowed models on demand."""
+        return ModelRegistry(
+            lambda name: self.create_service(name, metrics_labels={"model": name}),
+            memory_budget_bytes=int(self.MODEL_MEMORY_BUDGET_MB * 1024 * 1024),
+            max_models=self.MAX_LOADED_MODELS,
+            size_of=self.model_memory_bytes,
+            unload=PredictionService.close,
+        )
+
+    def create_multi_model_app(self, model_name: str = None, rate_limit: str = None):
+        """Create a Flask application serving every allowed model.
 
-                return jsonify({"label": label, "score": score})
+        Models are addressed as ``/models/<name>/predict`` and loaded on their
+        first request; the least recently used ones are evicted once the
+        loaded models exceed ``MODEL_MEMORY_BUDGET_MB`` or
+        ``MAX_LOADED_MODELS``.
+
+        Args:
+            model_name: Optional model to load before serving
+            rate_limit: Rate limit per client, shared by all models
+
+        Returns:
+            The Flask application, with its ModelRegistry as ``app.registry``
+        """
+        if self.SERVER_MODE == "asgi":
+            raise ValueError("Multi-model serving requires the flask server")
+        if rate_limit is None:
+            rate_limit = self.RATE_LIMIT
+
+        registry = self.create_model_registry()
+        if model_name is not None:
+            registry.get(model_name)
+
+        app = Flask(__name__)
+        app.config["RATE_LIMIT"] = rate_limit
+        app.registry = registry
+
+        # Instrument first so requests rejected by the limiter are counted; the
+        # loaded models' metrics are exposed with a model label
+        metrics_view = instrument_flask_app(
+            app,
+            ServerMetrics(),
+            lambda: [
+                service.metrics
+                for service in map(registry.peek, registry.loaded())
+                if service is not None
+            ],
+        )
+        limit = self._limit_app(app, rate_limit, exempt=[metrics_view])
+
+        def unknown_model(name: str):
+            return jsonify({"error": f"Model {name} is not available"}), 404
+
+        @app.route("/models/<path:name>/predict", methods=["POST"])
+        @limit
+        def predict(name):
+            if name not in self.ALLOWED_MODELS:
+                return unknown_model(name)
+            try:
+                service = registry.get(name)
             except Exception as e:
-                self.logger.error(f"Error during prediction: {str(e)}")
-                return jsonify({"error": "Internal server error"}), 500
+                self.logger.error(f"Failed to load model {name}: {str(e)}")
+                return jsonify({"error": f"Failed to load model {name}"}), 503
+            return self._flask_predict(service)
+
+        @app.route("/models/<path:name>/health", methods=["GET"])
+        def model_health(name):
+            if name not in self.ALLOWED_MODELS:
+                return unknown_model(name)
+            service = registry.peek(name)
+            if service is None:
+                return jsonify({"status": "unloaded", "model": name}), 200
+            body, status = service.health()
+            return jsonify(body), status
+
+        @app.route("/models", methods=["GET"])
+        def list_models():
+            """Allowed models with their load and eviction stats."""
+            return jsonify({"available": self.ALLOWED_MODELS, **registry.stats()})
 
         @app.route("/health", methods=["GET"])
         def health_check():
             """Health check endpoint."""
-            return jsonify(
-                {
-                    "status": "healthy",
-                    "model": model_name,
-                    "quantization": {
-                        "mode": self.QUANTIZATION_MODE,
-                        "bits": self.QUANTIZATION_BITS,
-                    },
-                }
-            )
+            return jsonify({"status": "healthy", "models": registry.stats()}), 200
 
         return app
 
+    def create_asgi_app(self, model_name: str, rate_limit: str = None):
+        """Create an ASGI application serving the same routes as ``create_app``."""
+        from .asgi import AsgiApp
+
+        if rate_limit is None:
+            rate_limit = self.RATE_LIMIT
+        return AsgiApp(
+            self.create_service(model_name),
+            rate_limit=rate_limit,
+            storage_uri=self.RATE_LIMIT_STORAGE_URI,
+            executor_threads=self.ASGI_EXECUTOR_THREADS,
+            limiter=self.create_rate_limiter(rate_limit),
+        )
+
 
 def main():
     """Main entry point for the CLI."""
@@ -0,0 +1,237 @@
+"""Compact binary encoding of prediction requests and responses.
+
+JSON parsing and serialization cost as much as quantized inference for short
+texts. Frames carry the same requests and responses as length-prefixed
+UTF-8 strings and fixed-size numbers, decoded with a few ``struct`` calls.
+
+Request frame (``application/x-tursi-frame``), little endian::
+
+    magic "TF" | version u8 | flags u8 | options u8 | texts u32
+    options x (name length u8 | name ascii | value f64)
+    texts x (length u32 | utf-8)
+
+Flag bit 0 marks a batch (``texts``) rather than a single ``text``. Options
+are the numeric request fields, such as ``top_k`` or ``timeout_ms``.
+
+Response frame::
+
+    magic "TF" | version u8 | flags u8 | items u32
+    items x (kind u8 | payload)
+
+An item is a label and its score, a ranked list of labels and scores (for
+``top_k`` > 1, prefixed with a u32 count), an error message or a generated text. Scores are float32,
+which is the precision the model computes them in.
+"""
+
+import struct
+from typing import Any, Dict, List, Sequence, Union
+
+# Media type of frames, for Content-Type and Accept headers
+FRAME_CONTENT_TYPE = "application/x-tursi-frame"
+
+MAGIC = b"TF"
+VERSION = 1
+
+# Flag of frames holding a batch of texts or results
+BATCH = 1
+
+# Kinds of response items
+KIND_LABEL = 0
+KIND_RANKED = 1
+KIND_ERROR = 2
+KIND_TEXT = 3
+
+REQUEST_HEADER = struct.Struct("<2sBBBI")  # magic, version, flags, options, texts
+RESPONSE_HEADER = struct.Struct("<2sBBI")  # magic, version, flags, items
+U8 = struct.Struct("<B")
+U16 = struct.Struct("<H")
+U32 = struct.Struct("<I")
+F32 = struct.Struct("<f")
+F64 = struct.Struct("<d")
+
+
+class FrameError(ValueError):
+    """Raised for payloads that are not valid frames."""
+
+
+def is_frame(content_type: str) -> bool:
+    """Check whether a Content-Type header denotes a frame."""
+    return content_type.split(";")[0].strip().lower() == FRAME_CONTENT_TYPE
+
+
+def wants_frame(accept: str, request_is_frame: bool) -> bool:
+    """Pick the response encoding from the Accept header.
+
+    Clients that do not ask for a media type get the one they sent.
+    """
+    if accept:
+        types = [part.split(";")[0].strip().lower() for part in accept.split(",")]
+        if FRAME_CONTENT_TYPE in types:
+            return True
+        if "application/json" in types:
+            return False
+    return request_is_frame
+
+
+def encode_request(texts: Union[str, Sequence[str]], **options: float) -> bytes:
+    """Encode a request for one text (a str) or a batch (a list of str).
+
+    Args:
+        texts: Text or texts to classify
+        **options: Numeric request fields, e.g. ``top_k=3``
+    """
+    batch = not isinstance(texts, str)
+    items = list(texts) if batch else [texts]
+    out = bytearray(
+        REQUEST_HEADER.pack(
+            MAGIC, VERSION, BATCH if batch else 0, len(options), len(items)
+        )
+    )
+    for name, value in options.items():
+        encoded = name.encode("ascii")
+        out += U8.pack(len(encoded)) + encoded + F64.pack(value)
+    for text in items:
+        encoded = text.encode("utf-8")
+        out += U32.pack(len(encoded)) + encoded
+    return bytes(out)
+
+
+def decode_request(payload: bytes, text_field: str = "text") -> Dict[str, Any]:
+    """Decode a request frame into the body a JSON request would have.
+
+    Args:
+        payload: Request body
+        text_field: Name of the text field, e.g. ``prompt``; batches use
+            the plural (``texts``)
+
+    Raises:
+        FrameError: If the payload is not a valid request frame
+    """
+    try:
+        magic, version, flags, options, count = REQUEST_HEADER.unpack_from(payload)
+        if magic != MAGIC:
+            raise FrameError("Not a tursi frame")
+        if version != VERSION:
+            raise FrameError(f"Unsupported frame version {version}")
+
+        data: Dict[str, Any] = {}
+        offset = REQUEST_HEADER.size
+        for _ in range(options):
+            size = payload[offset]
+            name = payload[offset + 1 : offset + 1 + size].decode("ascii")
+            (value,) = F64.unpack_from(payload, offset + 1 + size)
+            data[name] = int(value) if value.is_integer() else value
+            offset += 1 + size + F64.size
+
+        texts: List[str] = []
+        for _ in range(count):
+            (size,) = U32.unpack_from(payload, offset)
+            offset += U32.size
+            if offset + size > len(payload):
+                raise FrameError("Truncated frame")
+            texts.append(str(payload[offset : offset + size], "utf-8"))
+            offset += size
+    except (struct.error, IndexError):
+        raise FrameError("Truncated frame")
+    except UnicodeDecodeError:
+        raise FrameError("Frame text is not valid UTF-8")
+    if offset != len(payload):
+        raise FrameError("Unexpected data after the frame")
+
+    if flags & BATCH:
+        data[text_field + "s"] = texts
+    elif count == 1:
+        data[text_field] = texts[0]
+    elif count:
+        raise FrameError("A frame without the batch flag holds one text")
+    return data
+
+
+def encode_response(body: Dict[str, Any]) -> bytes:
+    """Encode a successful response body: a prediction, ``results`` or text."""
+    batch = "results" in body
+    items = body["results"] if batch else [body]
+    out = bytearray(
+        RESPONSE_HEADER.pack(MAGIC, VERSION, BATCH if batch else 0, len(items))
+    )
+    for item in items:
+        if "labels" in item:
+            out += U8.pack(KIND_RANKED) + U32.pack(len(item["labels"]))
+            for ranked in item["labels"]:
+                _encode_label(out, ranked["label"], ranked["score"])
+        elif "label" in item:
+            out += U8.pack(KIND_LABEL)
+            _encode_label(out, item["label"], item["score"])
+        elif "error" in item:
+            encoded = item["error"].encode("utf-8")
+            out += U8.pack(KIND_ERROR) + U32.pack(len(encoded)) + encoded
+        elif "generated_text" in item:
+            encoded = item["generated_text"].encode("utf-8")
+            out += U8.pack(KIND_TEXT) + U32.pack(len(encoded)) + encoded
+        else:
+            raise FrameError(f"Cannot encode response fields {sorted(item)}")
+    return bytes(out)
+
+
+def _encode_label(out: bytearray, label: str, score: float) -> None:
+    """Append a label and its score."""
+    encoded = str(label).encode("utf-8")
+    out += U16.pack(len(encoded)) + encoded + F32.pack(score)
+
+
+def decode_response(payload: bytes) -> Dict[str, Any]:
+    """Decode a response frame into the body a JSON response would have.
+
+    Raises:
+        FrameError: If the payload is not a valid response frame
+    """
+    try:
+        magic, version, flags, count = RESPONSE_HEADER.unpack_from(payload)
+        if magic != MAGIC:
+            raise FrameError("Not a tursi frame")
+        if version != VERSION:
+            raise FrameError(f"Unsupported frame version {version}")
+
+        offset = RESPONSE_HEADER.size
+        items = []
+        for _ in range(count):
+            kind = payload[offset]
+            offset += 1
+            if kind == KIND_LABEL:
+                label, score, offset = _decode_label(payload, offset)
+                items.append({"label": label, "score": score})
+            elif kind == KIND_RANKED:
+                (count_ranked,) = U32.unpack_from(payload, offset)
+                offset += U32.size
+                ranked = []
+                for _ in range(count_ranked):
+                    label, score, offset = _decode_label(payload, offset)
+                    ranked.append({"label": label, "score": score})
+                items.append(dict(ranked[0], labels=ranked))
+            elif kind in (KIND_ERROR, KIND_TEXT):
+                (size,) = U32.unpack_from(payload, offset)
+                offset += U32.size
+                text = str(payload[offset : offset + size], "utf-8")
+                offset += size
+                items.append(
+                    {"error" if kind == KIND_ERROR else "generated_text": text}
+                )
+            else:
+                raise FrameError(f"Unknown response item kind {kind}")
+    except (struct.error, IndexError):
+        raise FrameError("Truncated frame")
+    except UnicodeDecodeError:
+        raise FrameError("Frame text is not valid UTF-8")
+    if offset != len(payload):
+        raise FrameError("Unexpected data after the frame")
+    return {"results": items} if flags & BATCH else items[0]
+
+
+def _decode_label(payload: bytes, offset: int):
+    """Read a label and its score; returns them and the next offset."""
+    (size,) = U16.unpack_from(payload, offset)
+    offset += U16.size
+    label = str(payload[offset : offset + size], "utf-8")
+    offset += size
+    (score,) = F32.unpack_from(payload, offset)
+    return label, score, offset + F32.size
@@ -0,0 +1,140 @@
+"""Vectorized post-processing of classifier logits into labels and scores."""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+import numpy as np
+from .runtime import sigmoid, softmax
+
+# Labels of binary sentiment models whose config does not name them
+DEFAULT_LABELS = ("NEGATIVE", "POSITIVE")
+
+# Transformers problem type whose classes are scored independently
+MULTI_LABEL_PROBLEM_TYPE = "multi_label_classification"
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Find the indices of the k highest scores of every row, best first.
+
+    Uses a partial partition, so only the k selected columns are sorted.
+
+    Args:
+        scores: Score matrix of shape (rows, classes)
+        k: Number of indices per row, at most the number of classes
+
+    Returns:
+        Index matrix of shape (rows, k)
+    """
+    if k < scores.shape[1]:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=1), axis=1)
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+class LabelMap:
+    """Names of a classifier's output classes and how to score them.
+
+    Single-label models are scored with a softmax over the classes,
+    multi-label models with an independent sigmoid per class.
+    """
+
+    def __init__(self, labels: Sequence[str] = DEFAULT_LABELS, multi_label=False):
+        """Initialize the label map.
+
+        Args:
+            labels: Class names, indexed by output column
+            multi_label: Score classes independently instead of exclusively
+        """
+        self.labels = list(labels)
+        self.multi_label = multi_label
+        self._names = np.array(self.labels, dtype=object)
+
+    @classmethod
+    def from_config(cls, config_path: Path) -> "LabelMap":
+        """Read the labels of a model from its Transformers ``config.json``.
+
+        Falls back to the binary sentiment labels if the file does not exist
+        or does not name the labels.
+        """
+        config_path = Path(config_path)
+        if not config_path.exists():
+            return cls()
+        with open(config_path) as f:
+            config = json.load(f)
+
+        id2label = config.get("id2label") or {}
+        labels = [
+            label for _, label in sorted((int(i), v) for i, v in id2label.items())
+        ]
+        # Binary models with generic LABEL_0/LABEL_1 names keep the
+        # sentiment labels the engine has always returned
+        if labels in ([], ["LABEL_0", "LABEL_1"]):
+            labels = list(DEFAULT_LABELS)
+        return cls(
+            labels, multi_label=config.get("problem_type") == MULTI_LABEL_PROBLEM_TYPE
+        )
+
+    def names(self, num_classes: int) -> np.ndarray:
+        """Class names of a model with ``num_classes`` outputs."""
+        if num_classes == len(self.labels):
+            return self._names
+        names = self.labels[:num_classes] + [
+            f"LABEL_{i}" for i in range(len(self.labels), num_classes)
+        ]
+        return np.array(names, dtype=object)
+
+    def scores(self, logits: np.ndarray) -> np.ndarray:
+        """Turn a logits matrix into class scores."""
+        logits = np.asarray(logits, dtype=np.float32)
+        return sigmoid(logits) if self.multi_label else softmax(logits)
+
+    def postprocess(
+        self, logits: np.ndarray, top_k: Union[int, Sequence[int]] = 1
+    ) -> List[Dict]:
+        """Turn a batch of logits into the best labels and scores of each row.
+
+        Scoring and ranking run on the whole matrix at once; only building
+        the response dicts touches rows one by one.
+
+        Args:
+            logits: Logits matrix of shape (rows, classes)
+            top_k: Number of labels to return, for all rows or per row
+
+        Returns:
+            One prediction per row with the best ``label`` and its ``score``,
+            plus the ``labels`` ranked best first when more than one is asked
+        """
+        scores = self.scores(logits)
+        rows, num_classes = scores.shape
+        ks = [top_k] * rows if isinstance(top_k, int) else list(top_k)
+        k = min(max(ks, default=1), num_classes)
+
+        indices = top_k_indices(scores, k)
+        best_scores = np.take_along_axis(scores, indices, axis=1).tolist()
+        best_labels = self.names(num_classes)[indices].tolist()
+
+        results = []
+        for labels, row_scores, row_k in zip(best_labels, best_scores, ks):
+            result = {"label": labels[0], "score": row_scores[0]}
+            if row_k > 1:
+                result["labels"] = [
+                    {"label": label, "score": score}
+                    for label, score in zip(labels[:row_k], row_scores[:row_k])
+                ]
+            results.append(result)
+        return results
+
+
+def parse_top_k(value, default: int = 1) -> Optional[int]:
+    """Validate the ``top_k`` request parameter.
+
+    Returns:
+        The number of labels to return, or None if the value is invalid
+    """
+    if value is None:
+        return default
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        return None
+    return value
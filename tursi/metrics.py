@@ -0,0 +1,442 @@
+"""Lock-light request metrics exposed in the Prometheus text format."""
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Pending updates a metric buffers before an observer folds them into totals
+FOLD_THRESHOLD = 1024
+
+# Latency histogram buckets, in seconds
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Rows per forward pass histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+def format_value(value: float) -> str:
+    """Format a sample value for the text format."""
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Format a label set, escaping values as the text format requires."""
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n")
+        value = value.replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Metric:
+    """Base class of the metric types.
+
+    Recording an update only appends it to a deque, which is atomic under
+    the GIL, so request threads never wait on a lock. Pending updates are
+    folded into the totals when a scrape collects the metric, or by the
+    recording thread once ``FOLD_THRESHOLD`` are buffered, if no other
+    thread is already folding.
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Initialize the metric.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels every update provides values for
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        # Labels with a fixed value on every sample, set by the registry
+        self.const_labels: Tuple[Tuple[str, str], ...] = ()
+        self._function: Optional[Callable[[], float]] = None
+        self._pending: deque = deque()
+        self._lock = threading.Lock()
+
+    def set_function(self, function: Optional[Callable[[], float]]) -> None:
+        """Report the value returned by a callable at scrape time instead."""
+        self._function = function
+
+    def _record(self, labels: Tuple[str, ...], value: float) -> None:
+        """Buffer an update."""
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        self._pending.append((labels, value))
+        if len(self._pending) >= FOLD_THRESHOLD and self._lock.acquire(blocking=False):
+            try:
+                self._fold()
+            finally:
+                self._lock.release()
+
+    def _fold(self) -> None:
+        """Apply the buffered updates; the caller holds the lock."""
+        pending = self._pending
+        while True:
+            try:
+                labels, value = pending.popleft()
+            except IndexError:
+                return
+            self._apply(labels, value)
+
+    def _apply(self, labels: Tuple[str, ...], value: float) -> None:
+        """Apply one update to the totals."""
+        raise NotImplementedError
+
+    def _samples(self) -> List[str]:
+        """Render the sample lines from the totals."""
+        raise NotImplementedError
+
+    def _labels(self, names: Sequence[str] = (), values: Sequence[str] = ()) -> str:
+        """Format a label set preceded by the constant labels."""
+        const_names = tuple(name for name, _ in self.const_labels)
+        const_values = tuple(value for _, value in self.const_labels)
+        return format_labels(const_names + tuple(names), const_values + tuple(values))
+
+    def header(self) -> List[str]:
+        """Render the HELP and TYPE lines of the metric."""
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+
+    def samples(self) -> List[str]:
+        """Render the sample lines of the metric."""
+        if self._function is not None:
+            try:
+                value = float(self._function())
+            except Exception:
+                value = math.nan
+            return [f"{self.name}{self._labels()} {format_value(value)}"]
+        with self._lock:
+            self._fold()
+            return self._samples()
+
+    def collect(self) -> List[str]:
+        """Render the metric in the text exposition format."""
+        return self.header() + self.samples()
+
+
+class Counter(Metric):
+    """Monotonically increasing total."""
+
+    type = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Increase the total for a label set."""
+        self._record(labels, amount)
+
+    def _apply(self, labels, value) -> None:
+        self._values[labels] = self._values.get(labels, 0) + value
+
+    def _samples(self) -> List[str]:
+        if not self._values and not self.labelnames:
+            return [f"{self.name}{self._labels()} 0"]
+        return [
+            f"{self.name}{self._labels(self.labelnames, labels)} {format_value(value)}"
+            for labels, value in sorted(self._values.items())
+        ]
+
+    def value(self, *labels: str) -> float:
+        """Current total for a label set."""
+        with self._lock:
+            self._fold()
+            return self._values.get(labels, 0)
+
+
+class Gauge(Counter):
+    """Value that goes up and down, such as requests in flight."""
+
+    type = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        """Decrease the value for a label set."""
+        self._record(labels, -amount)
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        """Initialize the histogram.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels every observation provides
+            buckets: Sorted upper bounds of the buckets; +Inf is implied
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [count per bucket (last is +Inf), sum]
+        self._values: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record an observed value for a label set."""
+        self._record(labels, value)
+
+    def _apply(self, labels, value) -> None:
+        state = self._values.get(labels)
+        if state is None:
+            state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+
+    def _samples(self) -> List[str]:
+        items = sorted(self._values.items())
+        if not items and not self.labelnames:
+            items = [((), [[0] * (len(self.buckets) + 1), 0.0])]
+        lines = []
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                bucket_labels = self._labels(
+                    self.labelnames + ("le",), labels + (format_value(bound),)
+                )
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            label_text = self._labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+    def count(self, *labels: str) -> int:
+        """Number of observations for a label set."""
+        with self._lock:
+            self._fold()
+            state = self._values.get(labels)
+            return sum(state[0]) if state else 0
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together on ``/metrics``."""
+
+    def __init__(self, labels: Optional[Dict[str, str]] = None):
+        """Initialize the registry.
+
+        Args:
+            labels: Labels added to every sample, e.g. ``{"model": name}``
+        """
+        self.metrics: List[Metric] = []
+        self.labels = dict(labels or {})
+
+    def register(self, metric: Metric) -> Metric:
+        """Add a metric to the registry and return it."""
+        metric.const_labels = tuple(self.labels.items())
+        self.metrics.append(metric)
+        return metric
+
+    def render(self, *others: "MetricsRegistry") -> str:
+        """Render all metrics in the Prometheus text exposition format.
+
+        Args:
+            *others: Registries whose samples are merged into the families of
+                the same name, e.g. one per model with a ``model`` label
+        """
+        merged = [{metric.name: metric for metric in other.metrics} for other in others]
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.collect())
+            for other in merged:
+                if metric.name in other:
+                    lines.extend(other[metric.name].samples())
+        return "\n".join(lines) + "\n"
+
+
+class ServerMetrics(MetricsRegistry):
+    """Metrics of one model server.
+
+    Request counts and latency are recorded by the HTTP layer, inference
+    stage timings, batch sizes and token counts by the engine. Queue depths
+    and cache statistics are read from the batcher, the admission controller
+    and the prediction cache at scrape time.
+    """
+
+    def __init__(self, labels: Optional[Dict[str, str]] = None):
+        super().__init__(labels)
+        self.requests = self.register(
+            Counter(
+                "tursi_requests_total",
+                "HTTP requests by endpoint and status code.",
+                ("endpoint", "status"),
+            )
+        )
+        self.request_latency = self.register(
+            Histogram(
+                "tursi_request_duration_seconds",
+                "HTTP request latency by endpoint.",
+                ("endpoint",),
+            )
+        )
+        self.in_flight = self.register(
+            Gauge("tursi_requests_in_flight", "HTTP requests being handled.")
+        )
+        self.stage_latency = self.register(
+            Histogram(
+                "tursi_stage_duration_seconds",
+                "Time spent per inference stage (tokenize, inference, postprocess).",
+                ("stage",),
+            )
+        )
+        self.batch_size = self.register(
+            Histogram(
+                "tursi_batch_size",
+                "Rows per forward pass.",
+                buckets=BATCH_SIZE_BUCKETS,
+            )
+        )
+        self.tokens = self.register(
+            Counter("tursi_tokens_total", "Tokens processed, excluding padding.")
+        )
+        self.queue_depth = self.register(
+            Gauge("tursi_queue_depth", "Requests waiting for a micro-batch.")
+        )
+        self.admission_queue_depth = self.register(
+            Gauge(
+                "tursi_admission_queue_depth",
+                "Requests waiting for an inference slot.",
+            )
+        )
+        self.rejected = self.register(
+            Counter(
+                "tursi_rejected_requests_total",
+                "Requests shed by admission control, by reason.",
+                ("reason",),
+            )
+        )
+        self.deadline_exceeded = self.register(
+            Counter(
+                "tursi_deadline_exceeded_total",
+                "Requests dropped because their deadline passed, by stage.",
+                ("stage",),
+            )
+        )
+        self.cache_hits = self.register(
+            Counter("tursi_cache_hits_total", "Prediction cache hits.")
+        )
+        self.cache_misses = self.register(
+            Counter("tursi_cache_misses_total", "Prediction cache misses.")
+        )
+        self.cache_hit_ratio = self.register(
+            Gauge("tursi_cache_hit_ratio", "Prediction cache hit rate.")
+        )
+
+    def bind_batcher(self, batcher) -> None:
+        """Report the queue depth of a micro-batcher."""
+        if batcher is not None:
+            self.queue_depth.set_function(batcher.pending)
+
+    def bind_admission(self, admission) -> None:
+        """Report the queue depth of an admission controller."""
+        if admission is not None:
+            self.admission_queue_depth.set_function(admission.waiting)
+
+    def bind_cache(self, cache) -> None:
+        """Report the hit and miss counters of a prediction cache."""
+        if cache is not None:
+            self.cache_hits.set_function(lambda: cache.hits)
+            self.cache_misses.set_function(lambda: cache.misses)
+            self.cache_hit_ratio.set_function(lambda: cache.stats()["hit_rate"])
+
+    def observe_request(self, endpoint: str, status: int, seconds: float) -> None:
+        """Record a completed HTTP request."""
+        self.requests.inc(endpoint, str(status))
+        self.request_latency.observe(seconds, endpoint)
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        """Record the time spent in an inference stage."""
+        self.stage_latency.observe(seconds, stage)
+
+
+def instrument_flask_app(
+    app,
+    metrics: ServerMetrics,
+    merged: Optional[Callable[[], Sequence[MetricsRegistry]]] = None,
+):
+    """Record request metrics of a Flask app and serve them on ``/metrics``.
+
+    Call before registering other request hooks (such as a rate limiter's),
+    so requests they reject are still counted.
+
+    Args:
+        app: Flask application
+        metrics: Metrics to record into and expose
+        merged: Returns more registries to expose with ``metrics`` at scrape time
+
+    Returns:
+        The ``/metrics`` view function, e.g. to exempt it from rate limits
+    """
+    from flask import Response, g, request
+
+    @app.before_request
+    def start_request_timer():
+        g.tursi_request_started = time.perf_counter()
+        g.tursi_in_flight = True
+        metrics.in_flight.inc()
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop("tursi_request_started", None)
+        if started is not None:
+            endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+            metrics.observe_request(
+                endpoint, response.status_code, time.perf_counter() - started
+            )
+        return response
+
+    @app.teardown_request
+    def finish_request(exc=None):
+        if g.pop("tursi_in_flight", False):
+            metrics.in_flight.dec()
+
+    @app.route("/metrics", methods=["GET"])
+    def prometheus_metrics():
+        """Prometheus metrics endpoint."""
+        others = merged() if merged is not None else ()
+        return Response(metrics.render(*others), mimetype=CONTENT_TYPE.split(";")[0])
+
+    return prometheus_metrics
@@ -11,10 +11,35 @@ from transformers import (
     AutoTokenizer,
     PreTrainedModel,
     PreTrainedTokenizer,
+    StoppingCriteria,
+    StoppingCriteriaList,
 )
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from werkzeug.serving import make_server
 import time
+from contextlib import nullcontext
+from .admission import AdmissionController, Overloaded
+from .deadline import (
+    DEADLINE_HEADER,
+    TIMEOUT_FIELD,
+    DeadlineExceeded,
+    check_deadline,
+    expired,
+    parse_deadline,
+)
+from .frames import (
+    FRAME_CONTENT_TYPE,
+    FrameError,
+    decode_request,
+    encode_response,
+    is_frame,
+    wants_frame,
+)
+from .metrics import ServerMetrics, instrument_flask_app
+from .ratelimit import retry_after_header
+from .runtime import parse_bool
+from .serving import DEFAULT_UDS_MODE, bind_unix_socket, remove_unix_socket
+from .timing import start_timer
 
 logger = logging.getLogger(__name__)
 
@@ -51,11 +76,35 @@ class ModelInfo:
     deployment_count: int = 0
 
 
+class DeadlineStoppingCriteria(StoppingCriteria):
+    """Stops generation once the request's deadline has passed."""
+
+    def __init__(self, deadline: float):
+        self.deadline = deadline
+
+    def __call__(self, input_ids, scores, **kwargs):
+        return torch.full(
+            (input_ids.shape[0],),
+            expired(self.deadline),
+            dtype=torch.bool,
+            device=input_ids.device,
+        )
+
+
 class ModelServer:
     """Flask server for model inference."""
 
     def __init__(
-        self, model_name: str, model, tokenizer, rate_limit: Optional[str] = None
+        self,
+        model_name: str,
+        model,
+        tokenizer,
+        rate_limit: Optional[str] = None,
+        server_timing: Optional[bool] = None,
+        timing_log_sample_rate: Optional[float] = None,
+        max_queue_depth: Optional[int] = None,
+        max_queue_wait_ms: Optional[float] = None,
+        inference_concurrency: Optional[int] = None,
     ):
         """Initialize model server.
 
@@ -64,11 +113,43 @@ class ModelServer:
             model: The loaded model instance
             tokenizer: The model's tokenizer
             rate_limit: Optional rate limit string (e.g., "100/minute")
+            server_timing: Add Server-Timing headers to generate responses
+                (defaults to the SERVER_TIMING environment variable)
+            timing_log_sample_rate: Fraction of requests to log with their
+                stage timings (defaults to TIMING_LOG_SAMPLE_RATE)
+            max_queue_depth: Generate requests allowed to wait for the model
+                before new ones get a 503, 0 for no limit (defaults to
+                QUEUE_MAX_DEPTH)
+            max_queue_wait_ms: Longest time a request may wait for the
+                model, 0 for no limit (defaults to QUEUE_MAX_WAIT_MS)
+            inference_concurrency: Requests generating at once (defaults to
+                INFERENCE_CONCURRENCY, or 1)
         """
         self.model_name = model_name
         self.model = model
         self.tokenizer = tokenizer
         self.rate_limit = rate_limit
+        self.metrics = ServerMetrics()
+        if server_timing is None:
+            server_timing = parse_bool(os.getenv("SERVER_TIMING", "0"))
+        if timing_log_sample_rate is None:
+            timing_log_sample_rate = float(os.getenv("TIMING_LOG_SAMPLE_RATE", "0"))
+        self.server_timing = server_timing
+        self.timing_log_sample_rate = timing_log_sample_rate
+
+        if max_queue_depth is None:
+            max_queue_depth = int(os.getenv("QUEUE_MAX_DEPTH", "0"))
+        if max_queue_wait_ms is None:
+            max_queue_wait_ms = float(os.getenv("QUEUE_MAX_WAIT_MS", "0"))
+        if inference_concurrency is None:
+            inference_concurrency = int(os.getenv("INFERENCE_CONCURRENCY", "0"))
+        self.admission = None
+        if max_queue_depth > 0 or max_queue_wait_ms > 0:
+            # Generation already uses every core, so run one at a time
+            self.admission = AdmissionController(
+                max(inference_concurrency, 1), max_queue_depth, max_queue_wait_ms
+            )
+        self.metrics.bind_admission(self.admission)
 
         self.app = Flask(__name__)
         self._setup_routes()
@@ -80,44 +161,123 @@ class ModelServer:
             self.limiter = Limiter(
                 app=self.app, key_func=get_remote_address, default_limits=[rate_limit]
             )
+            self.limiter.exempt(self.metrics_view)
 
     def _setup_routes(self):
         """Configure API routes."""
+        self.metrics_view = instrument_flask_app(self.app, self.metrics)
         self.app.route("/v1/generate", methods=["POST"])(self.generate)
         self.app.route("/v1/health", methods=["GET"])(self.health_check)
 
     def generate(self):
-        """Generate text from the model."""
+        """Generate text from the model.
+
+        Bodies may be JSON or binary frames holding the prompt; successful
+        responses use the encoding the client accepts.
+        """
+        timer = start_timer(self.server_timing, self.timing_log_sample_rate)
         try:
-            data = request.get_json()
+            frame = is_frame(request.content_type or "")
+            if frame:
+                data = decode_request(request.get_data(), text_field="prompt")
+            else:
+                data = request.get_json()
             if not data or "prompt" not in data:
                 return jsonify({"error": "Missing prompt in request"}), 400
 
             prompt = data["prompt"]
             max_length = data.get("max_length", 100)
             temperature = data.get("temperature", 0.7)
-
-            # Tokenize input
-            inputs = self.tokenizer(prompt, return_tensors="pt")
-
-            # Generate
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    inputs["input_ids"],
-                    max_length=max_length,
-                    temperature=temperature,
-                    pad_token_id=self.tokenizer.eos_token_id,
+            try:
+                deadline = parse_deadline(
+                    request.headers.get(DEADLINE_HEADER), data.get(TIMEOUT_FIELD)
                 )
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
 
-            # Decode output
-            generated_text = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+            check_deadline(deadline, "arrival")
+            admission = (
+                self.admission.admit() if self.admission is not None else nullcontext()
+            )
+            with admission:
+                check_deadline(deadline, "queue")
+
+                # Tokenize input
+                started = time.perf_counter()
+                inputs = self.tokenizer(prompt, return_tensors="pt")
+                tokenized = time.perf_counter()
+
+                # Generate, stopping mid-decode if the deadline passes
+                options = {}
+                if deadline is not None:
+                    options["stopping_criteria"] = StoppingCriteriaList(
+                        [DeadlineStoppingCriteria(deadline)]
+                    )
+                with torch.no_grad():
+                    outputs = self.model.generate(
+                        inputs["input_ids"],
+                        max_length=max_length,
+                        temperature=temperature,
+                        pad_token_id=self.tokenizer.eos_token_id,
+                        **options,
+                    )
+                generated = time.perf_counter()
+                check_deadline(deadline, "decode")
 
-            return jsonify({"generated_text": generated_text}), 200
+                # Decode output
+                generated_text = self.tokenizer.decode(
+                    outputs[0], skip_special_tokens=True
+                )
 
+            stages = {
+                "tokenize": tokenized - started,
+                "inference": generated - tokenized,
+                "postprocess": time.perf_counter() - generated,
+            }
+            for stage, seconds in stages.items():
+                self.metrics.observe_stage(stage, seconds)
+            self.metrics.batch_size.observe(len(outputs))
+            self.metrics.tokens.inc(amount=len(outputs[0]))
+
+            body = {"generated_text": generated_text}
+            if wants_frame(request.headers.get("Accept", ""), frame):
+                encode = self._frame_response
+            else:
+                encode = jsonify
+            if timer is None:
+                return encode(body), 200
+
+            for stage, seconds in stages.items():
+                timer.add(stage, seconds)
+            serialize_started = time.perf_counter()
+            response = encode(body)
+            timer.add("serialize", time.perf_counter() - serialize_started)
+            header = timer.finish(
+                endpoint="/v1/generate", model=self.model_name, status=200
+            )
+            if header is not None:
+                response.headers["Server-Timing"] = header
+            return response, 200
+
+        except FrameError as e:
+            return jsonify({"error": f"Invalid frame: {e}"}), 400
+        except DeadlineExceeded as e:
+            self.metrics.deadline_exceeded.inc(e.stage)
+            return jsonify({"error": "Deadline exceeded"}), 504
+        except Overloaded as e:
+            self.metrics.rejected.inc(e.reason)
+            response = jsonify({"error": "Server overloaded, retry later"})
+            response.headers["Retry-After"] = retry_after_header(e.retry_after)
+            return response, 503
         except Exception as e:
             logger.error(f"Error in generate: {e}")
             return jsonify({"error": str(e)}), 500
 
+    @staticmethod
+    def _frame_response(body) -> Response:
+        """Encode a response body as a binary frame."""
+        return Response(encode_response(body), mimetype=FRAME_CONTENT_TYPE)
+
     def health_check(self):
         """Health check endpoint."""
         # Add more checks here if needed (e.g., model responsiveness)
@@ -304,16 +464,20 @@ class ModelManager:
         quantization: Optional[str] = None,
         bits: Optional[int] = None,
         rate_limit: Optional[str] = None,
+        uds: Optional[str] = None,
+        uds_mode: int = DEFAULT_UDS_MODE,
     ) -> None:
         """Deploy a model for inference.
 
         Args:
             model_name: Name/path of the model on Hugging Face
             host: Host address to bind to
-            port: Port number to listen on
+            port: Port number to listen on, identifying the deployment
             quantization: Optional quantization mode
             bits: Optional number of bits for quantization
             rate_limit: Optional rate limit string
+            uds: Unix domain socket path to listen on instead of host and port
+            uds_mode: File mode of the socket, deciding who may connect
 
         Raises:
             ValueError: If port is in use or configuration is invalid
@@ -350,7 +514,16 @@ class ModelManager:
 
             # Create stop event and server thread
             stop_event = threading.Event()
-            server_instance = make_server(host, port, server.app)
+            if uds:
+                uds = os.path.abspath(uds)
+                sock = bind_unix_socket(uds, uds_mode)
+                # The server listens on its own duplicate of the socket
+                server_instance = make_server(
+                    f"unix://{uds}", 0, server.app, threaded=True, fd=sock.fileno()
+                )
+                sock.close()
+            else:
+                server_instance = make_server(host, port, server.app, threaded=True)
             server_thread = threading.Thread(
                 target=self._run_server,
                 args=(server_instance, stop_event),
@@ -365,9 +538,11 @@ class ModelManager:
                 "server": server_instance,
                 "stop_event": stop_event,
                 "model_name": model_name,
+                "uds": uds,
             }
 
-            logger.info(f"Model {model_name} deployed on {host}:{port}")
+            address = f"unix:{uds}" if uds else f"{host}:{port}"
+            logger.info(f"Model {model_name} deployed on {address}")
 
         except Exception as e:
             logger.error(f"Error deploying model {model_name}: {e}")
@@ -398,6 +573,7 @@ class ModelManager:
             server_info["thread"].join(timeout=5)
             if server_info["thread"].is_alive():
                 logger.warning(f"Server thread on port {port} did not stop gracefully")
+            remove_unix_socket(server_info.get("uds"))
 
             # Update deployment count and cleanup if needed
             model_info = self.models[model_name]
@@ -428,7 +604,8 @@ class ModelManager:
         def shutdown_check() -> None:
             """Check if server should shut down."""
             if stop_event.is_set():
-                server.shutdown()
+                # shutdown() waits for serve_forever, so call it from another thread
+                threading.Thread(target=server.shutdown, daemon=True).start()
 
         # Add shutdown check to server
         server.service_actions = shutdown_check
@@ -467,6 +644,7 @@ class ModelManager:
                 "model_name": server_info["model_name"],
                 "host": server_info["server"].host,
                 "port": server_info["server"].port,
+                "uds": server_info.get("uds"),
                 "thread_status": (
                     "alive" if server_info["thread"].is_alive() else "stopped"
                 ),
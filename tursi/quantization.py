@@ -0,0 +1,250 @@
+"""ONNX Runtime quantization for Tursi models."""
+
+import hashlib
+import inspect
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+import numpy as np
+from onnxruntime.quantization import CalibrationDataReader
+
+logger = logging.getLogger(__name__)
+
+# File names used inside a cached model directory
+EXPORTED_MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model_quantized.onnx"
+
+# Supported calibration methods for static quantization
+CALIBRATION_METHODS = {
+    "minmax": "MinMax",
+    "entropy": "Entropy",
+    "percentile": "Percentile",
+}
+
+
+def quantize_dynamic_model(model_path: Path, output_path: Path, bits: int = 8) -> Path:
+    """Quantize an exported ONNX model with dynamic quantization.
+
+    With 8 bits, weights are stored as int8 and activations are quantized to
+    8 bits on the fly, so MatMul/Gemm run as integer kernels. With 4 bits,
+    MatMul weights are block-quantized to 4 bits (weight-only).
+
+    Args:
+        model_path: Path to the fp32 ONNX model
+        output_path: Where to write the quantized model
+        bits: Number of bits for quantization (4 or 8)
+
+    Returns:
+        Path to the quantized model
+
+    Raises:
+        ValueError: If the number of bits is not supported
+        RuntimeError: If the required quantization tooling is missing
+    """
+    model_path = Path(model_path)
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if bits == 8:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        logger.info(f"Applying dynamic int8 quantization to {model_path}")
+        quantize_dynamic(
+            model_input=str(model_path),
+            model_output=str(output_path),
+            weight_type=QuantType.QInt8,
+            per_channel=True,
+        )
+    elif bits == 4:
+        import onnx
+
+        try:
+            from onnxruntime.quantization.matmul_nbits_quantizer import (
+                MatMulNBitsQuantizer,
+            )
+        except ImportError as e:
+            raise RuntimeError(
+                "4-bit quantization requires onnxruntime>=1.20 and onnx_ir. "
+                "Please install them: pip install -U onnxruntime onnx_ir"
+            ) from e
+
+        logger.info(f"Applying 4-bit weight-only quantization to {model_path}")
+        quantizer = MatMulNBitsQuantizer(
+            onnx.load(str(model_path)), block_size=32, is_symmetric=True
+        )
+        quantizer.process()
+        quantizer.model.save_model_to_file(str(output_path), False)
+    else:
+        raise ValueError("Bits must be 4 or 8")
+
+    original_mb = model_path.stat().st_size / (1024 * 1024)
+    quantized_mb = output_path.stat().st_size / (1024 * 1024)
+    logger.info(
+        f"Quantized model written to {output_path} "
+        f"({original_mb:.1f} MB -> {quantized_mb:.1f} MB)"
+    )
+    return output_path
+
+
+def onnx_input_names(model_path: Path) -> List[str]:
+    """List the graph input names of an ONNX model."""
+    import onnx
+
+    model = onnx.load(str(model_path), load_external_data=False)
+    initializers = {init.name for init in model.graph.initializer}
+    return [i.name for i in model.graph.input if i.name not in initializers]
+
+
+def iter_calibration_texts(
+    path: Path, max_samples: Optional[int] = None
+) -> Iterator[str]:
+    """Stream representative texts from a calibration file.
+
+    ``.jsonl`` files are read as one JSON object per line with a ``text``
+    field (plain JSON strings are accepted too). Any other file is read as
+    one text per line. Blank lines are skipped.
+
+    Args:
+        path: Path to the calibration file
+        max_samples: Optional maximum number of texts to yield
+
+    Yields:
+        Calibration texts
+    """
+    path = Path(path)
+    is_jsonl = path.suffix.lower() == ".jsonl"
+    count = 0
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if max_samples is not None and count >= max_samples:
+                return
+            line = line.strip()
+            if not line:
+                continue
+            if is_jsonl:
+                record = json.loads(line)
+                text = record.get("text") if isinstance(record, dict) else record
+                if not isinstance(text, str):
+                    raise ValueError(
+                        f"{path}:{line_number}: expected a 'text' string field"
+                    )
+            else:
+                text = line
+            count += 1
+            yield text
+
+
+def calibration_data_hash(path: Path) -> str:
+    """Hash the contents of a calibration file for cache keys."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+class TextCalibrationReader(CalibrationDataReader):
+    """Feed tokenized calibration texts to the ONNX Runtime calibrator."""
+
+    def __init__(self, texts: Iterable[str], tokenizer, input_names: List[str]):
+        """Initialize the reader.
+
+        Args:
+            texts: Representative input texts, consumed lazily
+            tokenizer: Tokenizer matching the exported model
+            input_names: Names of the ONNX model inputs
+        """
+        self.tokenizer = tokenizer
+        self.input_names = input_names
+        self._texts = iter(texts)
+        self.samples = 0
+
+    def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+        """Return the next calibration sample, or None when exhausted."""
+        text = next(self._texts, None)
+        if text is None:
+            return None
+        encoded = self.tokenizer(text, return_tensors="np", truncation=True)
+        self.samples += 1
+        return {
+            name: encoded[name].astype(np.int64)
+            for name in self.input_names
+            if name in encoded
+        }
+
+
+def quantize_static_model(
+    model_path: Path,
+    output_path: Path,
+    reader: CalibrationDataReader,
+    method: str = "minmax",
+    calibration_cache: Optional[Path] = None,
+) -> Path:
+    """Quantize an exported ONNX model with static int8 quantization.
+
+    Activation ranges are collected by running the calibration samples
+    through the model, then weights and activations are both quantized to
+    8 bits (QDQ format, uint8 activations and int8 weights).
+
+    Args:
+        model_path: Path to the fp32 ONNX model
+        output_path: Where to write the quantized model
+        reader: Calibration data reader
+        method: Calibration method ('minmax', 'entropy' or 'percentile')
+        calibration_cache: Optional path of a calibration table to reuse or
+            create, so later builds skip recalibration
+
+    Returns:
+        Path to the quantized model
+
+    Raises:
+        ValueError: If the calibration method is not supported
+    """
+    from onnxruntime.quantization import (
+        CalibrationMethod,
+        QuantFormat,
+        QuantType,
+        quantize_static,
+    )
+
+    if method not in CALIBRATION_METHODS:
+        raise ValueError(
+            f"Calibration method must be one of: {', '.join(CALIBRATION_METHODS)}"
+        )
+
+    model_path = Path(model_path)
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    kwargs = {}
+    if calibration_cache is not None:
+        if "calibration_cache_path" in inspect.signature(quantize_static).parameters:
+            Path(calibration_cache).parent.mkdir(parents=True, exist_ok=True)
+            kwargs["calibration_cache_path"] = str(calibration_cache)
+            if Path(calibration_cache).exists():
+                logger.info(f"Reusing calibration table {calibration_cache}")
+        else:
+            logger.warning(
+                "This onnxruntime version cannot reuse calibration tables, "
+                "recalibrating from scratch"
+            )
+
+    logger.info(f"Applying static int8 quantization ({method}) to {model_path}")
+    quantize_static(
+        model_input=str(model_path),
+        model_output=str(output_path),
+        calibration_data_reader=reader,
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+        calibrate_method=getattr(CalibrationMethod, CALIBRATION_METHODS[method]),
+        **kwargs,
+    )
+
+    samples = getattr(reader, "samples", 0)
+    if samples:
+        logger.info(f"Calibrated with {samples} samples")
+    logger.info(f"Quantized model written to {output_path}")
+    return output_path
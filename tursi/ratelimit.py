@@ -0,0 +1,257 @@
+"""GCRA rate limiting with state shared across processes through an mmap."""
+
+import hashlib
+import math
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: limits are only shared between threads
+    fcntl = None
+
+# Seconds per unit of a rate limit string
+RATE_UNITS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# "100/minute", "100 per minute", "10 per 5 seconds"
+RATE_PATTERN = re.compile(
+    r"^\s*(\d+)\s*(?:/|per)\s*(\d+)?\s*(second|minute|hour|day)s?\s*$", re.I
+)
+
+# Client keys tracked; others evict the least recently limited one
+DEFAULT_SLOTS = 65536
+
+# Slots probed per key; a group of slots shares one lock
+GROUP_SLOTS = 8
+
+MAGIC = b"TURSIGC1"
+HEADER = struct.Struct("<8sQ")  # magic, number of slots
+SLOT = struct.Struct("<Qd")  # key hash (0 is empty), theoretical arrival time
+
+# Threading locks per limiter; groups share them round-robin
+THREAD_LOCKS = 64
+
+
+def parse_rate(rate_limit: str) -> Tuple[int, float]:
+    """Parse a rate limit such as ``100/minute`` or ``10 per 5 seconds``.
+
+    Returns:
+        Number of requests and the period they are allowed in, in seconds
+
+    Raises:
+        ValueError: If the string is not a valid rate limit
+    """
+    match = RATE_PATTERN.match(rate_limit)
+    if match is None:
+        raise ValueError(f"Invalid rate limit: {rate_limit!r}")
+    count, multiplier, unit = match.groups()
+    period = int(multiplier or 1) * RATE_UNITS[unit.lower()]
+    if int(count) < 1 or period <= 0:
+        raise ValueError(f"Invalid rate limit: {rate_limit!r}")
+    return int(count), float(period)
+
+
+class RateLimitResult(NamedTuple):
+    """Outcome of counting one request against a limit."""
+
+    allowed: bool
+    remaining: int  # requests allowed right now after this one
+    retry_after: float  # seconds until a request is allowed, 0 if allowed
+    reset_after: float  # seconds until the full burst is available again
+
+
+class GcraLimiter:
+    """Generic cell rate algorithm limiter shared by every process on a host.
+
+    A limit of N requests per period lets a client make up to ``burst``
+    requests at once, then one request every period / N. Unlike a fixed
+    window there is no burst of 2N at window edges. Each client costs one
+    timestamp (its theoretical arrival time), stored in a fixed-size table
+    in a memory-mapped file. Checks lock only the small group of table slots
+    a key hashes to, with a thread lock and a byte-range ``fcntl`` lock, so
+    workers and separate replicas using the same file enforce one limit.
+    """
+
+    def __init__(
+        self,
+        rate_limit: str,
+        path: Optional[Path] = None,
+        slots: int = DEFAULT_SLOTS,
+        burst: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the limiter.
+
+        Args:
+            rate_limit: Limit per client, e.g. '100/minute'
+            path: State file shared by the processes enforcing the limit; by
+                default an unlinked temporary file, shared only with forked
+                worker processes
+            slots: Number of clients tracked at once (rounded up to a
+                multiple of the probe group size); ignored if the file exists
+            burst: Requests a client may make at once (default: the count
+                of the limit)
+            clock: Wall clock in seconds, shared by all processes
+        """
+        self.rate_limit = rate_limit
+        count, period = parse_rate(rate_limit)
+        self.burst = burst if burst is not None else count
+        if self.burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.interval = period / count
+        self.tolerance = self.interval * self.burst
+        self.clock = clock
+        self.path = Path(path) if path is not None else None
+
+        if self.path is None:
+            self._file = tempfile.TemporaryFile(prefix="tursi-ratelimit-")
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600), "r+b")
+        self._fd = self._file.fileno()
+        self.slots = self._init_table(max(GROUP_SLOTS, slots))
+        self.groups = self.slots // GROUP_SLOTS
+        self._map = mmap.mmap(self._fd, HEADER.size + self.slots * SLOT.size)
+        self._thread_locks = [threading.Lock() for _ in range(THREAD_LOCKS)]
+        # Keys of different limits never share state
+        self._prefix = rate_limit.encode("utf-8") + b"\0"
+
+    def _init_table(self, slots: int) -> int:
+        """Create the table in an empty file, or read the size of an existing one."""
+        slots = -(-slots // GROUP_SLOTS) * GROUP_SLOTS
+        self._lock_range(0, HEADER.size)
+        try:
+            header = os.pread(self._fd, HEADER.size, 0)
+            if len(header) == HEADER.size:
+                magic, existing = HEADER.unpack(header)
+                if magic != MAGIC or existing % GROUP_SLOTS:
+                    raise ValueError("Not a rate limit state file")
+                return existing
+            os.ftruncate(self._fd, HEADER.size + slots * SLOT.size)
+            os.pwrite(self._fd, HEADER.pack(MAGIC, slots), 0)
+            return slots
+        finally:
+            self._unlock_range(0, HEADER.size)
+
+    def _lock_range(self, start: int, length: int) -> None:
+        if fcntl is not None:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, length, start)
+
+    def _unlock_range(self, start: int, length: int) -> None:
+        if fcntl is not None:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, length, start)
+
+    def _hash(self, key: str) -> int:
+        """Hash a key to a non-zero 64-bit value, stable across processes."""
+        digest = hashlib.blake2b(self._prefix + key.encode("utf-8"), digest_size=8)
+        return int.from_bytes(digest.digest(), "little") or 1
+
+    def hit(self, key: str) -> RateLimitResult:
+        """Count a request by ``key`` (e.g. a client address) against the limit.
+
+        Denied requests are not counted.
+        """
+        key_hash = self._hash(key)
+        group = key_hash % self.groups
+        start = HEADER.size + group * GROUP_SLOTS * SLOT.size
+        length = GROUP_SLOTS * SLOT.size
+
+        with self._thread_locks[group % THREAD_LOCKS]:
+            self._lock_range(start, length)
+            try:
+                now = self.clock()
+                offset = self._find_slot(start, key_hash, now)
+                stored_hash, stored_tat = SLOT.unpack_from(self._map, offset)
+                tat = stored_tat if stored_hash == key_hash else now
+
+                new_tat = max(tat, now) + self.interval
+                allow_at = new_tat - self.tolerance
+                if now < allow_at:
+                    return RateLimitResult(
+                        False, 0, allow_at - now, max(tat, now) - now
+                    )
+                SLOT.pack_into(self._map, offset, key_hash, new_tat)
+            finally:
+                self._unlock_range(start, length)
+
+        remaining = int(math.floor((now - allow_at) / self.interval + 1e-9))
+        return RateLimitResult(True, remaining, 0.0, new_tat - now)
+
+    def _find_slot(self, start: int, key_hash: int, now: float) -> int:
+        """Find the slot of a key in its group, or the slot to replace.
+
+        Empty slots and slots whose client is back to a full burst carry no
+        state and are reused first; otherwise the client closest to a full
+        burst is evicted.
+        """
+        replace, replace_tat = None, math.inf
+        for offset in range(start, start + GROUP_SLOTS * SLOT.size, SLOT.size):
+            stored_hash, stored_tat = SLOT.unpack_from(self._map, offset)
+            if stored_hash == key_hash:
+                return offset
+            if stored_hash == 0 or stored_tat <= now:
+                stored_tat = -math.inf
+            if stored_tat < replace_tat:
+                replace, replace_tat = offset, stored_tat
+        return replace
+
+    def reset(self) -> None:
+        """Forget all clients."""
+        for group in range(self.groups):
+            start = HEADER.size + group * GROUP_SLOTS * SLOT.size
+            length = GROUP_SLOTS * SLOT.size
+            with self._thread_locks[group % THREAD_LOCKS]:
+                self._lock_range(start, length)
+                try:
+                    self._map[start : start + length] = bytes(length)
+                finally:
+                    self._unlock_range(start, length)
+
+    def close(self) -> None:
+        """Release the mapping and the state file."""
+        self._map.close()
+        self._file.close()
+
+
+def retry_after_header(seconds: float) -> str:
+    """Format a delay as a ``Retry-After`` header value, in whole seconds."""
+    return str(math.ceil(seconds))
+
+
+def limit_flask_app(app, limiter: GcraLimiter, exempt: Sequence = ()) -> None:
+    """Rate limit every route of a Flask app per client address.
+
+    Each route is limited separately, like flask_limiter's default limits.
+    Rejected requests get a 429 JSON response with a ``Retry-After`` header.
+
+    Args:
+        app: Flask application
+        limiter: Limiter enforcing the limit
+        exempt: View functions that are not limited, such as ``/metrics``
+    """
+    from flask import jsonify, request
+
+    @app.before_request
+    def check_rate_limit():
+        view = app.view_functions.get(request.endpoint)
+        if view is None or view in exempt:
+            return None
+        result = limiter.hit(f"{request.endpoint}:{request.remote_addr}")
+        if result.allowed:
+            return None
+        response = jsonify(
+            {
+                "error": f"Rate limit exceeded: {limiter.rate_limit}",
+                "retry_after": round(result.retry_after, 3),
+            }
+        )
+        response.status_code = 429
+        response.headers["Retry-After"] = retry_after_header(result.retry_after)
+        return response
@@ -0,0 +1,209 @@
+"""Registry of lazily loaded models sharing one serving process."""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+
+def parse_models(value: Union[str, Sequence[str]]) -> List[str]:
+    """Parse a model allow-list from a comma-separated string or a list.
+
+    Args:
+        value: Names such as ``"org/first,second"`` or ``["org/first", "second"]``
+
+    Returns:
+        The names in order, without duplicates
+
+    Raises:
+        ValueError: If no model is given or a name is not a string
+    """
+    if isinstance(value, str):
+        value = value.split(",")
+    if not isinstance(value, (list, tuple)) or not all(
+        isinstance(name, str) for name in value
+    ):
+        raise ValueError("Models must be a comma-separated string or list of names")
+    models = list(dict.fromkeys(name.strip() for name in value if name.strip()))
+    if not models:
+        raise ValueError("At least one model must be allowed")
+    return models
+
+
+class ModelRegistry:
+    """Loads models on first use and evicts the least recently used ones.
+
+    Models are loaded by a factory (typically ``TursiEngine.create_service``)
+    when first requested. Loads of different models run concurrently; a model
+    requested by several threads at once is loaded only once. After each load
+    the least recently used models are evicted until the loaded models fit the
+    memory budget and the model count limit. The model just loaded is never
+    evicted, so a single model larger than the budget is still served.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[str], Any],
+        memory_budget_bytes: int = 0,
+        max_models: int = 0,
+        size_of: Optional[Callable[[Any], int]] = None,
+        unload: Optional[Callable[[Any], None]] = None,
+    ):
+        """Initialize the registry.
+
+        Args:
+            load: Returns the loaded model (or service) for a name
+            memory_budget_bytes: Memory the loaded models may use, 0 for no limit
+            max_models: Number of models kept loaded, 0 for no limit
+            size_of: Returns the memory used by a loaded model, in bytes
+            unload: Releases the resources of an evicted model
+        """
+        if memory_budget_bytes < 0:
+            raise ValueError("memory_budget_bytes must not be negative")
+        if max_models < 0:
+            raise ValueError("max_models must not be negative")
+
+        self._load = load
+        self.memory_budget_bytes = memory_budget_bytes
+        self.max_models = max_models
+        self._size_of = size_of or (lambda model: 0)
+        self._unload = unload
+        # name -> (model, size in bytes), least recently used first
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        """Return a loaded model, loading it (and evicting others) if needed.
+
+        Errors raised by the factory are counted and re-raised.
+        """
+        model = self._use(name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+        with load_lock:
+            # Another thread may have loaded it while this one waited
+            model = self._use(name)
+            if model is not None:
+                return model
+
+            started = time.perf_counter()
+            try:
+                model = self._load(name)
+            except Exception:
+                with self._lock:
+                    self._model_stats(name)["load_failures"] += 1
+                raise
+            load_ms = round((time.perf_counter() - started) * 1000, 1)
+            size = int(self._size_of(model))
+
+            with self._lock:
+                self._entries[name] = (model, size)
+                stats = self._model_stats(name)
+                stats["loads"] += 1
+                stats["requests"] += 1
+                stats["last_load_ms"] = load_ms
+                stats["size_bytes"] = size
+                evicted = self._evict_over_budget()
+
+        logger.info(f"Loaded model {name} in {load_ms} ms ({size} bytes)")
+        for evicted_name, evicted_model in evicted:
+            logger.info(f"Evicted least recently used model {evicted_name}")
+            if self._unload is not None:
+                self._unload(evicted_model)
+        return model
+
+    def peek(self, name: str) -> Optional[Any]:
+        """Return a model if it is loaded, without loading or touching it."""
+        with self._lock:
+            entry = self._entries.get(name)
+            return entry[0] if entry is not None else None
+
+    def loaded(self) -> List[str]:
+        """Names of the loaded models, least recently used first."""
+        with self._lock:
+            return list(self._entries)
+
+    def memory_bytes(self) -> int:
+        """Memory used by the loaded models, in bytes."""
+        with self._lock:
+            return sum(size for _, size in self._entries.values())
+
+    def evict(self, name: str) -> bool:
+        """Unload a model; returns whether it was loaded."""
+        with self._lock:
+            entry = self._entries.pop(name, None)
+            if entry is not None:
+                self._model_stats(name)["evictions"] += 1
+        if entry is not None and self._unload is not None:
+            self._unload(entry[0])
+        return entry is not None
+
+    def stats(self) -> Dict[str, Any]:
+        """Report the loaded models and per-model load and eviction counts."""
+        with self._lock:
+            models = {}
+            for name, stats in sorted(self._stats.items()):
+                models[name] = dict(stats, loaded=name in self._entries)
+            return {
+                "loaded": list(self._entries),
+                "memory_bytes": sum(size for _, size in self._entries.values()),
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "max_models": self.max_models,
+                "loads": sum(s["loads"] for s in self._stats.values()),
+                "evictions": sum(s["evictions"] for s in self._stats.values()),
+                "models": models,
+            }
+
+    def _use(self, name: str) -> Optional[Any]:
+        """Return a loaded model, marking it most recently used."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return None
+            self._entries.move_to_end(name)
+            self._stats[name]["requests"] += 1
+            return entry[0]
+
+    def _model_stats(self, name: str) -> Dict[str, Any]:
+        """Counters of a model; the caller holds the lock."""
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = {
+                "loads": 0,
+                "load_failures": 0,
+                "evictions": 0,
+                "requests": 0,
+                "last_load_ms": None,
+                "size_bytes": 0,
+            }
+        return stats
+
+    def _over_budget(self) -> bool:
+        """Whether the loaded models exceed a limit; the caller holds the lock."""
+        if self.max_models and len(self._entries) > self.max_models:
+            return True
+        if self.memory_budget_bytes:
+            used = sum(size for _, size in self._entries.values())
+            return used > self.memory_budget_bytes
+        return False
+
+    def _evict_over_budget(self) -> List[tuple]:
+        """Drop least recently used models until within the limits.
+
+        The most recently used model is always kept. The caller holds the
+        lock and unloads the returned models after releasing it.
+        """
+        evicted = []
+        while len(self._entries) > 1 and self._over_budget():
+            name, (model, _) = self._entries.popitem(last=False)
+            self._model_stats(name)["evictions"] += 1
+            evicted.append((name, model))
+        return evicted
@@ -0,0 +1,479 @@
+"""ONNX Runtime session configuration for Tursi."""
+
+import logging
+import os
+import platform
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+import onnxruntime as ort
+
+logger = logging.getLogger(__name__)
+
+# Valid execution modes and their ONNX Runtime equivalents
+EXECUTION_MODES = {
+    "sequential": ort.ExecutionMode.ORT_SEQUENTIAL,
+    "parallel": ort.ExecutionMode.ORT_PARALLEL,
+}
+
+# Input shapes whose I/O binding buffers are kept, and free buffers per shape;
+# enough for every (batch size, bucket) pair at the default chunk size
+IO_BUFFER_SHAPES = 256
+IO_BUFFERS_PER_SHAPE = 4
+
+
+@dataclass
+class SessionSettings:
+    """Threading configuration for an ONNX Runtime session."""
+
+    intra_op_threads: int = 1  # 0 lets ONNX Runtime use all physical cores
+    inter_op_threads: int = 1  # only used in parallel execution mode
+    execution_mode: str = "sequential"
+    allow_spinning: bool = True
+
+    def validate(self) -> None:
+        """Validate configuration parameters."""
+        if self.intra_op_threads < 0:
+            raise ValueError("Intra-op threads must be 0 (automatic) or positive")
+        if self.inter_op_threads < 0:
+            raise ValueError("Inter-op threads must be 0 (automatic) or positive")
+        if self.execution_mode not in EXECUTION_MODES:
+            raise ValueError("Execution mode must be 'sequential' or 'parallel'")
+
+    def session_options(self) -> ort.SessionOptions:
+        """Build ONNX Runtime session options for these settings."""
+        self.validate()
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = self.intra_op_threads
+        options.inter_op_num_threads = self.inter_op_threads
+        options.execution_mode = EXECUTION_MODES[self.execution_mode]
+        spinning = "1" if self.allow_spinning else "0"
+        options.add_session_config_entry("session.intra_op.allow_spinning", spinning)
+        options.add_session_config_entry("session.inter_op.allow_spinning", spinning)
+        return options
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert settings to a JSON-serializable dict."""
+        return asdict(self)
+
+
+def parse_bool(value: Any) -> bool:
+    """Parse a boolean from an environment or config value."""
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
+def candidate_settings(
+    base: SessionSettings, cpu_count: Optional[int] = None
+) -> List[SessionSettings]:
+    """List the threading configurations tried by auto-tuning.
+
+    Args:
+        base: Settings whose spin-wait policy is kept
+        cpu_count: Number of usable cores (detected if not given)
+
+    Returns:
+        Candidate settings, without duplicates
+    """
+    if cpu_count is None:
+        cpu_count = (
+            len(os.sched_getaffinity(0))
+            if hasattr(os, "sched_getaffinity")
+            else os.cpu_count()
+        )
+    cpu_count = max(1, cpu_count or 1)
+
+    thread_counts = sorted({1, 2, 4, max(1, cpu_count // 2), cpu_count})
+    candidates = [
+        replace(
+            base, intra_op_threads=n, inter_op_threads=1, execution_mode="sequential"
+        )
+        for n in thread_counts
+        if n <= cpu_count
+    ]
+    if cpu_count >= 4:
+        candidates.append(
+            replace(
+                base,
+                intra_op_threads=cpu_count // 2,
+                inter_op_threads=2,
+                execution_mode="parallel",
+            )
+        )
+    return candidates
+
+
+def synthetic_inputs(
+    input_names: Sequence[str], batch_size: int, sequence_length: int
+) -> Dict[str, np.ndarray]:
+    """Build dummy token inputs for the given graph inputs."""
+    return {
+        name: np.ones((batch_size, sequence_length), dtype=np.int64)
+        for name in input_names
+    }
+
+
+def autotune_session_settings(
+    model_path: Path,
+    shapes: Sequence[Tuple[int, int]],
+    base: Optional[SessionSettings] = None,
+    candidates: Optional[List[SessionSettings]] = None,
+    repeats: int = 5,
+) -> Tuple[SessionSettings, List[Dict[str, Any]]]:
+    """Benchmark threading configurations and pick the fastest.
+
+    Each candidate runs every ``(batch_size, sequence_length)`` shape
+    ``repeats`` times after one warmup pass; the candidate with the lowest
+    total median latency wins.
+
+    Args:
+        model_path: Path to the ONNX model to benchmark
+        shapes: Batch shapes the server is expected to run
+        base: Settings whose spin-wait policy is kept
+        candidates: Explicit candidates (defaults to ``candidate_settings``)
+        repeats: Timed runs per shape
+
+    Returns:
+        The fastest settings and the per-candidate timings in milliseconds
+    """
+    base = base or SessionSettings()
+    candidates = candidates or candidate_settings(base)
+    probe = ort.InferenceSession(str(model_path), providers=["CPUExecutionProvider"])
+    input_names = [i.name for i in probe.get_inputs()]
+    del probe
+    feeds = [synthetic_inputs(input_names, b, s) for b, s in shapes]
+
+    results = []
+    for settings in candidates:
+        session = ort.InferenceSession(
+            str(model_path),
+            sess_options=settings.session_options(),
+            providers=["CPUExecutionProvider"],
+        )
+        total_ms = 0.0
+        for feed in feeds:
+            session.run(None, feed)  # warmup
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                session.run(None, feed)
+                timings.append((time.perf_counter() - start) * 1000)
+            total_ms += float(np.median(timings))
+        results.append(
+            {"settings": settings.to_dict(), "median_ms": round(total_ms, 3)}
+        )
+        logger.debug(f"Auto-tune candidate {settings}: {total_ms:.2f} ms")
+
+    best = min(range(len(candidates)), key=lambda i: results[i]["median_ms"])
+    logger.info(
+        f"Auto-tuned ONNX Runtime threading: {candidates[best]} "
+        f"({results[best]['median_ms']} ms over {len(shapes)} shapes)"
+    )
+    return candidates[best], results
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    """Compute a numerically stable softmax over the last axis."""
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+def sigmoid(logits: np.ndarray) -> np.ndarray:
+    """Compute an element-wise logistic sigmoid without overflow."""
+    exp = np.exp(-np.abs(logits))
+    return np.where(logits >= 0, 1 / (1 + exp), exp / (1 + exp))
+
+
+def cpu_features() -> List[str]:
+    """List the instruction set extensions of the CPU, e.g. ``avx2``.
+
+    Read from ``/proc/cpuinfo`` on Linux; empty where it is not available.
+    """
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                # x86 reports "flags", ARM "Features"
+                if name.strip() in ("flags", "Features"):
+                    return sorted(value.split())
+    except OSError:
+        pass
+    return []
+
+
+def optimized_graph_key() -> Dict[str, Any]:
+    """Identify the environment an optimized graph may be reused in.
+
+    Fully optimized graphs can contain kernels and layouts specific to the
+    ONNX Runtime version and the CPU's instruction set, so a cached graph
+    is only valid for the same version on the same kind of CPU.
+    """
+    return {
+        "onnxruntime": ort.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_features": cpu_features(),
+    }
+
+
+def is_fork_safe(options: Optional[ort.SessionOptions]) -> bool:
+    """Check whether a session can keep running in a forked child.
+
+    A session with a single intra-op thread in sequential mode runs entirely
+    on the calling thread. Otherwise it owns a thread pool, whose threads do
+    not survive ``fork()``.
+    """
+    if options is None:
+        return False  # the default uses one thread per physical core
+    return (
+        options.intra_op_num_threads == 1
+        and options.execution_mode == ort.ExecutionMode.ORT_SEQUENTIAL
+    )
+
+
+class IOBuffers:
+    """Preallocated input and output arrays bound to a session for one shape.
+
+    Running the session through the binding reads the inputs from, and
+    writes the logits into, these arrays, so ONNX Runtime allocates neither.
+    """
+
+    __slots__ = ("shape", "inputs", "output", "binding", "session")
+
+    def __init__(self, session: ort.InferenceSession, shape, input_names, output):
+        """Allocate the arrays and bind them.
+
+        Args:
+            session: Session the arrays are bound to
+            shape: ``(batch_size, sequence_length)`` of the inputs
+            input_names: Names of the graph's token inputs
+            output: ``(name, number of classes)`` of the logits output
+        """
+        output_name, num_classes = output
+        self.shape = shape
+        self.session = session
+        self.inputs = {name: np.zeros(shape, dtype=np.int64) for name in input_names}
+        self.output = np.empty((shape[0], num_classes), dtype=np.float32)
+        self.binding = session.io_binding()
+        for name, array in self.inputs.items():
+            self.binding.bind_input(
+                name, "cpu", 0, np.int64, array.shape, array.ctypes.data
+            )
+        self.binding.bind_output(
+            output_name,
+            "cpu",
+            0,
+            np.float32,
+            self.output.shape,
+            self.output.ctypes.data,
+        )
+
+    def run(self) -> np.ndarray:
+        """Run the session on the bound inputs.
+
+        Returns:
+            The bound logits array, valid until the buffers are released
+        """
+        self.session.run_with_iobinding(self.binding)
+        return self.output
+
+
+class OnnxClassifier:
+    """Sequence classifier running an ONNX model directly on ONNX Runtime.
+
+    Takes NumPy token arrays and returns NumPy logits, so serving never
+    needs torch. In a forked worker, a session that owns a thread pool is
+    rebuilt on first use; single-threaded sessions are kept so their weights
+    stay shared with the parent.
+
+    With I/O binding, each forward pass runs on input and output arrays
+    preallocated per (batch size, sequence length) and reused, so steady-state
+    inference allocates no large arrays. Buffers are pooled per shape and
+    checked out by one caller at a time, keeping the classifier thread-safe.
+    """
+
+    def __init__(
+        self,
+        model_path: Path,
+        session_options: Optional[ort.SessionOptions] = None,
+        label_map=None,
+        io_binding: bool = True,
+        optimized_model_path: Optional[Path] = None,
+    ):
+        """Initialize the classifier.
+
+        Args:
+            model_path: Path to the ONNX model
+            session_options: Optional ONNX Runtime session options
+            label_map: Optional LabelMap naming the model's output classes
+            io_binding: Run on preallocated, reused buffers when the graph
+                allows it
+            optimized_model_path: Optional cache file of the fully optimized
+                graph. Loaded with graph optimizations disabled if it exists,
+                otherwise written when the session is first created; key its
+                name with ``optimized_graph_key()``
+        """
+        self.model_path = Path(model_path)
+        self.optimized_model_path = (
+            Path(optimized_model_path) if optimized_model_path is not None else None
+        )
+        self.session_options = session_options
+        self.label_map = label_map
+        self.fork_safe = is_fork_safe(session_options)
+        self.session = self._create_session()
+        self._pid = os.getpid()
+        self._fork_lock = threading.Lock()
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        outputs = self.session.get_outputs()
+        output_names = [o.name for o in outputs]
+        self.output_name = "logits" if "logits" in output_names else output_names[0]
+
+        # Binding needs int64 inputs and a known number of float32 logits
+        output = outputs[output_names.index(self.output_name)]
+        num_classes = output.shape[-1] if output.shape else None
+        self.io_binding = (
+            io_binding
+            and isinstance(num_classes, int)
+            and output.type == "tensor(float)"
+            and all(i.type == "tensor(int64)" for i in self.session.get_inputs())
+        )
+        self._output = (self.output_name, num_classes)
+        # shape -> free IOBuffers, least recently used shape first
+        self._buffers: "OrderedDict[Tuple[int, int], List[IOBuffers]]" = OrderedDict()
+        self._buffers_lock = threading.Lock()
+
+    def __call__(self, **inputs: np.ndarray) -> np.ndarray:
+        """Run the model and return its logits.
+
+        Inputs the graph does not declare (e.g. ``token_type_ids`` for
+        DistilBERT) are ignored.
+        """
+        self._check_fork()
+        if self.io_binding and all(name in inputs for name in self.input_names):
+            shape = np.shape(inputs[self.input_names[0]])
+            if len(shape) == 2:
+                with self.buffers(*shape) as buffers:
+                    for name, array in buffers.inputs.items():
+                        np.copyto(array, inputs[name], casting="unsafe")
+                    return buffers.run().copy()
+
+        feed = {
+            name: np.asarray(inputs[name], dtype=np.int64)
+            for name in self.input_names
+            if name in inputs
+        }
+        return self.session.run([self.output_name], feed)[0]
+
+    @contextmanager
+    def buffers(self, batch_size: int, sequence_length: int) -> Iterator[IOBuffers]:
+        """Check out preallocated buffers for one forward pass.
+
+        Fill ``inputs`` in place (e.g. with ``NumpyTokenizer.pad(out=...)``),
+        then call ``run()``; the logits it returns are overwritten once the
+        buffers are returned to the pool on exit.
+
+        Args:
+            batch_size: Rows of the inputs
+            sequence_length: Tokens per row
+        """
+        if not self.io_binding:
+            raise RuntimeError("I/O binding is not available for this model")
+        self._check_fork()
+        shape = (batch_size, sequence_length)
+        with self._buffers_lock:
+            free = self._buffers.get(shape)
+            buffers = free.pop() if free else None
+        if buffers is None:
+            buffers = IOBuffers(self.session, shape, self.input_names, self._output)
+        try:
+            yield buffers
+        finally:
+            self._release(buffers)
+
+    def _release(self, buffers: IOBuffers) -> None:
+        """Return buffers to the pool, dropping the least recently used shapes."""
+        with self._buffers_lock:
+            if buffers.session is not self.session:
+                return  # bound to a session rebuilt after a fork
+            free = self._buffers.setdefault(buffers.shape, [])
+            self._buffers.move_to_end(buffers.shape)
+            if len(free) < IO_BUFFERS_PER_SHAPE:
+                free.append(buffers)
+            while len(self._buffers) > IO_BUFFER_SHAPES:
+                self._buffers.popitem(last=False)
+
+    def _check_fork(self) -> None:
+        """Prepare the session for use in a forked worker."""
+        if self._pid != os.getpid():
+            with self._fork_lock:
+                if self._pid != os.getpid():
+                    self._after_fork()
+
+    def _create_session(self) -> ort.InferenceSession:
+        """Create the ONNX Runtime session, through the optimized graph cache."""
+        cached = self.optimized_model_path
+        if cached is None:
+            return ort.InferenceSession(
+                str(self.model_path),
+                sess_options=self.session_options,
+                providers=["CPUExecutionProvider"],
+            )
+
+        options = self.session_options or ort.SessionOptions()
+        level = options.graph_optimization_level
+        if cached.exists():
+            options.graph_optimization_level = (
+                ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+            )
+            try:
+                return ort.InferenceSession(
+                    str(cached),
+                    sess_options=options,
+                    providers=["CPUExecutionProvider"],
+                )
+            except Exception as e:
+                logger.warning(f"Rebuilding unreadable optimized graph {cached}: {e}")
+            finally:
+                options.graph_optimization_level = level
+
+        # Save the optimized graph under a private name, then publish it
+        # atomically so concurrent starts never load a partial file
+        scratch = cached.with_name(f".{cached.name}.{os.getpid()}.tmp")
+        options.optimized_model_filepath = str(scratch)
+        try:
+            session = ort.InferenceSession(
+                str(self.model_path),
+                sess_options=options,
+                providers=["CPUExecutionProvider"],
+            )
+        except Exception:
+            scratch.unlink(missing_ok=True)
+            raise
+        finally:
+            options.optimized_model_filepath = ""
+        try:
+            os.replace(scratch, cached)
+            logger.info(f"Saved optimized ONNX Runtime graph to {cached}")
+        except OSError as e:
+            logger.warning(f"Could not save optimized graph to {cached}: {e}")
+        return session
+
+    def _after_fork(self) -> None:
+        """Rebuild a thread-pooled session in a forked child."""
+        if not self.fork_safe:
+            logger.info(
+                f"Rebuilding ONNX Runtime session in worker {os.getpid()}; "
+                "use one intra-op thread to share model memory across workers"
+            )
+            self.session = self._create_session()
+            with self._buffers_lock:
+                self._buffers.clear()
+        self._pid = os.getpid()
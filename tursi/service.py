@@ -0,0 +1,351 @@
+"""Framework-independent request handling for Tursi model servers."""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+from .admission import Overloaded
+from .batching import BatcherStopped
+from .deadline import TIMEOUT_FIELD, DeadlineExceeded, check_deadline, parse_deadline
+from .labels import parse_top_k
+from .metrics import ServerMetrics
+from .timing import RequestTimer, start_timer
+
+logger = logging.getLogger(__name__)
+
+# A response body and its HTTP status code
+Response = Tuple[Dict[str, Any], int]
+
+
+class PredictionService:
+    """Implements the ``/predict`` and ``/health`` contract for one model.
+
+    Both the Flask app and the ASGI app delegate to this class, so the two
+    serving modes always accept the same requests and return the same
+    responses. Methods are blocking and thread-safe.
+    """
+
+    def __init__(
+        self,
+        engine,
+        model_name: str,
+        model,
+        tokenizer,
+        batcher,
+        cache,
+        metrics=None,
+        admission=None,
+    ):
+        """Initialize the service.
+
+        Args:
+            engine: TursiEngine holding the serving settings
+            model_name: Name of the served model
+            model: Loaded model
+            tokenizer: Tokenizer matching the model
+            batcher: Micro-batcher, or None if batching is disabled
+            cache: Prediction cache, or None if caching is disabled
+            metrics: Server metrics, or None to create an empty set
+            admission: Admission controller bounding the queued inference
+                work, or None to accept every request
+        """
+        self.engine = engine
+        self.model_name = model_name
+        self.model = model
+        self.tokenizer = tokenizer
+        self.batcher = batcher
+        self.cache = cache
+        self.metrics = metrics if metrics is not None else ServerMetrics()
+        self.admission = admission
+        self.ready = threading.Event()
+        self.warmup_stats = None
+        self.invalid_input_message = (
+            "Invalid input. Text must be a string of maximum "
+            f"length {engine.MAX_INPUT_LENGTH} characters."
+        )
+
+    def start_warmup(self, background: bool = True) -> None:
+        """Warm up the model, marking the service ready when done.
+
+        Args:
+            background: Run in a background thread so /health can report
+                "warming" meanwhile; otherwise block until done
+        """
+        if not self.engine.WARMUP:
+            self.ready.set()
+        elif background:
+            threading.Thread(
+                target=self._warmup, name="tursi-warmup", daemon=True
+            ).start()
+        else:
+            self._warmup()
+
+    def close(self) -> None:
+        """Release the model's background resources, e.g. when it is evicted.
+
+        Requests already queued still complete; later ones get a 503.
+        """
+        if self.batcher is not None:
+            self.batcher.stop()
+
+    def _warmup(self) -> None:
+        """Run the engine warmup and mark the service ready."""
+        try:
+            self.warmup_stats = self.engine.warmup(self.model, self.tokenizer)
+        except Exception as e:
+            logger.error(f"Warmup failed, serving cold: {str(e)}")
+        finally:
+            self.ready.set()
+
+    def start_timer(self) -> Optional[RequestTimer]:
+        """Start timing a ``/predict`` request, or None if it is not timed."""
+        return start_timer(
+            self.engine.SERVER_TIMING, self.engine.TIMING_LOG_SAMPLE_RATE
+        )
+
+    def finish_timer(self, timer: RequestTimer, status: int) -> Optional[str]:
+        """End a timed request; returns its Server-Timing header value, if any."""
+        return timer.finish(endpoint="/predict", model=self.model_name, status=status)
+
+    def predict(
+        self,
+        data: Any,
+        timer: Optional[RequestTimer] = None,
+        deadline_header: Optional[str] = None,
+    ) -> Response:
+        """Handle a ``/predict`` request body.
+
+        Args:
+            data: Decoded JSON request body
+            timer: Optional timer collecting the request's stage timings
+            deadline_header: Value of the ``X-Request-Deadline`` header
+
+        Returns:
+            Response body and status code
+        """
+        try:
+            top_k = parse_top_k(data.get("top_k")) if isinstance(data, dict) else 1
+            if top_k is None:
+                return {"error": "'top_k' must be a positive integer"}, 400
+            try:
+                timeout_ms = data.get(TIMEOUT_FIELD) if isinstance(data, dict) else None
+                deadline = parse_deadline(deadline_header, timeout_ms)
+            except ValueError as e:
+                return {"error": str(e)}, 400
+            if isinstance(data, dict) and "texts" in data:
+                return self.predict_many(data["texts"], timer, top_k, deadline)
+            if not isinstance(data, dict) or "text" not in data:
+                return {"error": "Missing 'text' field in request"}, 400
+
+            text = data.get("text", "")
+
+            # Validate input
+            if not self.engine.validate_input(text):
+                return {"error": self.invalid_input_message}, 400
+
+            # Hold requests that arrive before warmup is done
+            self.ready.wait()
+            return self.predict_one(text, timer, top_k, deadline), 200
+        except DeadlineExceeded as e:
+            self.metrics.deadline_exceeded.inc(e.stage)
+            return {"error": "Deadline exceeded"}, 504
+        except Overloaded as e:
+            self.metrics.rejected.inc(e.reason)
+            return {
+                "error": "Server overloaded, retry later",
+                "retry_after": round(e.retry_after, 3),
+            }, 503
+        except BatcherStopped:
+            # The model was unloaded (e.g. evicted) while the request held it
+            return {"error": "Model was unloaded, retry later", "retry_after": 1}, 503
+        except Exception as e:
+            logger.error(f"Error during prediction: {str(e)}")
+            return {"error": "Internal server error"}, 500
+
+    def predict_one(
+        self,
+        text: str,
+        timer: Optional[RequestTimer] = None,
+        top_k: int = 1,
+        deadline: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Classify one validated text, returning its ``top_k`` best labels.
+
+        Raises:
+            DeadlineExceeded: If the deadline passes before inference
+            Overloaded: If admission control sheds the request
+        """
+        variant = self._cache_variant(top_k)
+        result = self._cache_get(text, timer, variant)
+        if result is not None:
+            return result
+
+        # Run inference, sharing a forward pass with concurrent requests
+        with self.inference_slot(timer, deadline):
+            if self.batcher is not None:
+                submitted = time.perf_counter()
+                batch_time = sum(timer.stages.values()) if timer is not None else 0.0
+                item = (text, timer, top_k, deadline)
+                result = self.batcher.submit(item).result()
+                if timer is not None:
+                    # Time not spent in the batch's stages was spent queued
+                    batch_time = sum(timer.stages.values()) - batch_time
+                    timer.add("queue", time.perf_counter() - submitted - batch_time)
+            else:
+                result = self.engine.predict_batch(
+                    self.model,
+                    self.tokenizer,
+                    [text],
+                    self.metrics,
+                    (timer,) if timer is not None else (),
+                    top_k,
+                    deadline,
+                )[0]
+        if self.cache is not None:
+            self.cache.put(text, result, variant)
+        return result
+
+    @contextmanager
+    def inference_slot(
+        self, timer: Optional[RequestTimer] = None, deadline: Optional[float] = None
+    ):
+        """Run a block as admitted inference work.
+
+        Raises:
+            DeadlineExceeded: If the deadline passes before the block runs
+            Overloaded: If admission control sheds the request
+        """
+        check_deadline(deadline, "arrival")
+        if self.admission is None:
+            yield
+            return
+        waited = self.admission.acquire()
+        if timer is not None and waited:
+            timer.add("admission", waited)
+        try:
+            check_deadline(deadline, "queue")
+        except DeadlineExceeded:
+            self.admission.release()
+            raise
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.admission.release(time.perf_counter() - started)
+
+    @staticmethod
+    def _cache_variant(top_k: int) -> str:
+        """Cache variant of results with ``top_k`` labels."""
+        return "" if top_k == 1 else f"top_k={top_k}"
+
+    def _cache_get(
+        self, text: str, timer: Optional[RequestTimer], variant: str = ""
+    ) -> Optional[Dict]:
+        """Look a text up in the prediction cache, timing the lookup."""
+        if self.cache is None:
+            return None
+        if timer is None:
+            return self.cache.get(text, variant)
+        started = time.perf_counter()
+        result = self.cache.get(text, variant)
+        timer.add("cache", time.perf_counter() - started)
+        return result
+
+    def predict_many(
+        self,
+        texts: Any,
+        timer: Optional[RequestTimer] = None,
+        top_k: int = 1,
+        deadline: Optional[float] = None,
+    ) -> Response:
+        """Classify a list of texts, reporting invalid items in place."""
+        if not isinstance(texts, list) or not texts:
+            return {"error": "'texts' must be a non-empty list"}, 400
+        if len(texts) > self.engine.MAX_BATCH_TEXTS:
+            return {
+                "error": (
+                    f"Too many texts. A batch may contain at most "
+                    f"{self.engine.MAX_BATCH_TEXTS} texts."
+                )
+            }, 400
+
+        results = [None] * len(texts)
+        valid = []
+        for i, text in enumerate(texts):
+            if self.engine.validate_input(text):
+                valid.append(i)
+            else:
+                results[i] = {"error": self.invalid_input_message}
+
+        # Hold requests that arrive before warmup is done
+        self.ready.wait()
+
+        # Serve repeated texts from the cache
+        variant = self._cache_variant(top_k)
+        if self.cache is not None:
+            misses = []
+            for i in valid:
+                results[i] = self._cache_get(texts[i], timer, variant)
+                if results[i] is None:
+                    misses.append(i)
+            valid = misses
+
+        # Tokenize once and run the remaining texts through the model
+        if valid:
+            with self.inference_slot(timer, deadline):
+                predictions = self.engine.predict_batch(
+                    self.model,
+                    self.tokenizer,
+                    [texts[i] for i in valid],
+                    self.metrics,
+                    (timer,) if timer is not None else (),
+                    top_k,
+                    deadline,
+                )
+            for i, prediction in zip(valid, predictions):
+                results[i] = prediction
+                if self.cache is not None:
+                    self.cache.put(texts[i], prediction, variant)
+
+        return {"results": results}, 200
+
+    def health(self) -> Response:
+        """Handle a ``/health`` request.
+
+        Reports 503 with status "warming" until warmup is done, so load
+        balancers hold traffic until the model is ready.
+        """
+        engine = self.engine
+        ready = self.ready.is_set()
+        batching = (
+            self.batcher.stats() if self.batcher is not None else {"enabled": False}
+        )
+        batching.update(
+            buckets=list(engine.BATCH_BUCKETS),
+            max_tokens=engine.BATCH_MAX_TOKENS,
+        )
+        return {
+            "status": "healthy" if ready else "warming",
+            "state": "ready" if ready else "warming",
+            "warmup": self.warmup_stats,
+            "model": self.model_name,
+            "quantization": {
+                "mode": engine.QUANTIZATION_MODE,
+                "bits": engine.QUANTIZATION_BITS,
+            },
+            "batching": batching,
+            "cache": (
+                self.cache.stats() if self.cache is not None else {"enabled": False}
+            ),
+            "admission": (
+                self.admission.stats()
+                if self.admission is not None
+                else {"enabled": False}
+            ),
+            "runtime": (
+                engine.session_settings[self.model_name].to_dict()
+                if self.model_name in engine.session_settings
+                else None
+            ),
+        }, (200 if ready else 503)
@@ -0,0 +1,416 @@
+"""Pre-fork multi-worker serving for Tursi model servers."""
+
+import logging
+import os
+import signal
+import socket
+import stat
+import threading
+import time
+from multiprocessing.sharedctypes import RawArray
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# File mode of Unix domain sockets: the owner and group may connect
+DEFAULT_UDS_MODE = 0o660
+
+
+def parse_socket_mode(value) -> int:
+    """Parse a socket file mode, given as an octal string (e.g. '660') or an int.
+
+    Raises:
+        ValueError: If the mode is not a valid permission mode
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        mode = value
+    else:
+        try:
+            mode = int(str(value), 8)
+        except ValueError:
+            raise ValueError(f"Invalid socket mode {value!r}, expected octal like 660")
+    if not 0 <= mode <= 0o777:
+        raise ValueError(f"Invalid socket mode {value!r}, expected octal like 660")
+    return mode
+
+
+def bind_tcp_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Create a listening TCP socket whose connections send without delay.
+
+    Connections inherit TCP_NODELAY from the listening socket. asyncio only
+    sets it itself on sockets it created, so without it uvicorn workers
+    serving this socket would hold back each response body until the
+    client's delayed ACK of the headers, some 40 ms later.
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.create_server((host, port), family=family, backlog=backlog)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+def bind_unix_socket(
+    path: str, mode: int = DEFAULT_UDS_MODE, backlog: int = 2048
+) -> socket.socket:
+    """Create a listening Unix domain socket that only ``mode`` allows to use.
+
+    Connecting needs write permission on the socket file, so its mode, owner
+    and group are the access control. The socket is created accessible to
+    its owner only and then opened up to ``mode``, so it is never briefly
+    open to everyone. A socket left behind by a server that is gone is
+    replaced.
+
+    Args:
+        path: Socket file path; missing parent directories are created
+        mode: File mode of the socket
+        backlog: Listen backlog
+
+    Raises:
+        ValueError: If another server is listening on ``path`` or it is not
+            a socket
+    """
+    path = os.path.abspath(path)
+    if os.path.lexists(path):
+        if not stat.S_ISSOCK(os.lstat(path).st_mode):
+            raise ValueError(f"{path} exists and is not a socket")
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)  # stale socket of a server that exited
+        else:
+            raise ValueError(f"{path} is already in use by another server")
+        finally:
+            probe.close()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    umask = os.umask(0o177)
+    try:
+        sock.bind(path)
+        os.chmod(path, mode)
+        sock.listen(backlog)
+    except BaseException:
+        sock.close()
+        raise
+    finally:
+        os.umask(umask)
+    return sock
+
+
+def remove_unix_socket(path: Optional[str]) -> None:
+    """Remove a socket file created by ``bind_unix_socket``, if it is there."""
+    if path and os.path.lexists(path) and stat.S_ISSOCK(os.lstat(path).st_mode):
+        os.unlink(path)
+
+
+class PreforkServer:
+    """Serve an app from several forked worker processes.
+
+    The model is loaded once in the parent before the workers are forked, so
+    its read-only weights stay shared copy-on-write between them. The parent
+    binds the listening socket and every worker accepts connections from the
+    inherited file descriptor, letting the kernel spread connections across
+    processes (and so across cores and GILs).
+
+    The parent supervises the workers: a worker that exits, crashes or stops
+    sending heartbeats is replaced, with a delay if it dies right after
+    starting so a broken worker cannot spin the supervisor. Heartbeats are
+    sent from the worker's accept loop, so a worker whose loop is stuck (for
+    example on a deadlock or a call that never releases the GIL) is replaced
+    too; a single request hung in a handler thread is not detected.
+    """
+
+    def __init__(
+        self,
+        app,
+        host: str,
+        port: int,
+        workers: int = 2,
+        backlog: int = 2048,
+        heartbeat_interval: float = 1.0,
+        heartbeat_timeout: float = 30.0,
+        restart_delay: float = 1.0,
+        serve_worker: Optional[
+            Callable[[socket.socket, Callable[[], None]], None]
+        ] = None,
+        uds: Optional[str] = None,
+        uds_mode: int = DEFAULT_UDS_MODE,
+    ):
+        """Initialize the server.
+
+        Args:
+            app: Application, fully loaded before forking
+            host: Host to bind to
+            port: Port to bind to (0 picks a free port)
+            workers: Number of worker processes
+            backlog: Listen backlog of the shared socket
+            heartbeat_interval: Seconds between worker heartbeats
+            heartbeat_timeout: Seconds without a heartbeat before a worker is
+                considered hung and restarted, 0 to disable
+            restart_delay: Seconds to wait before restarting a worker that
+                died within ``restart_delay`` of starting
+            serve_worker: Optional callable serving ``app`` from the shared
+                socket in a worker (defaults to a threaded werkzeug server);
+                it gets the socket and a heartbeat callable to call from its
+                serve loop at least every ``heartbeat_interval``
+            uds: Unix domain socket path to listen on instead of host and port
+            uds_mode: File mode of the Unix domain socket
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.backlog = backlog
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.restart_delay = restart_delay
+        self.serve_worker = serve_worker
+        self.uds = os.path.abspath(uds) if uds else None
+        self.uds_mode = uds_mode
+
+        self.socket: Optional[socket.socket] = None
+        self.restarts = 0
+        self._children: Dict[int, int] = {}  # pid -> worker slot
+        self._started_at: Dict[int, float] = {}  # pid -> start time
+        # One heartbeat timestamp per worker slot, shared across the fork
+        self._heartbeats = RawArray("d", workers)
+        self._running = False
+
+    def bind(self) -> socket.socket:
+        """Create the listening socket shared by all workers."""
+        if self.socket is None and self.uds:
+            self.socket = bind_unix_socket(self.uds, self.uds_mode, self.backlog)
+            self.socket.set_inheritable(True)
+        elif self.socket is None:
+            self.socket = bind_tcp_socket(self.host, self.port, self.backlog)
+            self.socket.set_inheritable(True)
+            self.port = self.socket.getsockname()[1]
+        return self.socket
+
+    def serve_forever(self, should_stop: Optional[Callable[[], bool]] = None) -> None:
+        """Fork the workers and supervise them until stopped.
+
+        Args:
+            should_stop: Optional callable polled by the supervisor; the
+                server shuts down once it returns True
+        """
+        self.bind()
+        self._running = True
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self._handle_signal)
+            signal.signal(signal.SIGINT, self._handle_signal)
+
+        address = f"unix:{self.uds}" if self.uds else f"http://{self.host}:{self.port}"
+        logger.info(f"Serving on {address} with {self.workers} workers")
+        try:
+            for slot in range(self.workers):
+                self._spawn(slot)
+            while self._running:
+                if should_stop is not None and should_stop():
+                    break
+                self._reap()
+                self._check_heartbeats()
+                time.sleep(self.heartbeat_interval)
+        finally:
+            self.stop()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop all workers, killing those that do not exit in time."""
+        self._running = False
+        for pid in list(self._children):
+            self._signal(pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + timeout
+        while self._children and time.monotonic() < deadline:
+            self._reap(restart=False)
+            time.sleep(0.05)
+        for pid in list(self._children):
+            logger.warning(f"Worker {pid} did not exit, killing it")
+            self._signal(pid, signal.SIGKILL)
+            self._wait(pid)
+
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+            remove_unix_socket(self.uds)
+
+    def _handle_signal(self, signum, frame) -> None:
+        """Handle SIGTERM and SIGINT in the supervisor."""
+        logger.info(f"Received signal {signum}, stopping workers")
+        self._running = False
+
+    def _spawn(self, slot: int) -> int:
+        """Fork a worker process for a slot."""
+        self._heartbeats[slot] = time.time()
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                self._worker_main(slot)
+            except BaseException as e:
+                logger.error(f"Worker {os.getpid()} failed: {e}")
+                code = 1
+            finally:
+                os._exit(code)
+
+        self._children[pid] = slot
+        self._started_at[pid] = time.monotonic()
+        logger.info(f"Started worker {pid} (slot {slot})")
+        return pid
+
+    def _worker_main(self, slot: int) -> None:
+        """Serve requests from the shared socket in a worker process."""
+        signal.signal(signal.SIGINT, signal.SIG_IGN)  # the parent handles Ctrl+C
+
+        def heartbeat():
+            self._heartbeats[slot] = time.time()
+
+        if self.serve_worker is not None:
+            self.serve_worker(self.socket, heartbeat)
+            return
+
+        from werkzeug.serving import make_server
+
+        host = f"unix://{self.uds}" if self.uds else self.host
+        server = make_server(
+            host, self.port, self.app, threaded=True, fd=self.socket.fileno()
+        )
+
+        def stop_worker(signum, frame):
+            # shutdown() waits for serve_forever, so call it from another thread
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+        def service_actions():
+            # Called by serve_forever on every pass of its accept loop
+            heartbeat()
+            type(server).service_actions(server)
+
+        server.service_actions = service_actions
+        signal.signal(signal.SIGTERM, stop_worker)
+        server.serve_forever(poll_interval=min(0.5, self.heartbeat_interval))
+
+    def _reap(self, restart: bool = True) -> None:
+        """Collect exited workers and restart them if still running."""
+        while self._children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self._children.clear()
+                return
+            if pid == 0:
+                return
+            slot = self._children.pop(pid, None)
+            started_at = self._started_at.pop(pid, time.monotonic())
+            if slot is None:
+                continue
+            if restart and self._running:
+                logger.warning(
+                    f"Worker {pid} exited with status {status}, restarting it"
+                )
+                if time.monotonic() - started_at < self.restart_delay:
+                    time.sleep(self.restart_delay)
+                self.restarts += 1
+                self._spawn(slot)
+
+    def _check_heartbeats(self) -> None:
+        """Kill workers that stopped sending heartbeats so they get restarted."""
+        if not self.heartbeat_timeout:
+            return
+        now = time.time()
+        for pid, slot in list(self._children.items()):
+            if now - self._heartbeats[slot] > self.heartbeat_timeout:
+                logger.warning(f"Worker {pid} stopped responding, killing it")
+                self._signal(pid, signal.SIGKILL)
+
+    def _signal(self, pid: int, signum: int) -> None:
+        """Send a signal to a worker that may already have exited."""
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def _wait(self, pid: int) -> None:
+        """Wait for a killed worker and forget it."""
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+        self._children.pop(pid, None)
+        self._started_at.pop(pid, None)
+
+
+def serve(
+    app,
+    host: str,
+    port: int,
+    workers: int = 1,
+    mode: str = "flask",
+    should_stop: Optional[Callable[[], bool]] = None,
+    uds: Optional[str] = None,
+    uds_mode: int = DEFAULT_UDS_MODE,
+) -> None:
+    """Run a model server with one or more worker processes.
+
+    Args:
+        app: WSGI application, or ASGI application in ``asgi`` mode
+        host: Host to bind to
+        port: Port to bind to
+        workers: Number of worker processes; 1 runs the app in-process
+        mode: Server implementation, 'flask' or 'asgi'
+        should_stop: Optional callable polled to shut the server down
+        uds: Unix domain socket path to listen on instead of host and port
+        uds_mode: File mode of the Unix domain socket
+    """
+    if mode == "asgi":
+        from .asgi import run_asgi
+
+        run_asgi(
+            app,
+            host,
+            port,
+            workers=workers,
+            should_stop=should_stop,
+            uds=uds,
+            uds_mode=uds_mode,
+        )
+    elif workers > 1:
+        PreforkServer(
+            app, host, port, workers=workers, uds=uds, uds_mode=uds_mode
+        ).serve_forever(should_stop=should_stop)
+    elif should_stop is None and uds is None:
+        app.run(host=host, port=port)
+    else:
+        from werkzeug.serving import make_server
+
+        if uds:
+            sock = bind_unix_socket(uds, uds_mode)
+            server = make_server(
+                f"unix://{os.path.abspath(uds)}",
+                0,
+                app,
+                threaded=True,
+                fd=sock.fileno(),
+            )
+            logger.info(f"Serving on unix:{os.path.abspath(uds)}")
+        else:
+            server = make_server(host, port, app, threaded=True)
+
+        try:
+            if should_stop is None:
+                server.serve_forever()
+                return
+
+            # Run server in a separate thread so we can check the stop event
+            server_thread = threading.Thread(target=server.serve_forever)
+            server_thread.start()
+            while not should_stop():
+                time.sleep(1)
+            server.shutdown()
+            server_thread.join()
+        finally:
+            if uds:
+                sock.close()
+                remove_unix_socket(uds)
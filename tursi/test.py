@@ -1,6 +1,114 @@
 import argparse
+import socket
 import requests
 import json
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool
+from urllib3.connection import HTTPConnection
+from .frames import FRAME_CONTENT_TYPE, decode_response, encode_request, is_frame
+
+
+class UnixHTTPConnection(HTTPConnection):
+    """HTTP connection over a Unix domain socket."""
+
+    def __init__(self, socket_path: str, **kwargs):
+        super().__init__("localhost", **kwargs)
+        self.socket_path = socket_path
+
+    def _new_conn(self) -> socket.socket:
+        """Connect to the socket file instead of a host and port."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if isinstance(self.timeout, (int, float)):
+            sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+
+class UnixHTTPConnectionPool(HTTPConnectionPool):
+    """Keep-alive connection pool for a Unix domain socket."""
+
+    def __init__(self, socket_path: str, **kwargs):
+        super().__init__("localhost", **kwargs)
+        self.socket_path = socket_path
+
+    def _new_conn(self) -> UnixHTTPConnection:
+        """Open a connection to the pool's socket file."""
+        self.num_connections += 1
+        return UnixHTTPConnection(
+            self.socket_path, timeout=self.timeout.connect_timeout
+        )
+
+
+class UnixAdapter(HTTPAdapter):
+    """Transport adapter sending every request to one Unix domain socket."""
+
+    def __init__(self, socket_path: str, **kwargs):
+        self.socket_path = socket_path
+        self._pool = UnixHTTPConnectionPool(socket_path)
+        super().__init__(**kwargs)
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):
+        return self._pool
+
+    def get_connection(self, url, proxies=None):
+        return self._pool
+
+    def close(self):
+        super().close()
+        self._pool.close()
+
+
+def unix_session(socket_path: str) -> requests.Session:
+    """Create a session sending http:// requests to a Unix domain socket.
+
+    The host in request URLs is ignored; only their path is used, e.g.
+    ``unix_session("/run/tursi/model.sock").post("http://localhost/predict")``.
+
+    Args:
+        socket_path: Socket the server listens on (``tursi up --uds``)
+    """
+    session = requests.Session()
+    session.mount("http://", UnixAdapter(socket_path))
+    return session
+
+
+def predict(url, texts, binary=False, session=None, timeout=None, **options):
+    """Send one text or a list of texts to a tursi ``/predict`` endpoint.
+
+    Args:
+        url: Endpoint URL, e.g. http://localhost:5000/predict
+        texts: Text (str) or texts (list) to classify
+        binary: Encode the request and response as binary frames instead of
+            JSON, for servers that support them
+        session: Optional requests.Session reusing connections
+        timeout: Seconds to wait for the response
+        **options: Other request fields, e.g. ``top_k=3`` or ``timeout_ms=200``
+
+    Returns:
+        The decoded response body, the same for both encodings
+
+    Raises:
+        requests.HTTPError: If the server answers with an error status
+    """
+    http = session or requests
+    if binary:
+        response = http.post(
+            url,
+            data=encode_request(texts, **options),
+            headers={"Content-Type": FRAME_CONTENT_TYPE, "Accept": FRAME_CONTENT_TYPE},
+            timeout=timeout,
+        )
+    else:
+        field = "text" if isinstance(texts, str) else "texts"
+        response = http.post(url, json={field: texts, **options}, timeout=timeout)
+    response.raise_for_status()
+    if is_frame(response.headers.get("Content-Type", "")):
+        return decode_response(response.content)
+    return response.json()
 
 
 def main():
@@ -13,13 +121,21 @@ def main():
     parser.add_argument(
         "--url", default="http://localhost:5000/predict", help="URL of the tursi server"
     )
+    parser.add_argument(
+        "--binary",
+        action="store_true",
+        help="Send the request as a binary frame instead of JSON",
+    )
+    parser.add_argument(
+        "--uds",
+        help="Unix domain socket of the server; only the path of --url is used",
+    )
     args = parser.parse_args()
 
-    payload = {"text": args.prompt}
     try:
-        response = requests.post(args.url, json=payload)
-        response.raise_for_status()
-        print(json.dumps(response.json(), indent=2))
+        session = unix_session(args.uds) if args.uds else None
+        result = predict(args.url, args.prompt, binary=args.binary, session=session)
+        print(json.dumps(result, indent=2))
     except requests.exceptions.RequestException as e:
         print(f"Error: Failed to get a response from {args.url}")
         print(f"Details: {e}")
@@ -0,0 +1,91 @@
+"""Per-request stage timing, reported in Server-Timing headers and logs."""
+
+import json
+import logging
+import random
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTimer:
+    """Monotonic per-stage timer for one request.
+
+    Stages are accumulated in the order they first occur. With micro-batching
+    a request shares the tokenize, inference and postprocess stages of the
+    batch it ran in, so those report the batch's durations.
+    """
+
+    __slots__ = ("started", "stages", "header", "log")
+
+    def __init__(self, header: bool = True, log: bool = False):
+        """Start timing a request.
+
+        Args:
+            header: Report the stages in a Server-Timing header
+            log: Log the stages as a structured line when the request ends
+        """
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.header = header
+        self.log = log
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Add time spent in a stage."""
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def elapsed(self) -> float:
+        """Seconds since the request started."""
+        return time.perf_counter() - self.started
+
+    def header_value(self) -> str:
+        """Format the stages as a Server-Timing header value, in milliseconds."""
+        entries = [
+            f"{stage};dur={seconds * 1000:.3f}"
+            for stage, seconds in self.stages.items()
+        ]
+        entries.append(f"total;dur={self.elapsed() * 1000:.3f}")
+        return ", ".join(entries)
+
+    def finish(self, **fields: Any) -> Optional[str]:
+        """End the request, logging it if sampled.
+
+        Args:
+            **fields: Extra fields of the log line, such as the status code
+
+        Returns:
+            Server-Timing header value, or None if headers are disabled
+        """
+        header = self.header_value() if self.header else None
+        if self.log:
+            logger.info(
+                json.dumps(
+                    {
+                        "event": "request_timing",
+                        **fields,
+                        "total_ms": round(self.elapsed() * 1000, 3),
+                        "stages_ms": {
+                            stage: round(seconds * 1000, 3)
+                            for stage, seconds in self.stages.items()
+                        },
+                    }
+                )
+            )
+        return header
+
+
+def start_timer(header: bool, log_sample_rate: float) -> Optional[RequestTimer]:
+    """Start timing a request if it is reported or sampled for logging.
+
+    Returns None, so the request path skips all timing work, when Server-Timing
+    headers are disabled and the request is not sampled.
+
+    Args:
+        header: Whether Server-Timing headers are enabled
+        log_sample_rate: Fraction of requests to log, between 0 and 1
+    """
+    log = log_sample_rate > 0 and random.random() < log_sample_rate
+    if not (header or log):
+        return None
+    return RequestTimer(header=header, log=log)
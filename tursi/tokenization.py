@@ -0,0 +1,187 @@
+"""Torch-free tokenization to NumPy arrays for ONNX inference."""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Fallback when neither the tokenizer nor the model config sets a limit
+DEFAULT_MAX_LENGTH = 512
+
+
+def _read_json(path: Path) -> Dict:
+    """Read a JSON file, returning an empty dict if it does not exist."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+class NumpyTokenizer:
+    """Fast tokenizer that returns NumPy arrays without importing torch.
+
+    Wraps the Rust ``tokenizers`` library directly, which is what Hugging
+    Face fast tokenizers use under the hood, and pads on the NumPy side.
+    Calling it mirrors the subset of the ``transformers`` tokenizer API the
+    engine needs, so both can be used interchangeably.
+    """
+
+    def __init__(
+        self, tokenizer, max_length: int = DEFAULT_MAX_LENGTH, pad_id: int = 0
+    ):
+        """Initialize the tokenizer.
+
+        Args:
+            tokenizer: A ``tokenizers.Tokenizer`` instance
+            max_length: Maximum number of tokens per sequence after truncation
+            pad_id: Token id used for padding
+        """
+        self._tokenizer = tokenizer
+        self._tokenizer.no_padding()
+        # Truncation is configured once; the tokenizer is shared across threads
+        self._tokenizer.enable_truncation(max_length)
+        self.max_length = max_length
+        self.pad_id = pad_id
+
+    @classmethod
+    def from_pretrained(cls, model_dir: Path) -> "NumpyTokenizer":
+        """Load the tokenizer saved next to an exported model.
+
+        Args:
+            model_dir: Directory containing ``tokenizer.json``
+
+        Returns:
+            The loaded tokenizer
+
+        Raises:
+            FileNotFoundError: If the directory has no ``tokenizer.json``
+        """
+        from tokenizers import Tokenizer
+
+        model_dir = Path(model_dir)
+        tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        tokenizer_config = _read_json(model_dir / "tokenizer_config.json")
+        model_config = _read_json(model_dir / "config.json")
+
+        limits = [
+            tokenizer_config.get("model_max_length"),
+            model_config.get("max_position_embeddings"),
+        ]
+        limits = [int(n) for n in limits if isinstance(n, (int, float)) and n < 1e6]
+        max_length = min(limits) if limits else DEFAULT_MAX_LENGTH
+
+        pad_token = tokenizer_config.get("pad_token")
+        if isinstance(pad_token, dict):
+            pad_token = pad_token.get("content")
+        pad_id = tokenizer.token_to_id(pad_token) if pad_token else None
+
+        return cls(tokenizer, max_length=max_length, pad_id=pad_id or 0)
+
+    def encode(self, texts: Sequence[str]) -> List:
+        """Tokenize and truncate texts without padding.
+
+        Args:
+            texts: Texts to tokenize
+
+        Returns:
+            One ``tokenizers.Encoding`` per text, at most ``max_length`` long
+        """
+        return self._tokenizer.encode_batch(list(texts))
+
+    def pad(
+        self,
+        encodings: Sequence,
+        length: int,
+        out: Optional[Dict[str, np.ndarray]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Pad encodings into fixed-size NumPy arrays.
+
+        Args:
+            encodings: Encodings returned by ``encode``
+            length: Sequence length of the output arrays
+            out: Optional preallocated ``(rows, length)`` int64 arrays to fill
+                in place, e.g. a model's bound input buffers; only the inputs
+                it contains are produced
+
+        Returns:
+            ``input_ids``, ``attention_mask`` and ``token_type_ids`` arrays,
+            or ``out`` when given
+        """
+        if out is None:
+            shape = (len(encodings), length)
+            out = {
+                "input_ids": np.empty(shape, dtype=np.int64),
+                "attention_mask": np.empty(shape, dtype=np.int64),
+                "token_type_ids": np.empty(shape, dtype=np.int64),
+            }
+        input_ids = out.get("input_ids")
+        attention_mask = out.get("attention_mask")
+        token_type_ids = out.get("token_type_ids")
+        if input_ids is not None:
+            input_ids.fill(self.pad_id)
+        for array in (attention_mask, token_type_ids):
+            if array is not None:
+                array.fill(0)
+        for row, encoding in enumerate(encodings):
+            n = min(len(encoding.ids), length)
+            if input_ids is not None:
+                input_ids[row, :n] = encoding.ids[:n]
+            if attention_mask is not None:
+                attention_mask[row, :n] = 1
+            if token_type_ids is not None:
+                token_type_ids[row, :n] = encoding.type_ids[:n]
+        return out
+
+    def __call__(
+        self,
+        texts: Union[str, Sequence[str]],
+        padding: bool = True,
+        truncation: bool = True,
+        return_tensors: str = "np",
+        **kwargs,
+    ) -> Dict[str, np.ndarray]:
+        """Tokenize texts and pad them to the longest sequence.
+
+        Texts are always truncated to ``max_length`` tokens.
+
+        Args:
+            texts: A text or list of texts
+            padding: Only padding to the longest sequence is supported
+            truncation: Accepted for API compatibility
+            return_tensors: Only ``"np"`` is supported
+
+        Returns:
+            Padded NumPy input arrays
+        """
+        if return_tensors != "np":
+            raise ValueError("NumpyTokenizer only returns NumPy arrays")
+        if isinstance(texts, str):
+            texts = [texts]
+        encodings = self.encode(texts)
+        length = max((len(e.ids) for e in encodings), default=0)
+        return self.pad(encodings, length)
+
+
+def load_tokenizer(model_dir: Path):
+    """Load a torch-free tokenizer, falling back to ``transformers``.
+
+    Args:
+        model_dir: Directory the tokenizer was saved to
+
+    Returns:
+        A ``NumpyTokenizer`` when ``tokenizer.json`` is available, otherwise
+        a ``transformers`` tokenizer (which imports torch)
+    """
+    if (Path(model_dir) / "tokenizer.json").exists():
+        return NumpyTokenizer.from_pretrained(model_dir)
+
+    logger.warning(
+        f"No fast tokenizer found in {model_dir}, falling back to transformers"
+    )
+    from transformers import AutoTokenizer
+
+    return AutoTokenizer.from_pretrained(model_dir)